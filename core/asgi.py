@@ -5,12 +5,27 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Los eventos en vivo (/api/miembros/eventos/) solo se sirven con esta
+aplicación, p. ej. ``uvicorn core.asgi:application``: cada conexión SSE
+es una corrutina en espera y no ocupa un hilo del servidor.
 """
 
 import os
 
+from django.urls import get_resolver
 from django.core.asgi import get_asgi_application
 
+from miembros.autocompletado import construir_al_iniciar
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Importa la URLconf (vistas, serializers, DRF y Simple JWT) al cargar la
+# aplicación y no en la primera petición. Con un servidor que precarga la app
+# antes de bifurcar workers (gunicorn --preload) este costo se paga una sola vez.
+get_resolver().url_patterns
+
+# Índice en memoria del autocompletado de miembros (una consulta por lotes).
+construir_al_iniciar()
@@ -55,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'miembros.diagnostico.PerfilPeticionMiddleware',
+    'miembros.diagnostico.ConsultasLentasMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -82,13 +84,39 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 USE_SQLITE = config('USE_SQLITE', default='True') == 'True'
 
+# Modo de SQLite para varios workers escribiendo a la vez: WAL (los lectores
+# no bloquean al escritor ni al revés), espera ante el bloqueo en vez de
+# fallar con "database is locked" y BEGIN IMMEDIATE en las transacciones,
+# que toman el bloqueo de escritura al empezar y no a mitad de camino.
+# Se compara con el modo por defecto con `python manage.py medir_sqlite`.
+SQLITE_CONCURRENTE = config('SQLITE_CONCURRENTE', default='True') == 'True'
+SQLITE_TIMEOUT = config('SQLITE_TIMEOUT', default=20, cast=int)
+SQLITE_MMAP_MB = config('SQLITE_MMAP_MB', default=256, cast=int)
+
+SQLITE_OPCIONES_CONCURRENTES = {
+    'timeout': SQLITE_TIMEOUT,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': (
+        'PRAGMA journal_mode = WAL;'
+        'PRAGMA synchronous = NORMAL;'
+        f'PRAGMA busy_timeout = {SQLITE_TIMEOUT * 1000};'
+        f'PRAGMA mmap_size = {SQLITE_MMAP_MB * 1024 * 1024};'
+        'PRAGMA temp_store = MEMORY;'
+    ),
+}
+
 if USE_SQLITE:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': SQLITE_OPCIONES_CONCURRENTES if SQLITE_CONCURRENTE else {},
         }
     }
+    if SQLITE_CONCURRENTE:
+        # Base de pruebas en archivo: la de memoria compartida falla al
+        # instante con escrituras concurrentes en vez de esperar el bloqueo.
+        DATABASES['default']['TEST'] = {'NAME': BASE_DIR / 'test_db.sqlite3'}
 else:
     DATABASES = {
         'default': {
@@ -157,6 +185,44 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
+
+# Diagnóstico (miembros/diagnostico.py): consultas SQL que superen este
+# umbral se registran, con su EXPLAIN como mucho una vez por consulta cada
+# CONSULTAS_LENTAS_EXPLAIN_SEGUNDOS (0 lo desactiva); ambas tablas guardan
+# solo los registros más recientes.
+CONSULTA_LENTA_MS = config('CONSULTA_LENTA_MS', default=200, cast=int)
+CONSULTAS_LENTAS_EXPLAIN_SEGUNDOS = config('CONSULTAS_LENTAS_EXPLAIN_SEGUNDOS', default=600, cast=int)
+CONSULTAS_LENTAS_CAPACIDAD = config('CONSULTAS_LENTAS_CAPACIDAD', default=500, cast=int)
+PERFILES_CAPACIDAD = config('PERFILES_CAPACIDAD', default=50, cast=int)
+
+# Límites de los listados y del filtro de miembros (miembros/limites.py):
+# tiempo total de sus consultas, filas que cuenta la paginación y filas
+# que devuelve filtrar-miembros. 0 desactiva cada límite.
+CONSULTAS_PLAZO_MS = config('CONSULTAS_PLAZO_MS', default=5000, cast=int)
+LISTADO_MAX_FILAS = config('LISTADO_MAX_FILAS', default=10000, cast=int)
+FILTRO_MAX_FILAS = config('FILTRO_MAX_FILAS', default=1000, cast=int)
+
+# Eventos en vivo (miembros/eventos.py, /api/miembros/eventos/): eventos que
+# se conservan para reconectar con Last-Event-ID, segundos entre latidos,
+# espera sugerida al navegador para reconectar, agrupación del recálculo
+# de contadores y vigencia de los tickets de conexión. Los tickets canjeados
+# se anotan en la base de datos (TicketCanjeado), no en el caché local de
+# cada proceso, para que sirvan una sola vez aunque haya varios workers.
+EVENTOS_HISTORIAL = config('EVENTOS_HISTORIAL', default=1000, cast=int)
+EVENTOS_LATIDO_SEGUNDOS = config('EVENTOS_LATIDO_SEGUNDOS', default=15, cast=float)
+EVENTOS_REINTENTO_MS = config('EVENTOS_REINTENTO_MS', default=3000, cast=int)
+EVENTOS_INTERVALO_CONTADORES = config('EVENTOS_INTERVALO_CONTADORES', default=1.0, cast=float)
+EVENTOS_TICKET_SEGUNDOS = config('EVENTOS_TICKET_SEGUNDOS', default=30, cast=int)
+
+# Autocompletado de miembros (miembros/autocompletado.py): construir el
+# índice en memoria al cargar la aplicación, resultados máximos por
+# consulta y segundos tras los que cada worker lo reconstruye para recoger
+# los cambios de otros procesos (0 no lo reconstruye).
+AUTOCOMPLETADO_AL_INICIAR = config('AUTOCOMPLETADO_AL_INICIAR', default=True, cast=bool)
+AUTOCOMPLETADO_MAX_RESULTADOS = config('AUTOCOMPLETADO_MAX_RESULTADOS', default=20, cast=int)
+AUTOCOMPLETADO_REFRESCO_SEGUNDOS = config('AUTOCOMPLETADO_REFRESCO_SEGUNDOS', default=600, cast=int)
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
 ]
@@ -4,7 +4,7 @@ URL configuration for core project.
 
 from django.contrib import admin
 from django.urls import path, include
-from miembros.views import CustomTokenObtainPairView
+from miembros.views import CustomTokenObtainPairView, LoteView
 from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
@@ -16,4 +16,7 @@ urlpatterns = [
 
     # Rutas del módulo miembros
     path('api/miembros/', include('miembros.urls')),
+
+    # Varias peticiones a /api/miembros/ en una sola ida y vuelta
+    path('api/batch/', LoteView.as_view(), name='batch'),
 ]
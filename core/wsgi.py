@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.urls import get_resolver
 from django.core.wsgi import get_wsgi_application
 
+from miembros.autocompletado import construir_al_iniciar
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Importa la URLconf (vistas, serializers, DRF y Simple JWT) al cargar la
+# aplicación y no en la primera petición. Con un servidor que precarga la app
+# antes de bifurcar workers (gunicorn --preload) este costo se paga una sola vez.
+get_resolver().url_patterns
+
+# Índice en memoria del autocompletado de miembros (una consulta por lotes).
+construir_al_iniciar()
@@ -1,8 +1,70 @@
-from django.contrib import admin
-from django.utils.html import format_html
+from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
-from .models import Miembro, Sancion, SolicitudCorreccion
-from .utils import crear_usuario_para_miembro, enviar_correo_bienvenida
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from .models import (
+    Miembro,
+    Sancion,
+    SolicitudCorreccion,
+    ConsultaLenta,
+    PerfilPeticion,
+    DuplicadoCandidato,
+    EstadoDuplicado,
+    Segmento,
+)
+from .duplicados import fusionar
+from .segmentos import calcular
+from .busqueda import buscar
+from .utils import provisionar_miembro
+
+
+def estimar_filas(modelo, alias):
+    """
+    Devuelve el número aproximado de filas de la tabla del modelo según las
+    estadísticas del motor (InnoDB en MySQL, sqlite_stat1 en SQLite tras un
+    ANALYZE), o None si el backend no ofrece una estimación.
+    """
+    conexion = connections[alias]
+    tabla = modelo._meta.db_table
+    if conexion.vendor == 'mysql':
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    elif conexion.vendor == 'sqlite':
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+    else:
+        return None
+
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute(sql, [tabla])
+            fila = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not fila or fila[0] is None:
+        return None
+    return int(str(fila[0]).split()[0])
+
+
+class PaginadorConteoEstimado(Paginator):
+    """
+    Paginador para changelists de tablas grandes. Sin filtros aplicados usa
+    el conteo estimado del motor en lugar de un COUNT(*) de toda la tabla;
+    por debajo de UMBRAL_ESTIMADO filas el conteo exacto es barato y se usa.
+    """
+    UMBRAL_ESTIMADO = 100000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimado = estimar_filas(self.object_list.model, self.object_list.db)
+            if estimado is not None and estimado >= self.UMBRAL_ESTIMADO:
+                return estimado
+        return super().count
 
 
 def cambiar_estado_miembro(queryset, activo, puede_volver, user):
@@ -54,8 +116,13 @@ class MiembroAdmin(admin.ModelAdmin):
         'nombre_completo', 'email', 'pais', 'telefono', 'activo', 'puede_volver',
         'fecha_registro', 'estado_visual'
     )
-    list_filter = ('activo', 'puede_volver', 'fecha_registro')
-    search_fields = ('nombre_completo', 'email','pais', 'telefono')
+    list_filter = ('activo', 'puede_volver', 'pais', 'fecha_registro')
+    # Búsquedas por prefijo / exactas (LIKE sin comodín inicial): usan los
+    # índices de cada columna, COLLATE NOCASE en SQLite (migración 0013).
+    # El país se elige en list_filter.
+    search_fields = ('^nombre_completo', '=email', '^telefono')
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
     readonly_fields = ('fecha_registro', 'fecha_desactivacion', 'desactivado_por')
     ordering = ('-fecha_registro',)
     actions = [reactivar_miembros, desactivar_miembros_temporal, desactivar_miembros_permanente]
@@ -84,35 +151,184 @@ class MiembroAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         """
         Controla la creación de un nuevo miembro desde el admin.
-        Genera un usuario de Django y envía correo de bienvenida solo al crear.
+        Al crear, guarda el miembro y su usuario de Django en una sola
+        transacción; el correo de bienvenida sale al confirmarse.
         """
-        if not change:
-            if not obj.email:
-                raise ValidationError("Debes proporcionar un correo electrónico válido.")
-            user, password, username = crear_usuario_para_miembro(obj.email, obj.nombre_completo)
-            enviar_correo_bienvenida(obj.nombre_completo, username, obj.email, password)
-        super().save_model(request, obj, form, change)
+        if change:
+            super().save_model(request, obj, form, change)
+        else:
+            provisionar_miembro(obj)
+
+
+class BusquedaTextoCompletoMixin:
+    """
+    Añade a search_fields la búsqueda en el índice de texto completo del
+    modelo (motivo o descripción), en lugar de un icontains que recorre
+    toda la tabla.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        resultado, duplicados = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            coincidencias = buscar(self.model.objects.all(), search_term).values('pk')
+            resultado = resultado | queryset.filter(pk__in=coincidencias)
+        return resultado, duplicados
 
 
 @admin.register(Sancion)
-class SancionAdmin(admin.ModelAdmin):
+class SancionAdmin(BusquedaTextoCompletoMixin, admin.ModelAdmin):
     """
     Admin para Sanciones.
     """
     list_display = ('miembro', 'motivo', 'fecha', 'duracion_dias', 'impuesta_por')
+    list_select_related = ('miembro', 'impuesta_por')
     list_filter = ('fecha',)
-    search_fields = ('miembro__nombre_completo', 'motivo')
+    search_fields = ('^miembro__nombre_completo',)
+    autocomplete_fields = ('miembro',)
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
     readonly_fields = ('fecha', 'impuesta_por')
     ordering = ('-fecha',)
 
 
 @admin.register(SolicitudCorreccion)
-class SolicitudCorreccionAdmin(admin.ModelAdmin):
+class SolicitudCorreccionAdmin(BusquedaTextoCompletoMixin, admin.ModelAdmin):
     """
     Admin para Solicitudes de Corrección.
     """
     list_display = ('miembro', 'estado', 'fecha')
+    list_select_related = ('miembro',)
     list_filter = ('estado', 'fecha')
-    search_fields = ('miembro__nombre_completo', 'descripcion')
+    search_fields = ('^miembro__nombre_completo',)
+    autocomplete_fields = ('miembro',)
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
     readonly_fields = ('fecha',)
     ordering = ('-fecha',)
+
+
+# --------------------- DUPLICADOS ---------------------
+
+@admin.action(description="Fusionar (conservar el miembro más antiguo)")
+def fusionar_duplicados(modeladmin, request, queryset):
+    """
+    Fusiona cada par pendiente seleccionado: sanciones y solicitudes pasan
+    al miembro conservado y el duplicado se elimina.
+    """
+    fusionados = 0
+    for candidato in queryset.filter(
+        estado=EstadoDuplicado.PENDIENTE, miembro_a__isnull=False, miembro_b__isnull=False
+    ):
+        try:
+            fusionar(candidato)
+        except (ValidationError, DuplicadoCandidato.DoesNotExist):
+            # Otro par de la misma selección ya fusionó o eliminó este duplicado.
+            continue
+        fusionados += 1
+    modeladmin.message_user(request, f"Pares fusionados: {fusionados}.", messages.SUCCESS)
+
+
+@admin.action(description="Marcar como no duplicados")
+def descartar_duplicados(modeladmin, request, queryset):
+    queryset.filter(estado=EstadoDuplicado.PENDIENTE).update(estado=EstadoDuplicado.DESCARTADO)
+
+
+@admin.register(DuplicadoCandidato)
+class DuplicadoCandidatoAdmin(admin.ModelAdmin):
+    """
+    Revisión de los posibles duplicados generados por detectar_duplicados.
+    """
+    list_display = ('miembro_a', 'miembro_b', 'puntaje', 'motivos', 'estado', 'fecha_deteccion')
+    list_select_related = ('miembro_a', 'miembro_b')
+    list_filter = ('estado',)
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
+    readonly_fields = ('miembro_a', 'conservado', 'miembro_b', 'fusionado', 'puntaje', 'motivos', 'estado', 'fecha_deteccion')
+    actions = [fusionar_duplicados, descartar_duplicados]
+
+    def has_add_permission(self, request):
+        return False
+
+
+# --------------------- SEGMENTOS ---------------------
+
+@admin.action(description="Recalcular desde cero")
+def recalcular_segmentos(modeladmin, request, queryset):
+    for segmento in queryset:
+        calcular(segmento)
+    modeladmin.message_user(request, f"Segmentos recalculados: {len(queryset)}.", messages.SUCCESS)
+
+
+@admin.register(Segmento)
+class SegmentoAdmin(admin.ModelAdmin):
+    """
+    Segmentos guardados. Se crean y editan por la API, que valida los
+    criterios; aquí se consultan, recalculan o eliminan.
+    """
+    list_display = ('nombre', 'total', 'creado_por', 'fecha_actualizacion')
+    list_select_related = ('creado_por',)
+    fields = ('nombre', 'criterios', 'total', 'creado_por', 'fecha_creacion', 'fecha_actualizacion')
+    readonly_fields = fields
+    actions = [recalcular_segmentos]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('ids')
+
+    def has_add_permission(self, request):
+        return False
+
+
+# --------------------- DIAGNÓSTICO ---------------------
+
+class RegistroDiagnosticoAdmin(admin.ModelAdmin):
+    """
+    Registros de solo lectura generados por el middleware de diagnóstico.
+    Se pueden consultar y borrar, no crear ni editar.
+    """
+    paginator = PaginadorConteoEstimado
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def texto_preformateado(self, texto):
+        return format_html('<pre style="white-space: pre-wrap;">{}</pre>', texto)
+
+
+@admin.register(ConsultaLenta)
+class ConsultaLentaAdmin(RegistroDiagnosticoAdmin):
+    list_display = ('fecha', 'duracion_ms', 'metodo', 'ruta', 'vista', 'sql_resumido')
+    list_filter = ('vista',)
+    fields = ('fecha', 'duracion_ms', 'metodo', 'ruta', 'vista', 'sql_completo', 'parametros', 'plan_completo')
+    readonly_fields = fields
+
+    def sql_resumido(self, obj):
+        return obj.sql[:120]
+
+    sql_resumido.short_description = "SQL"
+
+    def sql_completo(self, obj):
+        return self.texto_preformateado(obj.sql)
+
+    sql_completo.short_description = "SQL"
+
+    def plan_completo(self, obj):
+        return self.texto_preformateado(obj.plan)
+
+    plan_completo.short_description = "EXPLAIN"
+
+
+@admin.register(PerfilPeticion)
+class PerfilPeticionAdmin(RegistroDiagnosticoAdmin):
+    list_display = ('fecha', 'metodo', 'ruta', 'vista', 'estado', 'duracion_ms', 'consultas', 'usuario')
+    list_select_related = ('usuario',)
+    fields = ('fecha', 'usuario', 'metodo', 'ruta', 'vista', 'estado', 'duracion_ms', 'consultas', 'perfil')
+    readonly_fields = fields
+
+    def perfil(self, obj):
+        return self.texto_preformateado(obj.resultado)
+
+    perfil.short_description = "Perfil (cProfile)"
@@ -0,0 +1,197 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (
+    Miembro,
+    Sancion,
+    SolicitudCorreccion,
+    EstadoSolicitud,
+    MiembroArchivado,
+    SancionArchivada,
+    SolicitudArchivada,
+    CambioMiembro,
+)
+from .autocompletado import indice as autocompletado
+from .busqueda import INDICES, indexar
+from .eventos import contadores
+from .utils import en_lotes
+
+
+CAMPOS_MIEMBRO = [
+    'id', 'nombre_completo', 'email', 'pais', 'telefono', 'activo', 'puede_volver',
+    'fecha_registro', 'fecha_desactivacion', 'desactivado_por_id',
+]
+CAMPOS_SANCION = ['id', 'miembro_id', 'motivo', 'fecha', 'duracion_dias', 'impuesta_por_id']
+CAMPOS_SOLICITUD = ['id', 'miembro_id', 'descripcion', 'fecha', 'estado', 'respuesta']
+
+LOTE_POR_DEFECTO = 500
+
+
+def _mover(filas, modelo_origen, modelo_destino, **extra):
+    """
+    Copia las filas (diccionarios de values()) al modelo destino y las
+    elimina del origen. Debe llamarse dentro de una transacción.
+    """
+    if not filas:
+        return 0
+    modelo_destino.objects.bulk_create([modelo_destino(**fila, **extra) for fila in filas])
+    ids = [fila['id'] for fila in filas]
+    # El borrado quita también las filas del índice de texto y, para los
+    # miembros, los anota para los segmentos y los saca del autocompletado
+    # (miembros.signals).
+    for lote in en_lotes(modelo_origen.objects.db, ids):
+        modelo_origen.objects.filter(pk__in=lote).delete()
+    if modelo_origen is Miembro:
+        contadores.cambiaron()
+    return len(filas)
+
+
+def _recorrer(queryset, lote, procesar):
+    """
+    Recorre el queryset por lotes de claves primarias crecientes y procesa
+    cada lote en su propia transacción, de modo que el tamaño de cada
+    transacción está acotado y el avance está garantizado aunque se
+    descarten filas del lote.
+
+    Returns:
+        int: Suma de lo devuelto por ``procesar`` en cada lote.
+    """
+    ultimo = 0
+    total = 0
+    while True:
+        with transaction.atomic():
+            filas = list(
+                queryset.select_for_update().filter(pk__gt=ultimo).order_by('pk')[:lote]
+            )
+            if not filas:
+                return total
+            ultimo = filas[-1]['id']
+            total += procesar(filas)
+
+
+def archivar_miembros(dias_inactividad=365, lote=LOTE_POR_DEFECTO):
+    """
+    Archiva los miembros bloqueados permanentemente y los que llevan más de
+    ``dias_inactividad`` días desactivados, junto con sus sanciones y
+    solicitudes.
+
+    Returns:
+        int: Cantidad de miembros archivados.
+    """
+    limite = timezone.now() - timedelta(days=dias_inactividad)
+    candidatos = Miembro.objects.filter(activo=False).filter(
+        Q(puede_volver=False) | Q(fecha_desactivacion__lt=limite)
+    ).values(*CAMPOS_MIEMBRO)
+
+    def procesar(filas):
+        ids = [fila['id'] for fila in filas]
+        for fila in filas:
+            fila['telefono'] = str(fila['telefono']) if fila['telefono'] else ''
+        for bloque in en_lotes(Miembro.objects.db, ids):
+            _mover(
+                list(Sancion.objects.filter(miembro_id__in=bloque).values(*CAMPOS_SANCION)),
+                Sancion, SancionArchivada, con_miembro=True,
+            )
+            _mover(
+                list(SolicitudCorreccion.objects.filter(miembro_id__in=bloque).values(*CAMPOS_SOLICITUD)),
+                SolicitudCorreccion, SolicitudArchivada, con_miembro=True,
+            )
+        return _mover(filas, Miembro, MiembroArchivado)
+
+    return _recorrer(candidatos, lote, procesar)
+
+
+def archivar_sanciones(dias_vencidas=90, lote=LOTE_POR_DEFECTO):
+    """
+    Archiva las sanciones con duración que vencieron hace más de
+    ``dias_vencidas`` días. Las sanciones sin duración no vencen.
+
+    Returns:
+        int: Cantidad de sanciones archivadas.
+    """
+    limite = timezone.now() - timedelta(days=dias_vencidas)
+    candidatas = Sancion.objects.filter(
+        duracion_dias__isnull=False, fecha__lt=limite
+    ).values(*CAMPOS_SANCION)
+
+    def procesar(filas):
+        vencidas = [
+            fila for fila in filas
+            if fila['fecha'] + timedelta(days=fila['duracion_dias']) < limite
+        ]
+        return _mover(vencidas, Sancion, SancionArchivada)
+
+    return _recorrer(candidatas, lote, procesar)
+
+
+def archivar_solicitudes(dias_resueltas=180, lote=LOTE_POR_DEFECTO):
+    """
+    Archiva las solicitudes aprobadas o rechazadas enviadas hace más de
+    ``dias_resueltas`` días. Las pendientes nunca se archivan.
+
+    Returns:
+        int: Cantidad de solicitudes archivadas.
+    """
+    limite = timezone.now() - timedelta(days=dias_resueltas)
+    candidatas = SolicitudCorreccion.objects.exclude(
+        estado=EstadoSolicitud.PENDIENTE
+    ).filter(fecha__lt=limite).values(*CAMPOS_SOLICITUD)
+
+    return _recorrer(
+        candidatas, lote, lambda filas: _mover(filas, SolicitudCorreccion, SolicitudArchivada)
+    )
+
+
+def _restaurar(modelo, archivados, campos, campo_fecha):
+    """
+    Inserta en el modelo principal las copias archivadas conservando su id y
+    su fecha original (que auto_now_add reemplaza al insertar).
+    """
+    objetos = [modelo(**{campo: getattr(archivado, campo) for campo in campos}) for archivado in archivados]
+    fechas = [getattr(archivado, campo_fecha) for archivado in archivados]
+    modelo.objects.bulk_create(objetos)
+    for objeto, fecha in zip(objetos, fechas):
+        setattr(objeto, campo_fecha, fecha)
+    modelo.objects.bulk_update(objetos, [campo_fecha])
+    if modelo._meta.label in INDICES:
+        indexar(modelo, objetos)
+    if modelo is Miembro:
+        CambioMiembro.registrar([objeto.pk for objeto in objetos])
+        contadores.cambiaron()
+        autocompletado.actualizar(objetos)
+    return objetos
+
+
+def restaurar_miembro(pk):
+    """
+    Devuelve un miembro archivado a la tabla principal, junto con las
+    sanciones y solicitudes que se archivaron con él. El miembro vuelve
+    desactivado; reactivarlo sigue las reglas habituales.
+
+    Raises:
+        MiembroArchivado.DoesNotExist: Si no hay un miembro archivado con ese id.
+        ValidationError: Si su correo ya pertenece a otro miembro de la tabla principal.
+
+    Returns:
+        Miembro: El miembro restaurado.
+    """
+    with transaction.atomic():
+        archivado = MiembroArchivado.objects.select_for_update().get(pk=pk)
+        if Miembro.objects.filter(email=archivado.email).exists():
+            raise ValidationError("Ya existe un miembro con este correo en la tabla principal.")
+
+        miembro = _restaurar(Miembro, [archivado], CAMPOS_MIEMBRO, 'fecha_registro')[0]
+
+        sanciones = SancionArchivada.objects.filter(miembro_id=pk, con_miembro=True)
+        solicitudes = SolicitudArchivada.objects.filter(miembro_id=pk, con_miembro=True)
+        _restaurar(Sancion, list(sanciones), CAMPOS_SANCION, 'fecha')
+        _restaurar(SolicitudCorreccion, list(solicitudes), CAMPOS_SOLICITUD, 'fecha')
+
+        sanciones.delete()
+        solicitudes.delete()
+        archivado.delete()
+    return miembro
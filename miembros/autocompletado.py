@@ -0,0 +1,344 @@
+import bisect
+import logging
+import re
+import threading
+import time
+import unicodedata
+from array import array
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------- ÍNDICE DE PREFIJOS EN MEMORIA ---------------------
+# Cada miembro aporta una clave por palabra de su nombre (sin tildes, en
+# minúsculas) y otra con su correo. Todas las claves del índice base están
+# ordenadas y guardadas en tres arreglos, sin un objeto Python por miembro:
+#   - ``claves``: bytes con todas las claves una tras otra,
+#   - ``inicios``: array de desplazamientos (la clave i es claves[inicios[i]:inicios[i + 1]]),
+#   - ``ids``: array con el id del miembro de cada clave (4 u 8 bytes).
+# Un prefijo se resuelve con dos búsquedas binarias y se recorre el tramo
+# en orden: primero las claves más cortas ("ana" antes que "anabel").
+#
+# Las escrituras no reordenan los arreglos: los miembros modificados o
+# eliminados se anulan en el índice base y sus claves nuevas van a un
+# índice delta pequeño y ordenado. Al superar DELTA_MAXIMO entradas se
+# reconstruye todo desde la base de datos con una sola consulta.
+
+DELTA_MAXIMO = 50000
+SEPARADOR = b'\x00'
+LOTE_LECTURA = 5000
+# Con varias palabras se busca por la más larga y se piden más candidatos
+# para descartar los que no tienen las demás.
+SOBREMUESTRA = 5
+
+
+def _plegar(texto):
+    return unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode()
+
+
+def palabras(texto):
+    """Palabras de un texto sin tildes y en minúsculas."""
+    return re.findall(r'[a-z0-9]+', _plegar(texto or ''))
+
+
+def claves_de(nombre, email):
+    claves = {palabra.encode() for palabra in palabras(nombre)}
+    if email:
+        claves.add(_plegar(email).encode())
+    return claves
+
+
+def _entrada(clave, pk):
+    # Clave, separador e id en big-endian: ordenar las entradas como bytes
+    # las ordena por clave y luego por id.
+    return clave + SEPARADOR + pk.to_bytes(8, 'big')
+
+
+def _id_de(entrada):
+    return int.from_bytes(entrada[-8:], 'big')
+
+
+class IndicePrefijos:
+    """
+    Índice de prefijos de nombres y correos de miembros, del proceso.
+    Todas las operaciones toman un cerrojo; una búsqueda tarda microsegundos.
+    """
+
+    def __init__(self):
+        self._cerrojo = threading.Lock()
+        self._construccion = threading.Lock()
+        self._claves = b''
+        self._inicios = array('I', [0])
+        self._ids = array('q')
+        self._anulados = set()
+        self._delta = []
+        self._delta_por_id = {}
+        self._diario = None
+        self.construido = False
+        self.fecha_construccion = None
+
+    # ---- construcción ----
+
+    def construir(self, filas=None):
+        """
+        Reconstruye el índice a partir de ``filas`` (id, nombre, correo); por
+        defecto, todos los miembros leídos con una sola consulta por lotes.
+        Las escrituras que llegan mientras tanto se anotan y se vuelven a
+        aplicar sobre el índice nuevo.
+
+        Returns:
+            float: Segundos que tardó.
+        """
+        with self._construccion:
+            return self._construir(filas)
+
+    def _construir(self, filas):
+        from .models import Miembro
+
+        inicio = time.perf_counter()
+        with self._cerrojo:
+            self._diario = []
+        try:
+            if filas is None:
+                filas = Miembro.objects.order_by().values_list(
+                    'pk', 'nombre_completo', 'email'
+                ).iterator(chunk_size=LOTE_LECTURA)
+            entradas = []
+            mayor = 0
+            for pk, nombre, email in filas:
+                entradas.extend(_entrada(clave, pk) for clave in claves_de(nombre, email))
+                mayor = max(mayor, pk)
+            entradas.sort()
+
+            claves = bytearray()
+            inicios = array('I', [0])
+            # Ids de 4 bytes mientras quepan, como en los segmentos.
+            ids = array('I' if mayor < 2 ** 32 else 'q')
+            for entrada in entradas:
+                claves += entrada[:-9]
+                inicios.append(len(claves))
+                ids.append(_id_de(entrada))
+            del entradas
+        except BaseException:
+            with self._cerrojo:
+                self._diario = None
+            raise
+
+        with self._cerrojo:
+            diario, self._diario = self._diario, None
+            self._claves, self._inicios, self._ids = bytes(claves), inicios, ids
+            self._anulados, self._delta, self._delta_por_id = set(), [], {}
+            for pk, claves_nuevas in diario:
+                self._aplicar(pk, claves_nuevas)
+            self.construido = True
+            self.fecha_construccion = time.time()
+        segundos = time.perf_counter() - inicio
+        logger.info("Índice de autocompletado: %(entradas)s claves, %(total)s bytes.", self.memoria())
+        return segundos
+
+    def asegurar(self):
+        if not self.construido:
+            with self._construccion:
+                if not self.construido:
+                    self._construir(None)
+
+    def refrescar_si_vencido(self, segundos):
+        """
+        Reconstruye el índice en un hilo aparte si tiene más de ``segundos``.
+        Así cada worker recoge los cambios hechos por los demás procesos,
+        que sus propias escrituras no le notifican.
+        """
+        if not segundos or not self.construido or self._construccion.locked():
+            return
+        with self._cerrojo:
+            if time.time() - self.fecha_construccion < segundos:
+                return
+            # Evita que otras peticiones lancen la misma reconstrucción.
+            self.fecha_construccion = time.time()
+        self._en_segundo_plano()
+
+    def _en_segundo_plano(self):
+        def reconstruir():
+            try:
+                self.construir()
+            finally:
+                connections.close_all()
+
+        threading.Thread(target=reconstruir, daemon=True).start()
+
+    # ---- escrituras ----
+
+    def _aplicar(self, pk, claves):
+        """Reemplaza las claves de un miembro (None lo elimina). Con el cerrojo tomado."""
+        self._anulados.add(pk)
+        for entrada in self._delta_por_id.pop(pk, ()):
+            posicion = bisect.bisect_left(self._delta, entrada)
+            if posicion < len(self._delta) and self._delta[posicion] == entrada:
+                del self._delta[posicion]
+        if claves:
+            entradas = [_entrada(clave, pk) for clave in claves]
+            for entrada in entradas:
+                bisect.insort(self._delta, entrada)
+            self._delta_por_id[pk] = entradas
+
+    def _registrar(self, cambios):
+        with self._cerrojo:
+            if self._diario is not None:
+                self._diario.extend(cambios)
+            if not self.construido:
+                return False
+            for pk, claves in cambios:
+                self._aplicar(pk, claves)
+            return len(self._delta) > DELTA_MAXIMO
+
+    def _al_confirmar(self, cambios):
+        def aplicar():
+            if self._registrar(cambios) and not self._construccion.locked():
+                self._en_segundo_plano()
+
+        transaction.on_commit(aplicar)
+
+    def actualizar(self, miembros):
+        """
+        Refleja en el índice los miembros creados o modificados, al
+        confirmarse la transacción actual.
+        """
+        self._al_confirmar([(miembro.pk, claves_de(miembro.nombre_completo, miembro.email)) for miembro in miembros])
+
+    def quitar(self, ids):
+        self._al_confirmar([(pk, None) for pk in ids])
+
+    # ---- búsqueda ----
+
+    def _rango(self, prefijo):
+        claves, inicios = self._claves, self._inicios
+
+        def menor(objetivo):
+            bajo, alto = 0, len(inicios) - 1
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                if claves[inicios[medio]:inicios[medio + 1]] < objetivo:
+                    bajo = medio + 1
+                else:
+                    alto = medio
+            return bajo
+
+        return menor(prefijo), menor(prefijo + b'\xff')
+
+    def _clave(self, posicion):
+        return self._claves[self._inicios[posicion]:self._inicios[posicion + 1]]
+
+    def buscar(self, prefijo, cantidad):
+        """
+        Ids de hasta ``cantidad`` miembros con alguna clave que empieza por
+        ``prefijo`` (ya normalizado), en orden de clave. Mezcla el tramo del
+        índice base con el del delta y se detiene al juntar ``cantidad``.
+        """
+        prefijo = prefijo.encode()
+        resultado = []
+        vistos = set()
+        with self._cerrojo:
+            actual, alto = self._rango(prefijo)
+            posicion = bisect.bisect_left(self._delta, prefijo)
+            while len(resultado) < cantidad:
+                entrada = None
+                if posicion < len(self._delta) and self._delta[posicion].startswith(prefijo):
+                    entrada = self._delta[posicion]
+                if actual < alto and (entrada is None or self._clave(actual) <= entrada[:-9]):
+                    pk = self._ids[actual]
+                    actual += 1
+                    if pk in self._anulados:
+                        continue
+                elif entrada is not None:
+                    pk = _id_de(entrada)
+                    posicion += 1
+                else:
+                    break
+                if pk not in vistos:
+                    vistos.add(pk)
+                    resultado.append(pk)
+        return resultado
+
+    def memoria(self):
+        """
+        Tamaño del índice en bytes, por componente.
+        """
+        with self._cerrojo:
+            datos = {
+                'entradas': len(self._ids),
+                'claves': len(self._claves),
+                'inicios': self._inicios.itemsize * len(self._inicios),
+                'ids': self._ids.itemsize * len(self._ids),
+                'entradas_delta': len(self._delta),
+                'delta': sum(len(entrada) for entrada in self._delta) + 8 * len(self._delta),
+            }
+        datos['total'] = datos['claves'] + datos['inicios'] + datos['ids'] + datos['delta']
+        return datos
+
+
+indice = IndicePrefijos()
+
+
+def construir_al_iniciar():
+    """
+    Construye el índice al cargar la aplicación (core/wsgi.py y
+    core/asgi.py) si AUTOCOMPLETADO_AL_INICIAR está activo. Con un servidor
+    que precarga la app antes de bifurcar workers (gunicorn --preload) el
+    índice se construye una vez y los workers lo comparten al bifurcar.
+    """
+    if not settings.AUTOCOMPLETADO_AL_INICIAR:
+        return
+    try:
+        indice.asegurar()
+    except DatabaseError:
+        # Sin tablas todavía (antes de migrate) se construirá en la primera búsqueda.
+        logger.warning("No se pudo construir el índice de autocompletado al iniciar.", exc_info=True)
+    finally:
+        # La conexión no debe heredarse en los workers bifurcados.
+        connections.close_all()
+
+
+def sugerir(texto, cantidad, indice=indice):
+    """
+    Hasta ``cantidad`` miembros cuyo nombre tiene palabras que empiezan por
+    las de ``texto`` (sin tildes ni mayúsculas), o cuyo correo empieza por
+    ``texto`` si contiene "@". Solo lee de la base de datos las filas que
+    devuelve.
+
+    Returns:
+        list: Diccionarios con id, nombre_completo, email y activo.
+    """
+    from .models import Miembro
+
+    texto = (texto or '').strip()
+    buscadas = [_plegar(texto)] if '@' in texto else palabras(texto)
+    if not buscadas:
+        return []
+
+    indice.asegurar()
+    indice.refrescar_si_vencido(settings.AUTOCOMPLETADO_REFRESCO_SEGUNDOS)
+    principal = max(buscadas, key=len)
+    restantes = [palabra.encode() for palabra in buscadas if palabra != principal]
+    ids = indice.buscar(principal, cantidad * SOBREMUESTRA if restantes else cantidad)
+
+    filas = {
+        fila['id']: fila
+        for fila in Miembro.objects.filter(pk__in=ids).values('id', 'nombre_completo', 'email', 'activo')
+    }
+    resultado = []
+    for pk in ids:
+        fila = filas.get(pk)
+        if fila is None:
+            continue
+        if restantes:
+            claves = claves_de(fila['nombre_completo'], fila['email'])
+            if not all(any(clave.startswith(palabra) for clave in claves) for palabra in restantes):
+                continue
+        resultado.append(fila)
+        if len(resultado) == cantidad:
+            break
+    return resultado
@@ -0,0 +1,179 @@
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+
+# --------------------- ÍNDICES DE TEXTO COMPLETO ---------------------
+# Cada modelo indexado tiene una tabla auxiliar con el texto ya normalizado
+# (sin tildes, sin palabras vacías y reducido a raíces en español), cuyo id
+# es el del registro original:
+#   - SQLite: tabla virtual FTS5, ordenada por bm25.
+#   - MySQL: tabla InnoDB con índice FULLTEXT, ordenada por MATCH ... AGAINST.
+# En otros motores no hay índice y ?q= recurre a icontains sobre cada raíz.
+# La tabla se mantiene al día desde save() de los modelos, desde post_delete
+# (miembros/signals.py, que cubre también los borrados en cascada) y desde
+# los caminos masivos (sanciones en bloque y restauración); el comando
+# reindexar_busqueda la reconstruye completa.
+
+INDICES = {
+    'miembros.Sancion': ('motivo', 'miembros_sancion_busqueda'),
+    'miembros.SolicitudCorreccion': ('descripcion', 'miembros_solicitud_busqueda'),
+}
+
+MOTORES_CON_INDICE = ('sqlite', 'mysql')
+
+PALABRAS_VACIAS = frozenset("""
+    a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante
+    e el ella ellas ellos en entre era es esa esas ese eso esos esta estaba estas este esto estos
+    fue ha han hasta hay la las le les lo los me mi mas muy ni no nos o otra otras otro otros para
+    pero poco por porque que quien se sea ser si sin sobre su sus tambien te tiene todo todos tu
+    un una uno unos y ya yo
+""".split())
+
+# Terminaciones verbales y derivativas, de la más larga a la más corta.
+SUFIJOS = sorted("""
+    amiento imiento amientos imientos mente aciones iciones adora ador ante ancia encia idad
+    ivo iva oso osa ismo ista able ible ando iendo aron ieron aba aban aria eria iria ara iera
+    arse erse irse ado ido ada ida ar er ir
+""".split(), key=len, reverse=True)
+
+
+def _plegar(texto):
+    """Minúsculas y sin tildes ("Sanción" -> "sancion")."""
+    return unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode()
+
+
+def raiz(palabra):
+    """
+    Reduce una palabra ya plegada a su raíz con un stemmer ligero para
+    español: quita el plural, una terminación verbal o derivativa y la
+    vocal final. "sanciones", "sancionado" y "sancionar" comparten raíz.
+    """
+    if len(palabra) <= 3:
+        return palabra
+    if palabra.endswith('ces'):
+        palabra = palabra[:-3] + 'z'
+    elif palabra.endswith('es') and palabra[-3] not in 'aeiou':
+        palabra = palabra[:-2]
+    elif palabra.endswith('s'):
+        palabra = palabra[:-1]
+    for sufijo in SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= 4:
+            palabra = palabra[:-len(sufijo)]
+            break
+    if len(palabra) > 4 and palabra[-1] in 'aeo':
+        palabra = palabra[:-1]
+    return palabra
+
+
+def terminos(texto):
+    """
+    Convierte un texto en la lista de raíces que se indexan o se buscan.
+    """
+    return [
+        raiz(palabra)
+        for palabra in re.findall(r'[a-z0-9]+', _plegar(texto or ''))
+        if palabra not in PALABRAS_VACIAS
+    ]
+
+
+def _tabla(modelo):
+    return INDICES[modelo._meta.label][1]
+
+
+def indexar(modelo, objetos):
+    """
+    Escribe (o reemplaza) en el índice el texto de los objetos dados.
+    """
+    conexion = connections[modelo.objects.db]
+    if conexion.vendor not in MOTORES_CON_INDICE or not objetos:
+        return
+    campo = INDICES[modelo._meta.label][0]
+    tabla = conexion.ops.quote_name(_tabla(modelo))
+    filas = [(objeto.pk, ' '.join(terminos(getattr(objeto, campo)))) for objeto in objetos]
+    with conexion.cursor() as cursor:
+        if conexion.vendor == 'sqlite':
+            # FTS5 no admite REPLACE sobre rowid de forma fiable: se borra y se inserta.
+            cursor.executemany(f"DELETE FROM {tabla} WHERE rowid = %s", [(pk,) for pk, _ in filas])
+            cursor.executemany(f"INSERT INTO {tabla} (rowid, texto) VALUES (%s, %s)", filas)
+        else:
+            cursor.executemany(f"REPLACE INTO {tabla} (id, texto) VALUES (%s, %s)", filas)
+
+
+def desindexar(modelo, ids):
+    """
+    Elimina del índice los registros con los ids dados.
+    """
+    conexion = connections[modelo.objects.db]
+    if conexion.vendor not in MOTORES_CON_INDICE or not ids:
+        return
+    tabla = conexion.ops.quote_name(_tabla(modelo))
+    columna = 'rowid' if conexion.vendor == 'sqlite' else 'id'
+    with conexion.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {tabla} WHERE {columna} = %s", [(pk,) for pk in ids])
+
+
+def buscar(queryset, texto):
+    """
+    Filtra el queryset a los registros cuyo texto contiene todas las raíces
+    de ``texto`` y lo ordena por relevancia (anotada como ``relevancia``,
+    mayor es mejor).
+    """
+    modelo = queryset.model
+    consulta = terminos(texto)
+    if not consulta:
+        return queryset.none()
+
+    conexion = connections[queryset.db]
+    if conexion.vendor not in MOTORES_CON_INDICE:
+        campo = INDICES[modelo._meta.label][0]
+        for termino in consulta:
+            queryset = queryset.filter(**{f'{campo}__icontains': termino})
+        return queryset
+
+    tabla = conexion.ops.quote_name(_tabla(modelo))
+    origen = f"{conexion.ops.quote_name(modelo._meta.db_table)}.{conexion.ops.quote_name(modelo._meta.pk.column)}"
+    if conexion.vendor == 'sqlite':
+        expresion = ' '.join(f'"{termino}"' for termino in consulta)
+        coincidencias = RawSQL(f"SELECT rowid FROM {tabla} WHERE {tabla} MATCH %s", [expresion])
+        relevancia = RawSQL(
+            f"SELECT -bm25({tabla}) FROM {tabla} WHERE {tabla} MATCH %s AND rowid = {origen}",
+            [expresion],
+        )
+    else:
+        expresion = ' '.join(f'+{termino}' for termino in consulta)
+        coincidencias = RawSQL(
+            f"SELECT id FROM {tabla} WHERE MATCH(texto) AGAINST (%s IN BOOLEAN MODE)", [expresion]
+        )
+        relevancia = RawSQL(
+            f"SELECT MATCH(texto) AGAINST (%s) FROM {tabla} WHERE id = {origen}", [' '.join(consulta)]
+        )
+    return queryset.filter(pk__in=coincidencias).annotate(relevancia=relevancia).order_by('-relevancia', '-pk')
+
+
+def reindexar(modelo, lote=1000):
+    """
+    Vacía y vuelve a llenar el índice de un modelo recorriendo la tabla
+    por lotes.
+
+    Returns:
+        int: Cantidad de registros indexados.
+    """
+    conexion = connections[modelo.objects.db]
+    if conexion.vendor not in MOTORES_CON_INDICE:
+        return 0
+    with conexion.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {conexion.ops.quote_name(_tabla(modelo))}")
+    campo = INDICES[modelo._meta.label][0]
+    total = 0
+    objetos = []
+    for objeto in modelo.objects.only('pk', campo).order_by('pk').iterator(chunk_size=lote):
+        objetos.append(objeto)
+        if len(objetos) == lote:
+            indexar(modelo, objetos)
+            total += len(objetos)
+            objetos = []
+    indexar(modelo, objetos)
+    return total + len(objetos)
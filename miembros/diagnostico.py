@@ -0,0 +1,278 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import ConsultaLenta, PerfilPeticion
+
+
+# --------------------- CONSULTAS LENTAS ---------------------
+
+class MuestreoConsultas:
+    """
+    Envoltorio de ejecución (connection.execute_wrapper) que cuenta las
+    consultas de una conexión y guarda las que superan el umbral.
+    """
+
+    def __init__(self, alias, umbral_ms):
+        self.alias = alias
+        self.umbral = umbral_ms / 1000
+        self.total = 0
+        self.lentas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.total += 1
+            if duracion >= self.umbral:
+                self.lentas.append((sql, params, many, duracion))
+
+
+def explicar(alias, sql, params):
+    """
+    Devuelve el plan de ejecución de una consulta SELECT como texto, o una
+    cadena vacía si el motor no lo ofrece o la consulta no es un SELECT.
+    """
+    conexion = connections[alias]
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    prefijo = {'sqlite': 'EXPLAIN QUERY PLAN ', 'mysql': 'EXPLAIN '}.get(conexion.vendor)
+    if prefijo is None:
+        return ''
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute(prefijo + sql, params)
+            return '\n'.join(' | '.join(str(valor) for valor in fila) for fila in cursor.fetchall())
+    except DatabaseError as error:
+        return f"No se pudo obtener el plan: {error}"
+
+
+class MuestreoPlanes:
+    """
+    Decide qué consultas lentas llevan EXPLAIN: cada texto SQL se explica
+    como mucho una vez cada ``segundos`` por proceso, de modo que una
+    consulta lenta repetida no suma un EXPLAIN a cada petición. Con 0 no
+    se explica ninguna.
+    """
+
+    MAXIMO = 1000
+
+    def __init__(self):
+        self._cerrojo = threading.Lock()
+        self._ultimas = {}
+
+    def toca(self, sql, segundos):
+        if not segundos:
+            return False
+        ahora = time.monotonic()
+        with self._cerrojo:
+            if ahora - self._ultimas.get(sql, -segundos) < segundos:
+                return False
+            if len(self._ultimas) >= self.MAXIMO:
+                self._ultimas.clear()
+            self._ultimas[sql] = ahora
+            return True
+
+    def olvidar(self):
+        with self._cerrojo:
+            self._ultimas.clear()
+
+
+planes = MuestreoPlanes()
+
+
+def describir_parametros(params, many):
+    """
+    Tipos de los parámetros de una consulta, sin sus valores (correos,
+    nombres y demás datos personales no se guardan).
+    """
+    if params is None:
+        return ''
+    if many:
+        return f"{len(params)} filas" if hasattr(params, '__len__') else "varias filas"
+    valores = params.values() if isinstance(params, dict) else params
+    return ', '.join(type(valor).__name__ for valor in valores)
+
+
+def _vista(request):
+    coincidencia = getattr(request, 'resolver_match', None)
+    return coincidencia._func_path if coincidencia else ''
+
+
+class MiddlewareSincronoYAsincrono:
+    """
+    Base de los middlewares de diagnóstico: con ASGI la cadena es asíncrona
+    y __call__ devuelve la corrutina de ``__acall__``, de modo que Django no
+    pasa cada petición (ni el flujo de eventos) por un adaptador síncrono.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.asincrono = iscoroutinefunction(get_response)
+        if self.asincrono:
+            markcoroutinefunction(self)
+
+
+class ConsultasLentasMiddleware(MiddlewareSincronoYAsincrono):
+    """
+    Mide todas las consultas SQL de cada petición y registra en
+    ConsultaLenta las que tardan al menos CONSULTA_LENTA_MS, con la vista
+    que las ejecutó, los tipos de sus parámetros y, según MuestreoPlanes,
+    su EXPLAIN. El registro se escribe al terminar la petición, fuera de su
+    transacción. Se guarda la ruta sin la cadena de consulta, que puede
+    llevar datos personales o credenciales.
+    """
+
+    def _preparar(self, request):
+        muestreos = [MuestreoConsultas(alias, settings.CONSULTA_LENTA_MS) for alias in connections]
+        request.muestreos_sql = muestreos
+        return muestreos
+
+    @staticmethod
+    def _instalar(pila, muestreos):
+        for muestreo in muestreos:
+            pila.enter_context(connections[muestreo.alias].execute_wrapper(muestreo))
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+        muestreos = self._preparar(request)
+        with ExitStack() as pila:
+            self._instalar(pila, muestreos)
+            respuesta = self.get_response(request)
+        self._registrar(request, muestreos)
+        return respuesta
+
+    async def __acall__(self, request):
+        muestreos = self._preparar(request)
+        # Las conexiones son del hilo: el envoltorio se instala en el hilo
+        # donde sync_to_async (thread_sensitive) ejecuta las partes síncronas
+        # de esta petición, que es donde corren sus consultas.
+        pila = ExitStack()
+        await sync_to_async(self._instalar)(pila, muestreos)
+        try:
+            respuesta = await self.get_response(request)
+        finally:
+            await sync_to_async(pila.close)()
+        if any(muestreo.lentas for muestreo in muestreos):
+            await sync_to_async(self._registrar)(request, muestreos)
+        return respuesta
+
+    def _registrar(self, request, muestreos):
+        for muestreo in muestreos:
+            for sql, params, many, duracion in muestreo.lentas:
+                ConsultaLenta.registrar(
+                    settings.CONSULTAS_LENTAS_CAPACIDAD,
+                    duracion_ms=duracion * 1000,
+                    metodo=request.method,
+                    ruta=request.path[:500],
+                    vista=_vista(request),
+                    sql=sql,
+                    parametros=describir_parametros(params, many),
+                    plan=(
+                        explicar(muestreo.alias, sql, params)
+                        if not many and planes.toca(sql, settings.CONSULTAS_LENTAS_EXPLAIN_SEGUNDOS)
+                        else ''
+                    ),
+                )
+
+
+# --------------------- PERFILADO A PEDIDO ---------------------
+
+def _administrador(request):
+    """
+    Devuelve el usuario si es staff, autenticado por sesión (admin) o por
+    JWT. El JWT se valida aquí porque DRF lo hace recién dentro de la vista.
+    """
+    if request.user.is_authenticated:
+        return request.user if request.user.is_staff else None
+    try:
+        resultado = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if resultado and resultado[0].is_staff:
+        return resultado[0]
+    return None
+
+
+class PerfilPeticionMiddleware(MiddlewareSincronoYAsincrono):
+    """
+    Perfila una petición con cProfile cuando un administrador la envía con
+    la cabecera ``X-Perfil: 1`` o el parámetro ``?perfil=1``. El resultado
+    (funciones ordenadas por tiempo acumulado) se guarda en PerfilPeticion,
+    visible en el admin, y su id vuelve en la cabecera ``X-Perfil-Id``.
+    Para el resto de peticiones no hace nada. Con ASGI se perfila el hilo
+    que ejecuta las partes síncronas de la petición (vistas DRF y ORM).
+    """
+
+    FUNCIONES = 60
+
+    @staticmethod
+    def _pedido(request):
+        return (request.headers.get('X-Perfil') or request.GET.get('perfil')) in ('1', 'true')
+
+    def __call__(self, request):
+        if self.asincrono:
+            return self.__acall__(request)
+        if not self._pedido(request):
+            return self.get_response(request)
+        usuario = _administrador(request)
+        if usuario is None:
+            return self.get_response(request)
+
+        perfilador = cProfile.Profile()
+        inicio = time.perf_counter()
+        respuesta = perfilador.runcall(self.get_response, request)
+        return self._registrar(request, respuesta, usuario, perfilador, time.perf_counter() - inicio)
+
+    async def __acall__(self, request):
+        if not self._pedido(request):
+            return await self.get_response(request)
+        usuario = await sync_to_async(_administrador)(request)
+        if usuario is None:
+            return await self.get_response(request)
+
+        perfilador = cProfile.Profile()
+        inicio = time.perf_counter()
+        await sync_to_async(perfilador.enable)()
+        try:
+            respuesta = await self.get_response(request)
+        finally:
+            await sync_to_async(perfilador.disable)()
+        return await sync_to_async(self._registrar)(
+            request, respuesta, usuario, perfilador, time.perf_counter() - inicio
+        )
+
+    def _registrar(self, request, respuesta, usuario, perfilador, duracion):
+        # ConsultasLentasMiddleware va después en MIDDLEWARE y deja su conteo en la petición.
+        consultas = sum(muestreo.total for muestreo in getattr(request, 'muestreos_sql', []))
+
+        salida = io.StringIO()
+        pstats.Stats(perfilador, stream=salida).sort_stats('cumulative').print_stats(self.FUNCIONES)
+        perfil = PerfilPeticion.registrar(
+            settings.PERFILES_CAPACIDAD,
+            usuario=usuario,
+            metodo=request.method,
+            ruta=request.path[:500],
+            vista=_vista(request),
+            estado=respuesta.status_code,
+            duracion_ms=duracion * 1000,
+            consultas=consultas,
+            resultado=salida.getvalue(),
+        )
+        respuesta['X-Perfil-Id'] = str(perfil.pk)
+        return respuesta
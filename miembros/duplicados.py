@@ -0,0 +1,207 @@
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q
+
+from .eventos import contadores
+from .models import (
+    Miembro,
+    Sancion,
+    SolicitudCorreccion,
+    DuplicadoCandidato,
+    EstadoDuplicado,
+)
+
+
+# --------------------- DETECCIÓN ---------------------
+# En lugar de comparar todos los pares (cuadrático), cada miembro se reparte
+# en "bloques" según claves baratas de calcular y solo se comparan los
+# miembros que comparten algún bloque:
+#   - teléfono normalizado (solo dígitos),
+#   - parte local del correo ("jperez" en jperez@gmail.com),
+#   - país + cada par de prefijos de 4 letras de las palabras del nombre,
+#     que tolera tildes, orden distinto y errores al final de una palabra.
+# Los bloques más grandes que ``max_bloque`` (nombres muy comunes) se
+# omiten: compararlos sería cuadrático y casi todos sus pares son falsos.
+
+PARTICULAS = frozenset({'de', 'del', 'la', 'las', 'los', 'y', 'da', 'do', 'dos', 'van', 'von'})
+
+PESO_TELEFONO = 0.45
+PESO_NOMBRE = 0.35
+PESO_CORREO = 0.2
+
+UMBRAL_POR_DEFECTO = 0.5
+MAX_BLOQUE_POR_DEFECTO = 50
+LOTE_LECTURA = 5000
+
+
+def _plegar(texto):
+    return unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode()
+
+
+def normalizar_nombre(nombre):
+    """
+    Devuelve las palabras del nombre sin tildes ni partículas ("de", "la"...).
+    """
+    return [palabra for palabra in re.findall(r'[a-z]+', _plegar(nombre or '')) if palabra not in PARTICULAS]
+
+
+def normalizar_telefono(telefono):
+    return re.sub(r'\D', '', str(telefono or ''))
+
+
+def parte_local(email):
+    return (email or '').split('@')[0].lower()
+
+
+def claves_de_bloqueo(palabras, telefono, local, pais):
+    claves = []
+    if len(telefono) >= 7:
+        claves.append(('t', telefono))
+    if len(local) >= 4:
+        claves.append(('e', local))
+    prefijos = sorted({palabra[:4] for palabra in palabras if len(palabra) >= 3})
+    for primero, segundo in combinations(prefijos, 2):
+        claves.append(('n', pais, primero, segundo))
+    return claves
+
+
+def puntuar(a, b):
+    """
+    Puntaje entre 0 y 1 de que dos miembros sean la misma persona, y las
+    coincidencias que lo explican. ``a`` y ``b`` son tuplas
+    (nombre normalizado, teléfono, parte local del correo).
+    """
+    nombre_a, telefono_a, local_a = a
+    nombre_b, telefono_b, local_b = b
+    motivos = []
+    puntaje = 0.0
+    if telefono_a and telefono_a == telefono_b:
+        puntaje += PESO_TELEFONO
+        motivos.append('telefono')
+    if local_a and local_a == local_b:
+        puntaje += PESO_CORREO
+        motivos.append('correo')
+    similitud = SequenceMatcher(None, nombre_a, nombre_b).ratio()
+    puntaje += PESO_NOMBRE * similitud
+    if similitud >= 0.85:
+        motivos.append('nombre')
+    return puntaje, motivos
+
+
+def generar_candidatos(filas, umbral=UMBRAL_POR_DEFECTO, max_bloque=MAX_BLOQUE_POR_DEFECTO):
+    """
+    Genera los pares candidatos a partir de filas
+    (id, nombre, teléfono, correo, país) y los puntúa.
+
+    Returns:
+        tuple: Lista de (id_a, id_b, puntaje, motivos) con id_a < id_b y
+        puntaje >= umbral, y un diccionario con las cifras del proceso.
+    """
+    datos = {}
+    # Casi todas las claves son de un solo miembro: se guarda su id sin
+    # crear una lista, y solo los bloques con dos o más miembros la tienen.
+    primero = {}
+    bloques = defaultdict(list)
+    for pk, nombre, telefono, email, pais in filas:
+        palabras = normalizar_nombre(nombre)
+        telefono = normalizar_telefono(telefono)
+        local = parte_local(email)
+        datos[pk] = (' '.join(sorted(palabras)), telefono, local)
+        for clave in claves_de_bloqueo(palabras, telefono, local, pais):
+            if primero.setdefault(clave, pk) != pk:
+                bloques[clave].append(pk)
+
+    pares = set()
+    omitidos = 0
+    for clave, miembros in bloques.items():
+        if len(miembros) + 1 > max_bloque:
+            omitidos += 1
+            continue
+        pares.update(combinations(sorted([primero[clave], *miembros]), 2))
+    del primero, bloques
+
+    candidatos = []
+    for a, b in pares:
+        puntaje, motivos = puntuar(datos[a], datos[b])
+        if puntaje >= umbral:
+            candidatos.append((a, b, round(puntaje, 3), ','.join(motivos)))
+
+    return candidatos, {
+        'miembros': len(datos),
+        'bloques_omitidos': omitidos,
+        'pares_comparados': len(pares),
+        'candidatos': len(candidatos),
+    }
+
+
+def detectar_duplicados(umbral=UMBRAL_POR_DEFECTO, max_bloque=MAX_BLOQUE_POR_DEFECTO):
+    """
+    Recorre los miembros una vez, guarda como pendientes los pares que
+    alcanzan ``umbral`` y devuelve las cifras del proceso. Los pendientes
+    anteriores se reemplazan; los pares ya revisados (fusionados o
+    descartados) se conservan y no se vuelven a proponer.
+    """
+    filas = Miembro.objects.order_by().values_list(
+        'id', 'nombre_completo', 'telefono', 'email', 'pais'
+    ).iterator(chunk_size=LOTE_LECTURA)
+    candidatos, cifras = generar_candidatos(filas, umbral, max_bloque)
+
+    with transaction.atomic():
+        DuplicadoCandidato.objects.filter(estado=EstadoDuplicado.PENDIENTE).delete()
+        DuplicadoCandidato.objects.bulk_create(
+            [
+                DuplicadoCandidato(miembro_a_id=a, miembro_b_id=b, puntaje=puntaje, motivos=motivos)
+                for a, b, puntaje, motivos in candidatos
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+    return cifras
+
+
+# --------------------- FUSIÓN ---------------------
+
+def fusionar(candidato):
+    """
+    Fusiona un par pendiente: las sanciones y solicitudes del duplicado
+    (``miembro_b``) pasan al miembro conservado (``miembro_a``), se
+    desactiva el usuario de Django del duplicado y se elimina el duplicado.
+    El par queda como historial con estado fusionado y el nombre y correo
+    de ambos miembros.
+
+    Raises:
+        ValidationError: Si el par ya no está pendiente o le falta uno de
+            sus miembros.
+    """
+    with transaction.atomic():
+        candidato = DuplicadoCandidato.objects.select_for_update().get(pk=candidato.pk)
+        if candidato.estado != EstadoDuplicado.PENDIENTE:
+            raise ValidationError("Este par ya fue revisado.")
+        conservado, duplicado = candidato.miembro_a, candidato.miembro_b
+        if conservado is None or duplicado is None:
+            raise ValidationError("Uno de los miembros del par ya no existe.")
+        conservado_id = conservado.pk
+
+        Sancion.objects.filter(miembro=duplicado).update(miembro_id=conservado_id)
+        SolicitudCorreccion.objects.filter(miembro=duplicado).update(
+            miembro_id=conservado_id, version=F('version') + 1
+        )
+        User.objects.filter(email=duplicado.email).update(is_active=False)
+
+        candidato.estado = EstadoDuplicado.FUSIONADO
+        candidato.conservado = f"{conservado.nombre_completo} <{conservado.email}>"[:300]
+        candidato.fusionado = f"{duplicado.nombre_completo} <{duplicado.email}>"[:300]
+        candidato.save(update_fields=['estado', 'conservado', 'fusionado'])
+        # Los demás pares pendientes del duplicado dejan de tener sentido.
+        DuplicadoCandidato.objects.filter(
+            Q(miembro_a=duplicado) | Q(miembro_b=duplicado), estado=EstadoDuplicado.PENDIENTE
+        ).delete()
+        duplicado.delete()
+        contadores.cambiaron()
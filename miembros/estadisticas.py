@@ -0,0 +1,106 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import (
+    Miembro,
+    Sancion,
+    MiembroArchivado,
+    SancionArchivada,
+    EstadisticaDiaria,
+)
+
+
+def contar_estados():
+    """
+    Cantidad de miembros activos, inactivos (pueden volver) y bloqueados,
+    en una sola consulta GROUP BY.
+    """
+    contadores = {'activos': 0, 'inactivos': 0, 'bloqueados': 0}
+    filas = Miembro.objects.order_by().values_list('activo', 'puede_volver').annotate(total=Count('pk'))
+    for activo, puede_volver, total in filas:
+        if activo:
+            contadores['activos'] += total
+        elif puede_volver:
+            contadores['inactivos'] += total
+        else:
+            contadores['bloqueados'] += total
+    return contadores
+
+
+def _contar_por_dia(queryset, campo_fecha, campo_pais, desde, hasta):
+    """
+    Agrupa el queryset por día (hora local) del campo de fecha y por país,
+    en una sola consulta GROUP BY.
+    """
+    queryset = queryset.filter(**{f'{campo_fecha}__isnull': False})
+    if desde:
+        queryset = queryset.filter(**{f'{campo_fecha}__date__gte': desde})
+    if hasta:
+        queryset = queryset.filter(**{f'{campo_fecha}__date__lte': hasta})
+    return (
+        queryset.annotate(dia=TruncDate(campo_fecha), pais_evento=F(campo_pais))
+        .values_list('dia', 'pais_evento')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+
+
+def _pais_de_sancion_archivada():
+    """
+    País del miembro de una sanción archivada, esté el miembro en la tabla
+    principal o en el archivo.
+    """
+    return Coalesce(
+        Subquery(Miembro.objects.filter(pk=OuterRef('miembro_id')).values('pais')[:1]),
+        Subquery(MiembroArchivado.objects.filter(pk=OuterRef('miembro_id')).values('pais')[:1]),
+        Value(''),
+    )
+
+
+def recalcular_estadisticas(desde=None, hasta=None):
+    """
+    Reconstruye las estadísticas diarias del rango [desde, hasta] (ambos
+    opcionales) a partir de las tablas principales y del archivo histórico.
+    Las filas del rango se reemplazan en una sola transacción.
+
+    Returns:
+        int: Cantidad de filas (día, país) escritas.
+    """
+    fuentes = [
+        ('registros', Miembro.objects.all(), 'fecha_registro', 'pais'),
+        ('registros', MiembroArchivado.objects.all(), 'fecha_registro', 'pais'),
+        ('desactivaciones', Miembro.objects.all(), 'fecha_desactivacion', 'pais'),
+        ('desactivaciones', MiembroArchivado.objects.all(), 'fecha_desactivacion', 'pais'),
+        ('sanciones', Sancion.objects.all(), 'fecha', 'miembro__pais'),
+        (
+            'sanciones',
+            SancionArchivada.objects.annotate(pais_miembro=_pais_de_sancion_archivada()),
+            'fecha',
+            'pais_miembro',
+        ),
+    ]
+
+    totales = defaultdict(lambda: dict.fromkeys(EstadisticaDiaria.CAMPOS, 0))
+    for campo, queryset, campo_fecha, campo_pais in fuentes:
+        for dia, pais, total in _contar_por_dia(queryset, campo_fecha, campo_pais, desde, hasta):
+            totales[(dia, (pais or '').strip())][campo] += total
+
+    existentes = EstadisticaDiaria.objects.all()
+    if desde:
+        existentes = existentes.filter(fecha__gte=desde)
+    if hasta:
+        existentes = existentes.filter(fecha__lte=hasta)
+
+    with transaction.atomic():
+        existentes.delete()
+        EstadisticaDiaria.objects.bulk_create(
+            [
+                EstadisticaDiaria(fecha=dia, pais=pais, **contadores)
+                for (dia, pais), contadores in sorted(totales.items())
+            ],
+            batch_size=500,
+        )
+    return len(totales)
@@ -0,0 +1,275 @@
+import asyncio
+import itertools
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+
+# --------------------- BUS DE EVENTOS EN PROCESO ---------------------
+# Las escrituras publican eventos en un bus del proceso; cada conexión SSE
+# (ver EventosView) los lee de un historial acotado. El bus no guarda una
+# cola por suscriptor: publicar cuesta lo mismo con 10 que con 10.000
+# conexiones abiertas, porque solo despierta una vez a cada event loop y
+# cada suscriptor lee del historial a partir de su último id.
+#
+# Los ids son "<época>-<n>", donde la época identifica al proceso. Al
+# reconectar con Last-Event-ID de la misma época se reenvía lo que falte;
+# si la época es otra (reinicio o worker distinto) o el id ya salió del
+# historial, se envía un evento "reinicio" para que el cliente recargue.
+
+EPOCA = format(time.time_ns() // 1_000_000, 'x')
+
+
+def formatear(identificador, tipo, datos):
+    """
+    Texto de un evento en formato text/event-stream.
+    """
+    return (
+        f"id: {EPOCA}-{identificador}\n"
+        f"event: {tipo}\n"
+        f"data: {json.dumps(datos, cls=DjangoJSONEncoder, ensure_ascii=False)}\n\n"
+    )
+
+
+class BusEventos:
+    """
+    Pub/sub en memoria. ``publicar`` se puede llamar desde cualquier hilo;
+    ``esperar`` se usa desde corrutinas.
+    """
+
+    def __init__(self, capacidad):
+        self._cerrojo = threading.Lock()
+        self._historial = deque(maxlen=capacidad)
+        self._ultimo = 0
+        self._esperas = {}
+        self.suscriptores = 0
+
+    @property
+    def ultimo(self):
+        return self._ultimo
+
+    def publicar(self, tipo, datos):
+        """
+        Agrega el evento al historial y despierta a los suscriptores.
+
+        Returns:
+            int: Id del evento dentro de la época.
+        """
+        with self._cerrojo:
+            self._ultimo += 1
+            self._historial.append((self._ultimo, formatear(self._ultimo, tipo, datos)))
+            loops = list(self._esperas)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._despertar, loop)
+            except RuntimeError:
+                # El loop ya se cerró: se descarta su espera.
+                with self._cerrojo:
+                    self._esperas.pop(loop, None)
+        return self._ultimo
+
+    def _despertar(self, loop):
+        with self._cerrojo:
+            futuro = self._esperas.pop(loop, None)
+        if futuro is not None and not futuro.done():
+            futuro.set_result(None)
+
+    def posteriores(self, ultimo):
+        """
+        Eventos ya formateados con id mayor que ``ultimo``, o None si
+        alguno de ellos ya salió del historial.
+        """
+        with self._cerrojo:
+            if ultimo >= self._ultimo:
+                return []
+            primero = self._historial[0][0] if self._historial else self._ultimo + 1
+            if ultimo + 1 < primero:
+                return None
+            return [texto for _, texto in itertools.islice(self._historial, ultimo + 1 - primero, None)]
+
+    async def esperar(self, ultimo, segundos):
+        """
+        Espera hasta que haya eventos posteriores a ``ultimo`` o pasen
+        ``segundos``. Todos los suscriptores de un loop comparten un futuro.
+
+        Returns:
+            bool: True si hay eventos nuevos.
+        """
+        loop = asyncio.get_running_loop()
+        with self._cerrojo:
+            if self._ultimo > ultimo:
+                return True
+            futuro = self._esperas.get(loop)
+            if futuro is None:
+                futuro = self._esperas[loop] = loop.create_future()
+        # asyncio.wait no cancela el futuro compartido al vencer el plazo.
+        await asyncio.wait([futuro], timeout=segundos)
+        return self._ultimo > ultimo
+
+
+bus = BusEventos(settings.EVENTOS_HISTORIAL)
+
+
+def leer_ultimo_id(valor):
+    """
+    Interpreta un Last-Event-ID. Devuelve el número dentro de la época
+    actual, o None si falta, es de otra época o no es válido.
+    """
+    epoca, _, numero = (valor or '').strip().partition('-')
+    if epoca != EPOCA or not numero.isdigit():
+        return None
+    return int(numero)
+
+
+async def flujo(ultimo, iniciales=(), latido=None, bus=bus):
+    """
+    Genera el text/event-stream de una conexión: los eventos ``iniciales``,
+    luego todo lo publicado después de ``ultimo`` y un comentario de latido
+    cada ``latido`` segundos sin eventos, para que proxies y navegadores no
+    corten la conexión.
+    """
+    latido = latido or settings.EVENTOS_LATIDO_SEGUNDOS
+    bus.suscriptores += 1
+    try:
+        yield f"retry: {settings.EVENTOS_REINTENTO_MS}\n\n"
+        for texto in iniciales:
+            yield texto
+        while True:
+            pendientes = bus.posteriores(ultimo)
+            if pendientes is None:
+                ultimo = bus.ultimo
+                yield formatear(ultimo, 'reinicio', {})
+                continue
+            if pendientes:
+                ultimo += len(pendientes)
+                yield ''.join(pendientes)
+            elif not await bus.esperar(ultimo, latido):
+                yield ": latido\n\n"
+    finally:
+        bus.suscriptores -= 1
+
+
+# --------------------- TICKETS DE CONEXIÓN ---------------------
+# EventSource no envía la cabecera Authorization. En lugar de poner el JWT
+# en la URL (y con él en los logs de acceso), el cliente pide con su JWT un
+# ticket firmado que vence a los EVENTOS_TICKET_SEGUNDOS y sirve una sola
+# vez: la tabla TicketCanjeado, compartida por todos los workers, recuerda
+# los ya canjeados hasta que vencen.
+
+SAL_TICKET = 'miembros.eventos.ticket'
+
+
+def emitir_ticket(usuario):
+    return signing.dumps({'usuario': usuario.pk, 'nonce': secrets.token_urlsafe(12)}, salt=SAL_TICKET)
+
+
+def canjear_ticket(ticket):
+    """
+    Returns:
+        int | None: Id del usuario del ticket, o None si la firma no es
+        válida, venció o ya se usó.
+    """
+    vigencia = settings.EVENTOS_TICKET_SEGUNDOS
+    try:
+        datos = signing.loads(ticket, salt=SAL_TICKET, max_age=vigencia)
+    except signing.BadSignature:
+        return None
+    from .models import TicketCanjeado
+
+    # La clave primaria es el nonce: el segundo canje, desde cualquier
+    # worker, falla al insertar.
+    try:
+        with transaction.atomic():
+            TicketCanjeado.objects.create(nonce=datos['nonce'])
+    except IntegrityError:
+        return None
+    TicketCanjeado.objects.filter(fecha__lt=timezone.now() - timedelta(seconds=vigencia + 1)).delete()
+    return datos['usuario']
+
+
+# --------------------- PUBLICACIÓN DESDE LAS ESCRITURAS ---------------------
+
+def publicar_solicitudes(solicitudes):
+    """
+    Publica las solicitudes creadas o modificadas cuando la transacción
+    actual se confirma.
+    """
+    from .serializers import SolicitudCorreccionSerializer
+
+    def enviar():
+        for solicitud in solicitudes:
+            bus.publicar('solicitud', SolicitudCorreccionSerializer(solicitud, campos=None).data)
+
+    transaction.on_commit(enviar)
+
+
+def publicar_resolucion(estado, ids):
+    """
+    Publica una resolución masiva como un solo evento con los ids afectados.
+    """
+    if ids:
+        transaction.on_commit(lambda: bus.publicar('solicitudes_resueltas', {'estado': estado, 'ids': ids}))
+
+
+class ContadoresEstado:
+    """
+    Mantiene los contadores de activos, inactivos y bloqueados publicados
+    por el bus. Las escrituras solo avisan del cambio; el recálculo (una
+    consulta GROUP BY) corre en un hilo aparte como mucho una vez por
+    EVENTOS_INTERVALO_CONTADORES segundos, agrupando ráfagas de escrituras,
+    y solo se publica si los números cambiaron.
+    """
+
+    def __init__(self):
+        self._cerrojo = threading.Lock()
+        self._temporizador = None
+        self.valor = None
+
+    def cambiaron(self):
+        transaction.on_commit(self._programar)
+
+    def _programar(self):
+        with self._cerrojo:
+            if not bus.suscriptores:
+                # Nadie escucha: el próximo suscriptor recalculará.
+                self.valor = None
+                return
+            if self._temporizador is None:
+                self._temporizador = threading.Timer(settings.EVENTOS_INTERVALO_CONTADORES, self._recalcular)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+    def _recalcular(self):
+        from .estadisticas import contar_estados
+
+        with self._cerrojo:
+            self._temporizador = None
+        try:
+            valor = contar_estados()
+        finally:
+            connections.close_all()
+        if valor != self.valor:
+            self.valor = valor
+            bus.publicar('contadores', valor)
+
+    def actuales(self):
+        """
+        Contadores vigentes; los calcula si no hay un valor publicado.
+        """
+        from .estadisticas import contar_estados
+
+        if self.valor is None:
+            self.valor = contar_estados()
+        return self.valor
+
+
+contadores = ContadoresEstado()
@@ -0,0 +1,138 @@
+import time
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.utils.functional import cached_property
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+# --------------------- PLAZO DE CONSULTAS ---------------------
+# Una consulta demasiado amplia (p. ej. un icontains de una letra sobre toda
+# la tabla) no debe retener un worker decenas de segundos. Los listados y el
+# filtro de miembros corren con un plazo total para sus consultas:
+#   - SQLite: un progress handler aborta la sentencia en curso al vencer.
+#   - MySQL: cada SELECT lleva el hint MAX_EXECUTION_TIME con lo que resta.
+# Al vencer, la petición responde 503 en lugar de seguir esperando.
+
+class TiempoDeConsultaAgotado(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "La consulta superó el tiempo máximo permitido. Usa filtros más específicos."
+    default_code = 'tiempo_agotado'
+
+
+class DemasiadosResultados(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "La consulta devuelve demasiados resultados. Usa filtros más específicos."
+    default_code = 'demasiados_resultados'
+
+
+class PlazoDeConsultas:
+    """
+    Context manager que limita a ``milisegundos`` el tiempo total de las
+    consultas de la conexión ``alias`` dentro del bloque. Un plazo de 0
+    desactiva el límite.
+
+    Raises:
+        TiempoDeConsultaAgotado: Si una consulta se interrumpe por el plazo.
+    """
+
+    # Instrucciones de la máquina virtual de SQLite entre comprobaciones del reloj.
+    INSTRUCCIONES = 5000
+
+    def __init__(self, milisegundos, alias=DEFAULT_DB_ALIAS):
+        self.milisegundos = milisegundos
+        self.conexion = connections[alias]
+        self.fin = None
+        self._envoltorio = None
+
+    @property
+    def vencido(self):
+        return self.fin is not None and time.monotonic() >= self.fin
+
+    def __enter__(self):
+        if not self.milisegundos:
+            return self
+        self.fin = time.monotonic() + self.milisegundos / 1000
+        if self.conexion.vendor == 'sqlite':
+            self.conexion.ensure_connection()
+            self.conexion.connection.set_progress_handler(self._abortar, self.INSTRUCCIONES)
+        elif self.conexion.vendor == 'mysql':
+            self._envoltorio = self.conexion.execute_wrapper(self._con_hint)
+            self._envoltorio.__enter__()
+        return self
+
+    def __exit__(self, tipo, error, traza):
+        if self.fin is None:
+            return False
+        if self.conexion.vendor == 'sqlite' and self.conexion.connection is not None:
+            self.conexion.connection.set_progress_handler(None, 0)
+        elif self._envoltorio is not None:
+            self._envoltorio.__exit__(tipo, error, traza)
+        if isinstance(error, OperationalError) and self.vencido:
+            raise TiempoDeConsultaAgotado() from error
+        return False
+
+    def _abortar(self):
+        # Un valor verdadero interrumpe la sentencia con OperationalError.
+        return time.monotonic() >= self.fin
+
+    def _con_hint(self, execute, sql, params, many, context):
+        if sql[:6].upper() == 'SELECT':
+            restante = max(1, int((self.fin - time.monotonic()) * 1000))
+            sql = f"SELECT /*+ MAX_EXECUTION_TIME({restante}) */{sql[6:]}"
+        return execute(sql, params, many, context)
+
+
+def plazo_de_consultas():
+    return PlazoDeConsultas(settings.CONSULTAS_PLAZO_MS)
+
+
+# --------------------- TOPE DE FILAS EN LISTADOS ---------------------
+
+class PaginadorAcotado(Paginator):
+    """
+    Paginador que cuenta como mucho LISTADO_MAX_FILAS filas: el COUNT(*) se
+    hace sobre una subconsulta con LIMIT, de modo que su costo no crece con
+    la tabla. Las páginas posteriores al tope no existen.
+    """
+
+    truncado = False
+
+    @cached_property
+    def count(self):
+        maximo = settings.LISTADO_MAX_FILAS
+        if not maximo:
+            return super().count
+        if hasattr(self.object_list, 'values'):
+            total = self.object_list.order_by().values('pk')[:maximo + 1].count()
+        else:
+            total = len(self.object_list)
+        self.truncado = total > maximo
+        return min(total, maximo)
+
+
+class PaginacionAcotada(PageNumberPagination):
+    """
+    Paginación por número de página con conteo acotado. La respuesta indica
+    con ``truncado`` si hay más filas de las que ``count`` informa.
+    """
+
+    django_paginator_class = PaginadorAcotado
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'truncado': self.page.paginator.truncado,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        respuesta = super().get_paginated_response_schema(schema)
+        respuesta['properties']['truncado'] = {'type': 'boolean', 'example': False}
+        return respuesta
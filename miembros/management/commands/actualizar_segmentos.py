@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from miembros.segmentos import actualizar_segmentos
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza los ids materializados de los segmentos guardados con los miembros "
+        "creados, modificados o eliminados desde la última ejecución. Pensado para "
+        "ejecutarse periódicamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--completo', action='store_true',
+            help="Recalcula cada segmento desde cero en lugar de aplicar solo los cambios."
+        )
+
+    def handle(self, *args, **options):
+        segmentos, cambiados = actualizar_segmentos(completo=options['completo'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Segmentos actualizados: {segmentos} ({cambiados} miembros modificados)."
+        ))
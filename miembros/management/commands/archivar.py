@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from miembros.archivo import (
+    LOTE_POR_DEFECTO,
+    archivar_miembros,
+    archivar_sanciones,
+    archivar_solicitudes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve al archivo histórico los miembros bloqueados o inactivos hace tiempo, "
+        "las sanciones vencidas y las solicitudes resueltas antiguas, por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias-inactividad', type=int, default=365,
+            help="Días desactivado tras los que se archiva un miembro que puede volver."
+        )
+        parser.add_argument(
+            '--dias-sanciones', type=int, default=90,
+            help="Días desde el vencimiento tras los que se archiva una sanción."
+        )
+        parser.add_argument(
+            '--dias-solicitudes', type=int, default=180,
+            help="Antigüedad en días de las solicitudes resueltas que se archivan."
+        )
+        parser.add_argument(
+            '--lote', type=int, default=LOTE_POR_DEFECTO,
+            help="Filas por transacción."
+        )
+        parser.add_argument(
+            '--solo', choices=['miembros', 'sanciones', 'solicitudes'], action='append',
+            help="Archiva solo este tipo de registro (se puede repetir)."
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError("El tamaño de lote debe ser mayor que cero.")
+        tipos = options['solo'] or ['miembros', 'sanciones', 'solicitudes']
+        lote = options['lote']
+
+        # Los miembros van primero: sus sanciones y solicitudes se archivan con
+        # ellos y quedan marcadas para restaurarse juntas.
+        if 'miembros' in tipos:
+            total = archivar_miembros(options['dias_inactividad'], lote)
+            self.stdout.write(f"Miembros archivados: {total}")
+        if 'sanciones' in tipos:
+            total = archivar_sanciones(options['dias_sanciones'], lote)
+            self.stdout.write(f"Sanciones archivadas: {total}")
+        if 'solicitudes' in tipos:
+            total = archivar_solicitudes(options['dias_solicitudes'], lote)
+            self.stdout.write(f"Solicitudes archivadas: {total}")
+
+        self.stdout.write(self.style.SUCCESS("Archivado completado."))
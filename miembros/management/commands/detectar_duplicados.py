@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from miembros.duplicados import MAX_BLOQUE_POR_DEFECTO, UMBRAL_POR_DEFECTO, detectar_duplicados
+
+
+class Command(BaseCommand):
+    help = (
+        "Busca miembros que probablemente son la misma persona (mismo teléfono, "
+        "mismo usuario de correo o nombre parecido) y los deja para revisar en el admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--umbral', type=float, default=UMBRAL_POR_DEFECTO,
+            help="Puntaje mínimo (0 a 1) para guardar un par."
+        )
+        parser.add_argument(
+            '--max-bloque', type=int, default=MAX_BLOQUE_POR_DEFECTO,
+            help="Tamaño máximo de un bloque; los mayores (nombres muy comunes) se omiten."
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['umbral'] <= 1:
+            raise CommandError("--umbral debe estar entre 0 y 1.")
+        if options['max_bloque'] < 2:
+            raise CommandError("--max-bloque debe ser al menos 2.")
+
+        inicio = time.monotonic()
+        cifras = detectar_duplicados(options['umbral'], options['max_bloque'])
+        self.stdout.write(f"Miembros analizados: {cifras['miembros']}")
+        self.stdout.write(f"Pares comparados:    {cifras['pares_comparados']}")
+        self.stdout.write(f"Bloques omitidos:    {cifras['bloques_omitidos']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Posibles duplicados: {cifras['candidatos']} ({time.monotonic() - inicio:.1f} s)"
+        ))
@@ -0,0 +1,89 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from miembros.autocompletado import IndicePrefijos, palabras, sugerir
+
+
+NOMBRES = (
+    'ana', 'andrés', 'carlos', 'camila', 'daniel', 'diana', 'eduardo', 'elena', 'fernando',
+    'gabriela', 'jorge', 'josé', 'juan', 'julia', 'laura', 'luis', 'maría', 'mateo',
+    'natalia', 'pablo', 'ricardo', 'sofía', 'valentina', 'víctor',
+)
+APELLIDOS = (
+    'álvarez', 'castro', 'díaz', 'fernández', 'garcía', 'gómez', 'gonzález', 'hernández',
+    'jiménez', 'lópez', 'martínez', 'moreno', 'muñoz', 'pérez', 'ramírez', 'rodríguez',
+    'romero', 'ruiz', 'sánchez', 'torres', 'vargas',
+)
+
+
+def _sinteticos(cantidad, azar):
+    """
+    Filas (id, nombre, correo) con nombres realistas y una sílaba al azar
+    en el segundo apellido, para que haya muchas claves distintas.
+    """
+    for pk in range(1, cantidad + 1):
+        sufijo = ''.join(azar.choices(string.ascii_lowercase, k=3))
+        nombre = f"{azar.choice(NOMBRES)} {azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}{sufijo}"
+        email = f"{nombre.split()[0]}.{sufijo}{pk}@ejemplo.com"
+        yield pk, nombre, email
+
+
+class Command(BaseCommand):
+    help = (
+        "Construye el índice de autocompletado y muestra su tamaño en memoria, el tiempo "
+        "de construcción y la latencia de las búsquedas por prefijo. Con --sinteticos usa "
+        "miembros generados en lugar de los de la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sinteticos', type=int, default=0,
+            help="Cantidad de miembros generados (p. ej. 1000000). 0 usa la base de datos."
+        )
+        parser.add_argument('--busquedas', type=int, default=10000, help="Búsquedas a medir.")
+        parser.add_argument('--k', type=int, default=10, help="Resultados por búsqueda.")
+        parser.add_argument('--semilla', type=int, default=1)
+
+    def handle(self, *args, **options):
+        azar = random.Random(options['semilla'])
+        indice = IndicePrefijos()
+        filas = _sinteticos(options['sinteticos'], azar) if options['sinteticos'] else None
+        segundos = indice.construir(filas)
+
+        memoria = indice.memoria()
+        self.stdout.write(f"Construcción: {segundos:.1f} s, {memoria['entradas']} claves.")
+        for componente in ('claves', 'inicios', 'ids', 'delta', 'total'):
+            self.stdout.write(f"  {componente:<8} {memoria[componente] / 2 ** 20:9.1f} MiB")
+
+        # Prefijos de 1 a 6 letras tomados de las propias claves.
+        muestras = [
+            palabra
+            for nombre in NOMBRES + APELLIDOS
+            for palabra in palabras(nombre)
+        ]
+        prefijos = [
+            palabra[:azar.randint(1, min(6, len(palabra)))]
+            for palabra in azar.choices(muestras, k=options['busquedas'])
+        ]
+        tiempos = []
+        for prefijo in prefijos:
+            inicio = time.perf_counter()
+            indice.buscar(prefijo, options['k'])
+            tiempos.append((time.perf_counter() - inicio) * 1e6)
+        tiempos.sort()
+        self.stdout.write(
+            f"Búsqueda (k={options['k']}): mediana {statistics.median(tiempos):.0f} µs, "
+            f"p99 {tiempos[int(len(tiempos) * 0.99) - 1]:.0f} µs, máximo {tiempos[-1]:.0f} µs."
+        )
+
+        if not options['sinteticos']:
+            inicio = time.perf_counter()
+            for prefijo in prefijos[:1000]:
+                sugerir(prefijo, options['k'], indice=indice)
+            self.stdout.write(
+                f"Con lectura de filas: {(time.perf_counter() - inicio) / min(1000, len(prefijos)) * 1e3:.2f} ms por consulta."
+            )
@@ -0,0 +1,162 @@
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+ESQUEMA = """
+CREATE TABLE miembro (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL, pais TEXT NOT NULL, activo INTEGER NOT NULL);
+CREATE INDEX miembro_nombre ON miembro (nombre);
+CREATE TABLE sancion (id INTEGER PRIMARY KEY, miembro_id INTEGER NOT NULL, motivo TEXT NOT NULL, fecha REAL NOT NULL);
+CREATE TABLE estadistica (pais TEXT PRIMARY KEY, sanciones INTEGER NOT NULL);
+"""
+
+PAISES = ('CO', 'PE', 'MX', 'AR', 'CL', 'ES', 'US', 'VE')
+
+
+def _conectar(ruta, opciones):
+    """
+    Abre una conexión como lo hace el backend sqlite3 de Django con las
+    OPTIONS dadas: autocommit, ``timeout`` y cada sentencia de
+    ``init_command``.
+    """
+    conexion = sqlite3.connect(ruta, timeout=opciones.get('timeout', 5), isolation_level=None)
+    for sentencia in opciones.get('init_command', '').split(';'):
+        if sentencia.strip():
+            conexion.execute(sentencia)
+    return conexion
+
+
+def _trabajador(ruta, opciones, segundos, proporcion_escrituras, semilla):
+    """
+    Ejecuta durante ``segundos`` una mezcla de lecturas (página del listado
+    y conteo por país) y escrituras (leer el miembro, insertar una sanción y
+    sumar la estadística, en una transacción), como un worker de la API.
+
+    Returns:
+        tuple: (lecturas, escrituras, errores de bloqueo).
+    """
+    azar = random.Random(semilla)
+    conexion = _conectar(ruta, opciones)
+    inicio_transaccion = f"BEGIN {opciones.get('transaction_mode') or ''}".strip()
+    total = conexion.execute("SELECT COUNT(*) FROM miembro").fetchone()[0]
+    lecturas = escrituras = errores = 0
+
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        try:
+            if azar.random() < proporcion_escrituras:
+                miembro = azar.randint(1, total)
+                conexion.execute(inicio_transaccion)
+                try:
+                    pais = conexion.execute("SELECT pais FROM miembro WHERE id = ?", (miembro,)).fetchone()[0]
+                    conexion.execute(
+                        "INSERT INTO sancion (miembro_id, motivo, fecha) VALUES (?, ?, ?)",
+                        (miembro, "Prueba de carga", time.time()),
+                    )
+                    conexion.execute("UPDATE estadistica SET sanciones = sanciones + 1 WHERE pais = ?", (pais,))
+                    conexion.execute("COMMIT")
+                except BaseException:
+                    conexion.execute("ROLLBACK")
+                    raise
+                escrituras += 1
+            else:
+                conexion.execute(
+                    "SELECT id, nombre, pais FROM miembro ORDER BY nombre LIMIT 10 OFFSET ?",
+                    (azar.randint(0, max(total - 10, 0)),),
+                ).fetchall()
+                conexion.execute("SELECT pais, COUNT(*) FROM miembro WHERE activo = 1 GROUP BY pais").fetchall()
+                lecturas += 1
+        except sqlite3.OperationalError:
+            errores += 1
+    conexion.close()
+    return lecturas, escrituras, errores
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cómo escala el rendimiento de lecturas y escrituras de SQLite con el "
+        "número de workers, con la configuración por defecto y con la configurada "
+        "en DATABASES (WAL, busy_timeout, BEGIN IMMEDIATE). Usa una base temporal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trabajadores', default='1,2,4,8',
+            help="Cantidades de procesos a probar, separadas por coma."
+        )
+        parser.add_argument('--segundos', type=float, default=3, help="Duración de cada medición.")
+        parser.add_argument(
+            '--escrituras', type=float, default=0.2,
+            help="Proporción de operaciones que son escrituras (0 a 1)."
+        )
+        parser.add_argument('--filas', type=int, default=20000, help="Miembros en la base de prueba.")
+
+    def handle(self, *args, **options):
+        try:
+            trabajadores = [int(valor) for valor in options['trabajadores'].split(',')]
+        except ValueError:
+            raise CommandError("--trabajadores debe ser una lista de enteros separados por coma.")
+        if not 0 <= options['escrituras'] <= 1:
+            raise CommandError("--escrituras debe estar entre 0 y 1.")
+
+        configurado = settings.DATABASES['default']
+        if configurado['ENGINE'] != 'django.db.backends.sqlite3':
+            self.stdout.write(self.style.WARNING(
+                "La base configurada no es SQLite; se mide igualmente el modo definido en settings."
+            ))
+        modos = [
+            ('por defecto', {}),
+            ('configurado', settings.SQLITE_OPCIONES_CONCURRENTES),
+        ]
+
+        directorio = tempfile.mkdtemp(prefix='medir_sqlite_')
+        try:
+            plantilla = os.path.join(directorio, 'plantilla.sqlite3')
+            self._poblar(plantilla, options['filas'])
+
+            self.stdout.write(f"SQLite {sqlite3.sqlite_version}, {options['segundos']:g} s por medición, "
+                              f"{options['escrituras']:.0%} escrituras")
+            self.stdout.write(f"{'Modo':<12} {'Workers':>7} {'Lecturas/s':>11} {'Escrituras/s':>13} {'Bloqueos':>9}")
+            for nombre, opciones in modos:
+                for cantidad in trabajadores:
+                    ruta = os.path.join(directorio, f'medicion_{cantidad}.sqlite3')
+                    shutil.copy(plantilla, ruta)
+                    lecturas, escrituras, errores = self._medir(ruta, opciones, cantidad, options)
+                    segundos = options['segundos']
+                    self.stdout.write(
+                        f"{nombre:<12} {cantidad:>7} {lecturas / segundos:>11.0f} "
+                        f"{escrituras / segundos:>13.0f} {errores:>9}"
+                    )
+                    for sufijo in ('', '-wal', '-shm'):
+                        if os.path.exists(ruta + sufijo):
+                            os.remove(ruta + sufijo)
+        finally:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    def _poblar(self, ruta, filas):
+        conexion = sqlite3.connect(ruta)
+        conexion.executescript(ESQUEMA)
+        azar = random.Random(0)
+        conexion.executemany(
+            "INSERT INTO miembro (nombre, pais, activo) VALUES (?, ?, ?)",
+            ((f"Miembro {azar.random():.8f}", azar.choice(PAISES), int(azar.random() > 0.1)) for _ in range(filas)),
+        )
+        conexion.executemany("INSERT INTO estadistica (pais, sanciones) VALUES (?, 0)", ((pais,) for pais in PAISES))
+        conexion.commit()
+        conexion.close()
+
+    def _medir(self, ruta, opciones, cantidad, options):
+        with ProcessPoolExecutor(max_workers=cantidad) as pool:
+            tareas = [
+                pool.submit(_trabajador, ruta, opciones, options['segundos'], options['escrituras'], semilla)
+                for semilla in range(cantidad)
+            ]
+            resultados = [tarea.result() for tarea in tareas]
+        return tuple(sum(columna) for columna in zip(*resultados))
@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Script que se ejecuta en un proceso limpio con ``python -X importtime``.
+# Mide por fases el arranque real de un worker: carga de la aplicación
+# WSGI/ASGI (settings + django.setup) y la primera petición, que es la que
+# importa la URLconf, las vistas, los serializers y la autenticación JWT.
+SCRIPT_MEDICION = r"""
+import asyncio, importlib, json, sys, time
+
+modulo, atributo, objetivo = sys.argv[1], sys.argv[2], sys.argv[3]
+fases = {}
+
+inicio = time.perf_counter()
+application = getattr(importlib.import_module(modulo), atributo)
+fases['aplicacion'] = time.perf_counter() - inicio
+
+inicio = time.perf_counter()
+if objetivo == 'wsgi':
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/token/refresh/', 'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+        'wsgi.url_scheme': 'http', 'wsgi.input': __import__('io').BytesIO(),
+        'wsgi.errors': sys.stderr,
+    }
+    estado = []
+    b''.join(application(environ, lambda status, headers, *args: estado.append(status)))
+    codigo = int(estado[0].split()[0])
+else:
+    mensajes = []
+    cuerpo_enviado = []
+
+    async def recibir():
+        if cuerpo_enviado:
+            await asyncio.Event().wait()
+        cuerpo_enviado.append(True)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def enviar(mensaje):
+        mensajes.append(mensaje)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': '/api/token/refresh/', 'raw_path': b'/api/token/refresh/',
+        'query_string': b'', 'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+    }
+    asyncio.run(application(scope, recibir, enviar))
+    codigo = next(m['status'] for m in mensajes if m['type'] == 'http.response.start')
+fases['primera_peticion'] = time.perf_counter() - inicio
+
+fases['modulos'] = len(sys.modules)
+fases['codigo'] = codigo
+print(json.dumps(fases))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Perfila el arranque de un worker en un proceso limpio y muestra el costo "
+        "de importación acumulado de cada módulo hasta atender la primera petición."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--objetivo', choices=['wsgi', 'asgi'], default='wsgi',
+            help="Punto de entrada a perfilar (core/wsgi.py o core/asgi.py)."
+        )
+        parser.add_argument(
+            '--top', type=int, default=25,
+            help="Cantidad de módulos a mostrar, ordenados por costo acumulado."
+        )
+        parser.add_argument(
+            '--prefijo', default='',
+            help="Muestra solo los módulos cuyo nombre empiece con este prefijo."
+        )
+        parser.add_argument(
+            '--paquetes', action='store_true',
+            help="Agrupa el costo propio por paquete de primer nivel."
+        )
+
+    def handle(self, *args, **options):
+        if options['objetivo'] == 'wsgi':
+            ruta = settings.WSGI_APPLICATION
+        else:
+            ruta = getattr(settings, 'ASGI_APPLICATION', None) or 'core.asgi.application'
+        modulo, atributo = ruta.rsplit('.', 1)
+
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT_MEDICION, modulo, atributo, options['objetivo']],
+            cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True,
+        )
+        if proceso.returncode != 0:
+            raise CommandError(f"El proceso de medición falló:\n{proceso.stderr[-2000:]}")
+
+        fases = json.loads(proceso.stdout.strip().splitlines()[-1])
+        modulos = self._leer_importtime(proceso.stderr)
+
+        total = fases['aplicacion'] + fases['primera_peticion']
+        self.stdout.write(f"Punto de entrada: {ruta}")
+        self.stdout.write(f"  Carga de la aplicación: {fases['aplicacion'] * 1000:8.1f} ms")
+        self.stdout.write(
+            f"  Primera petición:       {fases['primera_peticion'] * 1000:8.1f} ms "
+            f"(HTTP {fases['codigo']})"
+        )
+        self.stdout.write(f"  Hasta primera respuesta:{total * 1000:8.1f} ms")
+        self.stdout.write(f"  Módulos cargados:       {fases['modulos']:8d}")
+        self.stdout.write("")
+
+        if options['paquetes']:
+            filas = {}
+            for nombre, propio, _ in modulos:
+                paquete = nombre.split('.')[0]
+                filas[paquete] = filas.get(paquete, 0) + propio
+            filas = [(nombre, propio, propio) for nombre, propio in filas.items()]
+            encabezado = "Paquete"
+        else:
+            filas = modulos
+            encabezado = "Módulo"
+
+        filas = [fila for fila in filas if fila[0].startswith(options['prefijo'])]
+        filas.sort(key=lambda fila: fila[2], reverse=True)
+
+        self.stdout.write(f"{'Acumulado (ms)':>15} {'Propio (ms)':>12}  {encabezado}")
+        for nombre, propio, acumulado in filas[:options['top']]:
+            self.stdout.write(f"{acumulado / 1000:15.1f} {propio / 1000:12.1f}  {nombre}")
+
+    def _leer_importtime(self, salida):
+        """
+        Convierte la salida de ``-X importtime`` en tuplas
+        (módulo, microsegundos propios, microsegundos acumulados).
+        """
+        modulos = []
+        for linea in salida.splitlines():
+            if not linea.startswith('import time:') or 'self [us]' in linea:
+                continue
+            propio, acumulado, nombre = linea[len('import time:'):].split('|')
+            modulos.append((nombre.strip(), int(propio), int(acumulado)))
+        return modulos
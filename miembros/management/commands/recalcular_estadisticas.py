@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from miembros.estadisticas import recalcular_estadisticas
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {valor} (se espera AAAA-MM-DD).")
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye las estadísticas diarias (registros, desactivaciones y sanciones "
+        "por día y país) a partir de los datos y del archivo histórico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Primer día a recalcular (AAAA-MM-DD). Por defecto, el primero con datos.")
+        parser.add_argument('--hasta', help="Último día a recalcular (AAAA-MM-DD). Por defecto, hoy.")
+
+    def handle(self, *args, **options):
+        desde = _fecha(options['desde']) if options['desde'] else None
+        hasta = _fecha(options['hasta']) if options['hasta'] else None
+        if desde and hasta and desde > hasta:
+            raise CommandError("--desde no puede ser posterior a --hasta.")
+
+        filas = recalcular_estadisticas(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f"Estadísticas recalculadas: {filas} filas (día, país)."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from miembros.busqueda import reindexar
+from miembros.models import Sancion, SolicitudCorreccion
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los índices de texto completo de motivos de sanciones y "
+        "descripciones de solicitudes (FTS5 en SQLite, FULLTEXT en MySQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help="Registros leídos e indexados por lote."
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError("El tamaño de lote debe ser mayor que cero.")
+        for modelo in (Sancion, SolicitudCorreccion):
+            total = reindexar(modelo, options['lote'])
+            self.stdout.write(f"{modelo._meta.verbose_name_plural}: {total} indexadas")
+        self.stdout.write(self.style.SUCCESS("Índices de búsqueda reconstruidos."))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='miembro',
+            name='fecha_registro',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='miembro',
+            name='nombre_completo',
+            field=models.CharField(db_index=True, help_text='Nombre completo del miembro. Máximo 100 caracteres.', max_length=100, verbose_name='Nombre completo'),
+        ),
+        migrations.AlterField(
+            model_name='sancion',
+            name='fecha',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, help_text='Fecha y hora en la que se registró la sanción.', verbose_name='Fecha de sanción'),
+        ),
+        migrations.AlterField(
+            model_name='solicitudcorreccion',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('aprobada', 'Aprobada'), ('rechazada', 'Rechazada')], db_index=True, default='pendiente', help_text='Estado actual de la solicitud.', max_length=10, verbose_name='Estado'),
+        ),
+        migrations.AlterField(
+            model_name='solicitudcorreccion',
+            name='fecha',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, help_text='Fecha y hora en que se envió la solicitud.', verbose_name='Fecha de solicitud'),
+        ),
+    ]
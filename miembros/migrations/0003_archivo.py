@@ -0,0 +1,74 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0002_indices_admin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolicitudArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('miembro_id', models.BigIntegerField(db_index=True, verbose_name='ID del miembro')),
+                ('descripcion', models.TextField(verbose_name='Descripción del problema')),
+                ('fecha', models.DateTimeField(verbose_name='Fecha de solicitud')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('aprobada', 'Aprobada'), ('rechazada', 'Rechazada')], max_length=10, verbose_name='Estado')),
+                ('respuesta', models.TextField(blank=True, null=True, verbose_name='Respuesta del administrador')),
+                ('con_miembro', models.BooleanField(default=False, help_text='Se restaura junto con el miembro si este vuelve a la tabla principal.', verbose_name='Archivada con el miembro')),
+                ('fecha_archivado', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de archivado')),
+            ],
+            options={
+                'verbose_name': 'Solicitud archivada',
+                'verbose_name_plural': 'Solicitudes archivadas',
+                'ordering': ['-fecha'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MiembroArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('nombre_completo', models.CharField(max_length=100, verbose_name='Nombre completo')),
+                ('email', models.EmailField(db_index=True, max_length=254, verbose_name='Correo electrónico')),
+                ('pais', models.CharField(max_length=50, verbose_name='País')),
+                ('telefono', models.CharField(max_length=128, verbose_name='Número de teléfono')),
+                ('activo', models.BooleanField(default=False)),
+                ('puede_volver', models.BooleanField(default=True, verbose_name='¿Puede volver?')),
+                ('fecha_registro', models.DateTimeField()),
+                ('fecha_desactivacion', models.DateTimeField(blank=True, null=True)),
+                ('fecha_archivado', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Fecha de archivado')),
+                ('desactivado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Miembro archivado',
+                'verbose_name_plural': 'Miembros archivados',
+                'ordering': ['-fecha_archivado'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SancionArchivada',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID original')),
+                ('miembro_id', models.BigIntegerField(db_index=True, verbose_name='ID del miembro')),
+                ('motivo', models.TextField(verbose_name='Motivo de la sanción')),
+                ('fecha', models.DateTimeField(verbose_name='Fecha de sanción')),
+                ('duracion_dias', models.PositiveIntegerField(blank=True, null=True, verbose_name='Duración (en días)')),
+                ('con_miembro', models.BooleanField(default=False, help_text='Se restaura junto con el miembro si este vuelve a la tabla principal.', verbose_name='Archivada con el miembro')),
+                ('fecha_archivado', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de archivado')),
+                ('impuesta_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Sanción archivada',
+                'verbose_name_plural': 'Sanciones archivadas',
+                'ordering': ['-fecha'],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0003_archivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('pais', models.CharField(blank=True, max_length=50, verbose_name='País')),
+                ('registros', models.PositiveIntegerField(default=0)),
+                ('desactivaciones', models.PositiveIntegerField(default=0)),
+                ('sanciones', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Estadística diaria',
+                'verbose_name_plural': 'Estadísticas diarias',
+                'ordering': ['fecha', 'pais'],
+                'constraints': [models.UniqueConstraint(fields=('fecha', 'pais'), name='estadistica_diaria_fecha_pais')],
+            },
+        ),
+    ]
@@ -0,0 +1,357 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:13
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Copia congelada de la tabla y la normalización de miembros/paises.py al
+# escribir esta migración: los cambios posteriores de ese módulo no deben
+# alterar lo que hace una migración ya aplicada.
+
+PAIS_DESCONOCIDO = 'ZZ'
+
+TABLA_PAISES = (
+    ('AD', 'Andorra', 'Andorra'),
+    ('AE', 'Emiratos Árabes Unidos', 'United Arab Emirates'),
+    ('AF', 'Afganistán', 'Afghanistan'),
+    ('AG', 'Antigua y Barbuda', 'Antigua and Barbuda'),
+    ('AI', 'Anguila', 'Anguilla'),
+    ('AL', 'Albania', 'Albania'),
+    ('AM', 'Armenia', 'Armenia'),
+    ('AN', 'Antillas Holandesas', 'Netherlands Antilles'),
+    ('AO', 'Angola', 'Angola'),
+    ('AQ', 'Antártida', 'Antarctica'),
+    ('AR', 'Argentina', 'Argentina'),
+    ('AS', 'Samoa Americana', 'American Samoa'),
+    ('AT', 'Austria', 'Austria'),
+    ('AU', 'Australia', 'Australia'),
+    ('AW', 'Aruba', 'Aruba'),
+    ('AX', 'Islas Aland', 'Åland Islands'),
+    ('AZ', 'Azerbaiyán', 'Azerbaijan'),
+    ('BA', 'Bosnia y Hercegovina', 'Bosnia and Herzegovina'),
+    ('BB', 'Barbados', 'Barbados'),
+    ('BD', 'Bangladesh', 'Bangladesh'),
+    ('BE', 'Bélgica', 'Belgium'),
+    ('BF', 'Burkina Faso', 'Burkina Faso'),
+    ('BG', 'Bulgaria', 'Bulgaria'),
+    ('BH', 'Bahráin', 'Bahrain'),
+    ('BI', 'Burundi', 'Burundi'),
+    ('BJ', 'Benín', 'Benin'),
+    ('BL', 'San Bartolomé', 'Saint Barthélemy'),
+    ('BM', 'Bermudas', 'Bermuda'),
+    ('BN', 'Brunéi', 'Brunei'),
+    ('BO', 'Bolivia', 'Bolivia'),
+    ('BQ', 'Bonaire, San Eustaquio y Saba', 'Bonaire, Sint Eustatius and Saba'),
+    ('BR', 'Brasil', 'Brazil'),
+    ('BS', 'Bahamas', 'Bahamas'),
+    ('BT', 'Bután', 'Bhutan'),
+    ('BV', 'Isla Bouvet', 'Bouvet Island'),
+    ('BW', 'Botsuana', 'Botswana'),
+    ('BY', 'Bielorrusia', 'Belarus'),
+    ('BZ', 'Belice', 'Belize'),
+    ('CA', 'Canadá', 'Canada'),
+    ('CC', 'Islas Cocos', 'Cocos Islands'),
+    ('CD', 'República Democrática del Congo', 'The Democratic Republic Of Congo'),
+    ('CF', 'República Centroafricana', 'Central African Republic'),
+    ('CG', 'Congo', 'Congo'),
+    ('CH', 'Suiza', 'Switzerland'),
+    ('CI', 'Costa de Marfil', "Côte d'Ivoire"),
+    ('CK', 'Islas Cook', 'Cook Islands'),
+    ('CL', 'Chile', 'Chile'),
+    ('CM', 'Camerún', 'Cameroon'),
+    ('CN', 'China', 'China'),
+    ('CO', 'Colombia', 'Colombia'),
+    ('CR', 'Costa Rica', 'Costa Rica'),
+    ('CU', 'Cuba', 'Cuba'),
+    ('CV', 'Cabo Verde', 'Cape Verde'),
+    ('CW', 'Curaçao', 'Curaçao'),
+    ('CX', 'Isla Christmas', 'Christmas Island'),
+    ('CY', 'Chipre', 'Cyprus'),
+    ('CZ', 'Chequia', 'Czech Republic'),
+    ('DE', 'Alemania', 'Germany'),
+    ('DJ', 'Yibuti', 'Djibouti'),
+    ('DK', 'Dinamarca', 'Denmark'),
+    ('DM', 'Dominica', 'Dominica'),
+    ('DO', 'República Dominicana', 'Dominican Republic'),
+    ('DZ', 'Argelia', 'Algeria'),
+    ('EC', 'Ecuador', 'Ecuador'),
+    ('EE', 'Estonia', 'Estonia'),
+    ('EG', 'Egipto', 'Egypt'),
+    ('EH', 'Sahara Occidental', 'Western Sahara'),
+    ('ER', 'Eritrea', 'Eritrea'),
+    ('ES', 'España', 'Spain'),
+    ('ET', 'Etiopía', 'Ethiopia'),
+    ('FI', 'Finlandia', 'Finland'),
+    ('FJ', 'Fiyi', 'Fiji'),
+    ('FK', 'Islas Malvinas', 'Falkland Islands'),
+    ('FM', 'Micronesia', 'Micronesia'),
+    ('FO', 'Islas Feroe', 'Faroe Islands'),
+    ('FR', 'Francia', 'France'),
+    ('GA', 'Gabón', 'Gabon'),
+    ('GB', 'Reino Unido', 'United Kingdom'),
+    ('GD', 'Granada', 'Grenada'),
+    ('GE', 'Georgia', 'Georgia'),
+    ('GF', 'Guayana Francesa', 'French Guiana'),
+    ('GG', 'Guernsey', 'Guernsey'),
+    ('GH', 'Ghana', 'Ghana'),
+    ('GI', 'Gibraltar', 'Gibraltar'),
+    ('GL', 'Groenlandia', 'Greenland'),
+    ('GM', 'Gambia', 'Gambia'),
+    ('GN', 'Guinea', 'Guinea'),
+    ('GP', 'Guadalupe', 'Guadeloupe'),
+    ('GQ', 'Guinea Ecuatorial', 'Equatorial Guinea'),
+    ('GR', 'Grecia', 'Greece'),
+    ('GS', 'Islas Georgia del Sur y Sandwich del Sur', 'South Georgia And The South Sandwich Islands'),
+    ('GT', 'Guatemala', 'Guatemala'),
+    ('GU', 'Guam', 'Guam'),
+    ('GW', 'Guinea-Bissau', 'Guinea-Bissau'),
+    ('GY', 'Guyana', 'Guyana'),
+    ('HK', 'Hong Kong', 'Hong Kong'),
+    ('HM', 'Islas Heard y McDonald', 'Heard Island And McDonald Islands'),
+    ('HN', 'Honduras', 'Honduras'),
+    ('HR', 'Croacia', 'Croatia'),
+    ('HT', 'Haití', 'Haiti'),
+    ('HU', 'Hungría', 'Hungary'),
+    ('ID', 'Indonesia', 'Indonesia'),
+    ('IE', 'Irlanda', 'Ireland'),
+    ('IL', 'Israel', 'Israel'),
+    ('IM', 'Isla de Man', 'Isle Of Man'),
+    ('IN', 'India', 'India'),
+    ('IO', 'Territorio Británico del Océano Índico', 'British Indian Ocean Territory'),
+    ('IQ', 'Iraq', 'Iraq'),
+    ('IR', 'Irán', 'Iran'),
+    ('IS', 'Islandia', 'Iceland'),
+    ('IT', 'Italia', 'Italy'),
+    ('JE', 'Jersey', 'Jersey'),
+    ('JM', 'Jamaica', 'Jamaica'),
+    ('JO', 'Jordania', 'Jordan'),
+    ('JP', 'Japón', 'Japan'),
+    ('KE', 'Kenia', 'Kenya'),
+    ('KG', 'Kirguizistán', 'Kyrgyzstan'),
+    ('KH', 'Camboya', 'Cambodia'),
+    ('KI', 'Kiribati', 'Kiribati'),
+    ('KM', 'Comores', 'Comoros'),
+    ('KN', 'San Cristóbal y Nieves', 'Saint Kitts And Nevis'),
+    ('KP', 'Corea del Norte', 'North Korea'),
+    ('KR', 'Corea del Sur', 'South Korea'),
+    ('KW', 'Kuwait', 'Kuwait'),
+    ('KY', 'Islas Caimán', 'Cayman Islands'),
+    ('KZ', 'Kazajstán', 'Kazakhstan'),
+    ('LA', 'Laos', 'Laos'),
+    ('LB', 'Líbano', 'Lebanon'),
+    ('LC', 'Santa Lucia', 'Saint Lucia'),
+    ('LI', 'Liechtenstein', 'Liechtenstein'),
+    ('LK', 'Sri Lanka', 'Sri Lanka'),
+    ('LR', 'Liberia', 'Liberia'),
+    ('LS', 'Lesoto', 'Lesotho'),
+    ('LT', 'Lituania', 'Lithuania'),
+    ('LU', 'Luxemburgo', 'Luxembourg'),
+    ('LV', 'Letonia', 'Latvia'),
+    ('LY', 'Libia', 'Libya'),
+    ('MA', 'Marruecos', 'Morocco'),
+    ('MC', 'Mónaco', 'Monaco'),
+    ('MD', 'Moldavia', 'Moldova'),
+    ('ME', 'Montenegro', 'Montenegro'),
+    ('MF', 'San Martín', 'Saint Martin'),
+    ('MG', 'Madagascar', 'Madagascar'),
+    ('MH', 'Islas Marshall', 'Marshall Islands'),
+    ('MK', 'Macedonia', 'Macedonia'),
+    ('ML', 'Malí', 'Mali'),
+    ('MM', 'Myanmar', 'Myanmar'),
+    ('MN', 'Mongolia', 'Mongolia'),
+    ('MO', 'Macao', 'Macao'),
+    ('MP', 'Islas Marianas del Norte', 'Northern Mariana Islands'),
+    ('MQ', 'Martinica', 'Martinique'),
+    ('MR', 'Mauritania', 'Mauritania'),
+    ('MS', 'Montserrat', 'Montserrat'),
+    ('MT', 'Malta', 'Malta'),
+    ('MU', 'Mauricio', 'Mauritius'),
+    ('MV', 'Maldivas', 'Maldives'),
+    ('MW', 'Malaui', 'Malawi'),
+    ('MX', 'México', 'Mexico'),
+    ('MY', 'Malasia', 'Malaysia'),
+    ('MZ', 'Mozambique', 'Mozambique'),
+    ('NA', 'Namibia', 'Namibia'),
+    ('NC', 'Nueva Caledonia', 'New Caledonia'),
+    ('NE', 'Níger', 'Niger'),
+    ('NF', 'Isla Norfolk', 'Norfolk Island'),
+    ('NG', 'Nigeria', 'Nigeria'),
+    ('NI', 'Nicaragua', 'Nicaragua'),
+    ('NL', 'Holanda', 'Netherlands'),
+    ('NO', 'Noruega', 'Norway'),
+    ('NP', 'Nepal', 'Nepal'),
+    ('NR', 'Nauru', 'Nauru'),
+    ('NU', 'Niue', 'Niue'),
+    ('NZ', 'Nueva Zelanda', 'New Zealand'),
+    ('OM', 'Omán', 'Oman'),
+    ('PA', 'Panamá', 'Panama'),
+    ('PE', 'Perú', 'Peru'),
+    ('PF', 'Polinesia Francesa', 'French Polynesia'),
+    ('PG', 'Papúa New Guinea', 'Papua New Guinea'),
+    ('PH', 'Filipinas', 'Philippines'),
+    ('PK', 'Paquistán', 'Pakistan'),
+    ('PL', 'Polonia', 'Poland'),
+    ('PM', 'San Pedro y Miquelón', 'Saint Pierre And Miquelon'),
+    ('PN', 'Islas Pitcairn', 'Pitcairn'),
+    ('PR', 'Puerto Rico', 'Puerto Rico'),
+    ('PS', 'Palestina', 'Palestine'),
+    ('PT', 'Portugal', 'Portugal'),
+    ('PW', 'Palaos', 'Palau'),
+    ('PY', 'Paraguay', 'Paraguay'),
+    ('QA', 'Qatar', 'Qatar'),
+    ('RE', 'Reunión', 'Reunion'),
+    ('RO', 'Rumania', 'Romania'),
+    ('RS', 'Serbia', 'Serbia'),
+    ('RU', 'Rusia', 'Russia'),
+    ('RW', 'Ruanda', 'Rwanda'),
+    ('SA', 'Arabia Saudita', 'Saudi Arabia'),
+    ('SB', 'Islas Salomón', 'Solomon Islands'),
+    ('SC', 'Seychelles', 'Seychelles'),
+    ('SD', 'Sudán', 'Sudan'),
+    ('SE', 'Suecia', 'Sweden'),
+    ('SG', 'Singapur', 'Singapore'),
+    ('SH', 'Santa Helena', 'Saint Helena'),
+    ('SI', 'Eslovenia', 'Slovenia'),
+    ('SJ', 'Svalbard y Jan Mayen', 'Svalbard And Jan Mayen'),
+    ('SK', 'Eslovaquia', 'Slovakia'),
+    ('SL', 'Sierra Leona', 'Sierra Leone'),
+    ('SM', 'San Marino', 'San Marino'),
+    ('SN', 'Senegal', 'Senegal'),
+    ('SO', 'Somalia', 'Somalia'),
+    ('SR', 'Surinam', 'Suriname'),
+    ('SS', 'Sudán del Sur', 'South Sudan'),
+    ('ST', 'Santo Tomé y Príncipe', 'Sao Tome And Principe'),
+    ('SV', 'El Salvador', 'El Salvador'),
+    ('SX', 'San Martín (región holandesa)', 'Sint Maarten (Dutch part)'),
+    ('SY', 'Siria', 'Syria'),
+    ('SZ', 'Suazilandia', 'Swaziland'),
+    ('TC', 'Islas Turcas y Caicos', 'Turks And Caicos Islands'),
+    ('TD', 'Chad', 'Chad'),
+    ('TF', 'Territorios Franceses del Sur', 'French Southern Territories'),
+    ('TG', 'Togo', 'Togo'),
+    ('TH', 'Tailandia', 'Thailand'),
+    ('TJ', 'Tayikistán', 'Tajikistan'),
+    ('TK', 'Tokelau', 'Tokelau'),
+    ('TL', 'Timor Oriental', 'Timor-Leste'),
+    ('TM', 'Turkmenistán', 'Turkmenistan'),
+    ('TN', 'Túnez', 'Tunisia'),
+    ('TO', 'Tonga', 'Tonga'),
+    ('TR', 'Turquía', 'Turkey'),
+    ('TT', 'Trinidad y Tobago', 'Trinidad and Tobago'),
+    ('TV', 'Tuvalu', 'Tuvalu'),
+    ('TW', 'Taiwán', 'Taiwan'),
+    ('TZ', 'Tanzania', 'Tanzania'),
+    ('UA', 'Ucrania', 'Ukraine'),
+    ('UG', 'Uganda', 'Uganda'),
+    ('UM', 'Islas menores alejadas de los Estados Unidos', 'United States Minor Outlying Islands'),
+    ('US', 'Estados Unidos', 'United States'),
+    ('UY', 'Uruguay', 'Uruguay'),
+    ('UZ', 'Uzbekistán', 'Uzbekistan'),
+    ('VA', 'Ciudad del Vaticano', 'Vatican'),
+    ('VC', 'San Vicente y las Granadinas', 'Saint Vincent And The Grenadines'),
+    ('VE', 'Venezuela', 'Venezuela'),
+    ('VG', 'Islas Vírgenes Británicas', 'British Virgin Islands'),
+    ('VI', 'Islas Vírgenes Americanas', 'U.S. Virgin Islands'),
+    ('VN', 'Vietnam', 'Vietnam'),
+    ('VU', 'Vanuatu', 'Vanuatu'),
+    ('WF', 'Wallis y Futuna', 'Wallis And Futuna'),
+    ('WS', 'Samoa', 'Samoa'),
+    ('YE', 'Yemen', 'Yemen'),
+    ('YT', 'Mayotte', 'Mayotte'),
+    ('ZA', 'Sudáfrica', 'South Africa'),
+    ('ZM', 'Zambia', 'Zambia'),
+    ('ZW', 'Zimbabue', 'Zimbabwe'),
+)
+
+ALIAS = {
+    'usa': 'US',
+    'eeuu': 'US',
+    'eua': 'US',
+    'estados unidos de america': 'US',
+    'ee uu': 'US',
+    'uk': 'GB',
+    'inglaterra': 'GB',
+    'gran bretana': 'GB',
+}
+
+
+def _clave(valor):
+    """Minúsculas, sin tildes, sin puntuación y con espacios simples."""
+    sin_tildes = unicodedata.normalize('NFKD', valor).encode('ascii', 'ignore').decode()
+    return ' '.join(re.sub(r'[^a-z0-9 ]', ' ', sin_tildes.lower().replace('.', '')).split())
+
+
+INDICE = dict(ALIAS)
+for codigo, nombre_es, nombre_en in TABLA_PAISES:
+    INDICE[_clave(nombre_en)] = codigo
+    INDICE[_clave(nombre_es)] = codigo
+    INDICE[codigo.lower()] = codigo
+
+
+def normalizar_pais(valor):
+    if not valor:
+        return None
+    return INDICE.get(_clave(str(valor)))
+
+
+def normalizar_paises(apps, schema_editor):
+    """
+    Convierte el país escrito a mano ("Colombia", "colombia", "CO") en su
+    código ISO. Los valores que no se reconocen quedan como "ZZ" para
+    revisarlos desde el admin. Las estadísticas diarias se fusionan por
+    (fecha, código), ya que varias grafías pasan a la misma fila.
+    """
+    for nombre_modelo in ('Miembro', 'MiembroArchivado'):
+        modelo = apps.get_model('miembros', nombre_modelo)
+        for valor in list(modelo.objects.values_list('pais', flat=True).distinct()):
+            codigo = normalizar_pais(valor) or PAIS_DESCONOCIDO
+            if codigo != valor:
+                modelo.objects.filter(pais=valor).update(pais=codigo)
+
+    EstadisticaDiaria = apps.get_model('miembros', 'EstadisticaDiaria')
+    campos = ('registros', 'desactivaciones', 'sanciones')
+    totales = {}
+    for fila in EstadisticaDiaria.objects.values('fecha', 'pais', *campos):
+        codigo = normalizar_pais(fila['pais']) or PAIS_DESCONOCIDO
+        acumulado = totales.setdefault((fila['fecha'], codigo), dict.fromkeys(campos, 0))
+        for campo in campos:
+            acumulado[campo] += fila[campo]
+    EstadisticaDiaria.objects.all().delete()
+    EstadisticaDiaria.objects.bulk_create(
+        [EstadisticaDiaria(fecha=fecha, pais=pais, **contadores) for (fecha, pais), contadores in totales.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0004_estadisticas_diarias'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(normalizar_paises, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='estadisticadiaria',
+            name='pais',
+            field=models.CharField(blank=True, max_length=2, verbose_name='País'),
+        ),
+        migrations.AlterField(
+            model_name='miembro',
+            name='pais',
+            field=models.CharField(choices=[('AF', 'Afganistán'), ('AL', 'Albania'), ('DE', 'Alemania'), ('AD', 'Andorra'), ('AO', 'Angola'), ('AI', 'Anguila'), ('AG', 'Antigua y Barbuda'), ('AN', 'Antillas Holandesas'), ('AQ', 'Antártida'), ('SA', 'Arabia Saudita'), ('DZ', 'Argelia'), ('AR', 'Argentina'), ('AM', 'Armenia'), ('AW', 'Aruba'), ('AU', 'Australia'), ('AT', 'Austria'), ('AZ', 'Azerbaiyán'), ('BS', 'Bahamas'), ('BH', 'Bahráin'), ('BD', 'Bangladesh'), ('BB', 'Barbados'), ('BZ', 'Belice'), ('BJ', 'Benín'), ('BM', 'Bermudas'), ('BY', 'Bielorrusia'), ('BO', 'Bolivia'), ('BQ', 'Bonaire, San Eustaquio y Saba'), ('BA', 'Bosnia y Hercegovina'), ('BW', 'Botsuana'), ('BR', 'Brasil'), ('BN', 'Brunéi'), ('BG', 'Bulgaria'), ('BF', 'Burkina Faso'), ('BI', 'Burundi'), ('BT', 'Bután'), ('BE', 'Bélgica'), ('CV', 'Cabo Verde'), ('KH', 'Camboya'), ('CM', 'Camerún'), ('CA', 'Canadá'), ('TD', 'Chad'), ('CZ', 'Chequia'), ('CL', 'Chile'), ('CN', 'China'), ('CY', 'Chipre'), ('VA', 'Ciudad del Vaticano'), ('CO', 'Colombia'), ('KM', 'Comores'), ('CG', 'Congo'), ('KP', 'Corea del Norte'), ('KR', 'Corea del Sur'), ('CR', 'Costa Rica'), ('CI', 'Costa de Marfil'), ('HR', 'Croacia'), ('CU', 'Cuba'), ('CW', 'Curaçao'), ('ZZ', 'Desconocido'), ('DK', 'Dinamarca'), ('DM', 'Dominica'), ('EC', 'Ecuador'), ('EG', 'Egipto'), ('SV', 'El Salvador'), ('AE', 'Emiratos Árabes Unidos'), ('ER', 'Eritrea'), ('SK', 'Eslovaquia'), ('SI', 'Eslovenia'), ('ES', 'España'), ('US', 'Estados Unidos'), ('EE', 'Estonia'), ('ET', 'Etiopía'), ('PH', 'Filipinas'), ('FI', 'Finlandia'), ('FJ', 'Fiyi'), ('FR', 'Francia'), ('GA', 'Gabón'), ('GM', 'Gambia'), ('GE', 'Georgia'), ('GH', 'Ghana'), ('GI', 'Gibraltar'), ('GD', 'Granada'), ('GR', 'Grecia'), ('GL', 'Groenlandia'), ('GP', 'Guadalupe'), ('GU', 'Guam'), ('GT', 'Guatemala'), ('GF', 'Guayana Francesa'), ('GG', 'Guernsey'), ('GN', 'Guinea'), ('GQ', 'Guinea Ecuatorial'), ('GW', 'Guinea-Bissau'), ('GY', 'Guyana'), ('HT', 'Haití'), ('NL', 'Holanda'), ('HN', 'Honduras'), ('HK', 'Hong Kong'), ('HU', 'Hungría'), ('IN', 'India'), ('ID', 'Indonesia'), ('IQ', 'Iraq'), ('IE', 'Irlanda'), ('IR', 'Irán'), ('BV', 'Isla Bouvet'), ('CX', 'Isla Christmas'), ('NF', 'Isla Norfolk'), ('IM', 'Isla de Man'), ('IS', 'Islandia'), ('AX', 'Islas Aland'), ('KY', 'Islas Caimán'), ('CC', 'Islas Cocos'), ('CK', 'Islas Cook'), ('FO', 'Islas Feroe'), ('GS', 'Islas Georgia del Sur y Sandwich del Sur'), ('HM', 'Islas Heard y McDonald'), ('FK', 'Islas Malvinas'), ('MP', 'Islas Marianas del Norte'), ('MH', 'Islas Marshall'), ('PN', 'Islas Pitcairn'), ('SB', 'Islas Salomón'), ('TC', 'Islas Turcas y Caicos'), ('VI', 'Islas Vírgenes Americanas'), ('VG', 'Islas Vírgenes Británicas'), ('UM', 'Islas menores alejadas de los Estados Unidos'), ('IL', 'Israel'), ('IT', 'Italia'), ('JM', 'Jamaica'), ('JP', 'Japón'), ('JE', 'Jersey'), ('JO', 'Jordania'), ('KZ', 'Kazajstán'), ('KE', 'Kenia'), ('KG', 'Kirguizistán'), ('KI', 'Kiribati'), ('KW', 'Kuwait'), ('LA', 'Laos'), ('LS', 'Lesoto'), ('LV', 'Letonia'), ('LR', 'Liberia'), ('LY', 'Libia'), ('LI', 'Liechtenstein'), ('LT', 'Lituania'), ('LU', 'Luxemburgo'), ('LB', 'Líbano'), ('MO', 'Macao'), ('MK', 'Macedonia'), ('MG', 'Madagascar'), ('MY', 'Malasia'), ('MW', 'Malaui'), ('MV', 'Maldivas'), ('MT', 'Malta'), ('ML', 'Malí'), ('MA', 'Marruecos'), ('MQ', 'Martinica'), ('MU', 'Mauricio'), ('MR', 'Mauritania'), ('YT', 'Mayotte'), ('FM', 'Micronesia'), ('MD', 'Moldavia'), ('MN', 'Mongolia'), ('ME', 'Montenegro'), ('MS', 'Montserrat'), ('MZ', 'Mozambique'), ('MM', 'Myanmar'), ('MX', 'México'), ('MC', 'Mónaco'), ('NA', 'Namibia'), ('NR', 'Nauru'), ('NP', 'Nepal'), ('NI', 'Nicaragua'), ('NG', 'Nigeria'), ('NU', 'Niue'), ('NO', 'Noruega'), ('NC', 'Nueva Caledonia'), ('NZ', 'Nueva Zelanda'), ('NE', 'Níger'), ('OM', 'Omán'), ('PW', 'Palaos'), ('PS', 'Palestina'), ('PA', 'Panamá'), ('PG', 'Papúa New Guinea'), ('PK', 'Paquistán'), ('PY', 'Paraguay'), ('PE', 'Perú'), ('PF', 'Polinesia Francesa'), ('PL', 'Polonia'), ('PT', 'Portugal'), ('PR', 'Puerto Rico'), ('QA', 'Qatar'), ('GB', 'Reino Unido'), ('CF', 'República Centroafricana'), ('CD', 'República Democrática del Congo'), ('DO', 'República Dominicana'), ('RE', 'Reunión'), ('RW', 'Ruanda'), ('RO', 'Rumania'), ('RU', 'Rusia'), ('EH', 'Sahara Occidental'), ('WS', 'Samoa'), ('AS', 'Samoa Americana'), ('BL', 'San Bartolomé'), ('KN', 'San Cristóbal y Nieves'), ('SM', 'San Marino'), ('MF', 'San Martín'), ('SX', 'San Martín (región holandesa)'), ('PM', 'San Pedro y Miquelón'), ('VC', 'San Vicente y las Granadinas'), ('SH', 'Santa Helena'), ('LC', 'Santa Lucia'), ('ST', 'Santo Tomé y Príncipe'), ('SN', 'Senegal'), ('RS', 'Serbia'), ('SC', 'Seychelles'), ('SL', 'Sierra Leona'), ('SG', 'Singapur'), ('SY', 'Siria'), ('SO', 'Somalia'), ('LK', 'Sri Lanka'), ('SZ', 'Suazilandia'), ('ZA', 'Sudáfrica'), ('SD', 'Sudán'), ('SS', 'Sudán del Sur'), ('SE', 'Suecia'), ('CH', 'Suiza'), ('SR', 'Surinam'), ('SJ', 'Svalbard y Jan Mayen'), ('TH', 'Tailandia'), ('TW', 'Taiwán'), ('TZ', 'Tanzania'), ('TJ', 'Tayikistán'), ('IO', 'Territorio Británico del Océano Índico'), ('TF', 'Territorios Franceses del Sur'), ('TL', 'Timor Oriental'), ('TG', 'Togo'), ('TK', 'Tokelau'), ('TO', 'Tonga'), ('TT', 'Trinidad y Tobago'), ('TM', 'Turkmenistán'), ('TR', 'Turquía'), ('TV', 'Tuvalu'), ('TN', 'Túnez'), ('UA', 'Ucrania'), ('UG', 'Uganda'), ('UY', 'Uruguay'), ('UZ', 'Uzbekistán'), ('VU', 'Vanuatu'), ('VE', 'Venezuela'), ('VN', 'Vietnam'), ('WF', 'Wallis y Futuna'), ('YE', 'Yemen'), ('DJ', 'Yibuti'), ('ZM', 'Zambia'), ('ZW', 'Zimbabue')], help_text='Código ISO 3166-1 alfa-2 del país de residencia (p. ej. CO).', max_length=2, verbose_name='País'),
+        ),
+        migrations.AlterField(
+            model_name='miembroarchivado',
+            name='pais',
+            field=models.CharField(choices=[('AF', 'Afganistán'), ('AL', 'Albania'), ('DE', 'Alemania'), ('AD', 'Andorra'), ('AO', 'Angola'), ('AI', 'Anguila'), ('AG', 'Antigua y Barbuda'), ('AN', 'Antillas Holandesas'), ('AQ', 'Antártida'), ('SA', 'Arabia Saudita'), ('DZ', 'Argelia'), ('AR', 'Argentina'), ('AM', 'Armenia'), ('AW', 'Aruba'), ('AU', 'Australia'), ('AT', 'Austria'), ('AZ', 'Azerbaiyán'), ('BS', 'Bahamas'), ('BH', 'Bahráin'), ('BD', 'Bangladesh'), ('BB', 'Barbados'), ('BZ', 'Belice'), ('BJ', 'Benín'), ('BM', 'Bermudas'), ('BY', 'Bielorrusia'), ('BO', 'Bolivia'), ('BQ', 'Bonaire, San Eustaquio y Saba'), ('BA', 'Bosnia y Hercegovina'), ('BW', 'Botsuana'), ('BR', 'Brasil'), ('BN', 'Brunéi'), ('BG', 'Bulgaria'), ('BF', 'Burkina Faso'), ('BI', 'Burundi'), ('BT', 'Bután'), ('BE', 'Bélgica'), ('CV', 'Cabo Verde'), ('KH', 'Camboya'), ('CM', 'Camerún'), ('CA', 'Canadá'), ('TD', 'Chad'), ('CZ', 'Chequia'), ('CL', 'Chile'), ('CN', 'China'), ('CY', 'Chipre'), ('VA', 'Ciudad del Vaticano'), ('CO', 'Colombia'), ('KM', 'Comores'), ('CG', 'Congo'), ('KP', 'Corea del Norte'), ('KR', 'Corea del Sur'), ('CR', 'Costa Rica'), ('CI', 'Costa de Marfil'), ('HR', 'Croacia'), ('CU', 'Cuba'), ('CW', 'Curaçao'), ('ZZ', 'Desconocido'), ('DK', 'Dinamarca'), ('DM', 'Dominica'), ('EC', 'Ecuador'), ('EG', 'Egipto'), ('SV', 'El Salvador'), ('AE', 'Emiratos Árabes Unidos'), ('ER', 'Eritrea'), ('SK', 'Eslovaquia'), ('SI', 'Eslovenia'), ('ES', 'España'), ('US', 'Estados Unidos'), ('EE', 'Estonia'), ('ET', 'Etiopía'), ('PH', 'Filipinas'), ('FI', 'Finlandia'), ('FJ', 'Fiyi'), ('FR', 'Francia'), ('GA', 'Gabón'), ('GM', 'Gambia'), ('GE', 'Georgia'), ('GH', 'Ghana'), ('GI', 'Gibraltar'), ('GD', 'Granada'), ('GR', 'Grecia'), ('GL', 'Groenlandia'), ('GP', 'Guadalupe'), ('GU', 'Guam'), ('GT', 'Guatemala'), ('GF', 'Guayana Francesa'), ('GG', 'Guernsey'), ('GN', 'Guinea'), ('GQ', 'Guinea Ecuatorial'), ('GW', 'Guinea-Bissau'), ('GY', 'Guyana'), ('HT', 'Haití'), ('NL', 'Holanda'), ('HN', 'Honduras'), ('HK', 'Hong Kong'), ('HU', 'Hungría'), ('IN', 'India'), ('ID', 'Indonesia'), ('IQ', 'Iraq'), ('IE', 'Irlanda'), ('IR', 'Irán'), ('BV', 'Isla Bouvet'), ('CX', 'Isla Christmas'), ('NF', 'Isla Norfolk'), ('IM', 'Isla de Man'), ('IS', 'Islandia'), ('AX', 'Islas Aland'), ('KY', 'Islas Caimán'), ('CC', 'Islas Cocos'), ('CK', 'Islas Cook'), ('FO', 'Islas Feroe'), ('GS', 'Islas Georgia del Sur y Sandwich del Sur'), ('HM', 'Islas Heard y McDonald'), ('FK', 'Islas Malvinas'), ('MP', 'Islas Marianas del Norte'), ('MH', 'Islas Marshall'), ('PN', 'Islas Pitcairn'), ('SB', 'Islas Salomón'), ('TC', 'Islas Turcas y Caicos'), ('VI', 'Islas Vírgenes Americanas'), ('VG', 'Islas Vírgenes Británicas'), ('UM', 'Islas menores alejadas de los Estados Unidos'), ('IL', 'Israel'), ('IT', 'Italia'), ('JM', 'Jamaica'), ('JP', 'Japón'), ('JE', 'Jersey'), ('JO', 'Jordania'), ('KZ', 'Kazajstán'), ('KE', 'Kenia'), ('KG', 'Kirguizistán'), ('KI', 'Kiribati'), ('KW', 'Kuwait'), ('LA', 'Laos'), ('LS', 'Lesoto'), ('LV', 'Letonia'), ('LR', 'Liberia'), ('LY', 'Libia'), ('LI', 'Liechtenstein'), ('LT', 'Lituania'), ('LU', 'Luxemburgo'), ('LB', 'Líbano'), ('MO', 'Macao'), ('MK', 'Macedonia'), ('MG', 'Madagascar'), ('MY', 'Malasia'), ('MW', 'Malaui'), ('MV', 'Maldivas'), ('MT', 'Malta'), ('ML', 'Malí'), ('MA', 'Marruecos'), ('MQ', 'Martinica'), ('MU', 'Mauricio'), ('MR', 'Mauritania'), ('YT', 'Mayotte'), ('FM', 'Micronesia'), ('MD', 'Moldavia'), ('MN', 'Mongolia'), ('ME', 'Montenegro'), ('MS', 'Montserrat'), ('MZ', 'Mozambique'), ('MM', 'Myanmar'), ('MX', 'México'), ('MC', 'Mónaco'), ('NA', 'Namibia'), ('NR', 'Nauru'), ('NP', 'Nepal'), ('NI', 'Nicaragua'), ('NG', 'Nigeria'), ('NU', 'Niue'), ('NO', 'Noruega'), ('NC', 'Nueva Caledonia'), ('NZ', 'Nueva Zelanda'), ('NE', 'Níger'), ('OM', 'Omán'), ('PW', 'Palaos'), ('PS', 'Palestina'), ('PA', 'Panamá'), ('PG', 'Papúa New Guinea'), ('PK', 'Paquistán'), ('PY', 'Paraguay'), ('PE', 'Perú'), ('PF', 'Polinesia Francesa'), ('PL', 'Polonia'), ('PT', 'Portugal'), ('PR', 'Puerto Rico'), ('QA', 'Qatar'), ('GB', 'Reino Unido'), ('CF', 'República Centroafricana'), ('CD', 'República Democrática del Congo'), ('DO', 'República Dominicana'), ('RE', 'Reunión'), ('RW', 'Ruanda'), ('RO', 'Rumania'), ('RU', 'Rusia'), ('EH', 'Sahara Occidental'), ('WS', 'Samoa'), ('AS', 'Samoa Americana'), ('BL', 'San Bartolomé'), ('KN', 'San Cristóbal y Nieves'), ('SM', 'San Marino'), ('MF', 'San Martín'), ('SX', 'San Martín (región holandesa)'), ('PM', 'San Pedro y Miquelón'), ('VC', 'San Vicente y las Granadinas'), ('SH', 'Santa Helena'), ('LC', 'Santa Lucia'), ('ST', 'Santo Tomé y Príncipe'), ('SN', 'Senegal'), ('RS', 'Serbia'), ('SC', 'Seychelles'), ('SL', 'Sierra Leona'), ('SG', 'Singapur'), ('SY', 'Siria'), ('SO', 'Somalia'), ('LK', 'Sri Lanka'), ('SZ', 'Suazilandia'), ('ZA', 'Sudáfrica'), ('SD', 'Sudán'), ('SS', 'Sudán del Sur'), ('SE', 'Suecia'), ('CH', 'Suiza'), ('SR', 'Surinam'), ('SJ', 'Svalbard y Jan Mayen'), ('TH', 'Tailandia'), ('TW', 'Taiwán'), ('TZ', 'Tanzania'), ('TJ', 'Tayikistán'), ('IO', 'Territorio Británico del Océano Índico'), ('TF', 'Territorios Franceses del Sur'), ('TL', 'Timor Oriental'), ('TG', 'Togo'), ('TK', 'Tokelau'), ('TO', 'Tonga'), ('TT', 'Trinidad y Tobago'), ('TM', 'Turkmenistán'), ('TR', 'Turquía'), ('TV', 'Tuvalu'), ('TN', 'Túnez'), ('UA', 'Ucrania'), ('UG', 'Uganda'), ('UY', 'Uruguay'), ('UZ', 'Uzbekistán'), ('VU', 'Vanuatu'), ('VE', 'Venezuela'), ('VN', 'Vietnam'), ('WF', 'Wallis y Futuna'), ('YE', 'Yemen'), ('DJ', 'Yibuti'), ('ZM', 'Zambia'), ('ZW', 'Zimbabue')], max_length=2, verbose_name='País'),
+        ),
+        migrations.AddIndex(
+            model_name='miembro',
+            index=models.Index(fields=['pais', 'activo', 'puede_volver'], name='miembro_pais_estado'),
+        ),
+    ]
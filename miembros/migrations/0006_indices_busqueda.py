@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+# DDL copiado aquí para que la migración no dependa de miembros/busqueda.py.
+# Las tablas se crean vacías: tras migrar, miembros.signals las llena con
+# la normalización vigente (como el comando reindexar_busqueda).
+TABLAS = ('miembros_sancion_busqueda', 'miembros_solicitud_busqueda')
+
+
+def crear_indices(apps, schema_editor):
+    conexion = schema_editor.connection
+    for nombre in TABLAS:
+        tabla = conexion.ops.quote_name(nombre)
+        if conexion.vendor == 'sqlite':
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {tabla} "
+                f"USING fts5(texto, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        elif conexion.vendor == 'mysql':
+            schema_editor.execute(
+                f"CREATE TABLE IF NOT EXISTS {tabla} ("
+                f"id BIGINT NOT NULL PRIMARY KEY, texto LONGTEXT NOT NULL, FULLTEXT (texto)"
+                f") ENGINE=InnoDB"
+            )
+
+
+def eliminar_indices(apps, schema_editor):
+    conexion = schema_editor.connection
+    if conexion.vendor in ('sqlite', 'mysql'):
+        for nombre in TABLAS:
+            schema_editor.execute(f"DROP TABLE IF EXISTS {conexion.ops.quote_name(nombre)}")
+
+
+class Migration(migrations.Migration):
+    """
+    Tablas de texto completo para motivo de sanciones y descripción de
+    solicitudes: FTS5 en SQLite, FULLTEXT en MySQL (ver miembros/busqueda.py).
+    """
+
+    dependencies = [
+        ('miembros', '0005_paises_iso'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:19
+
+import django.db.models.deletion
+import miembros.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0006_indices_busqueda'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultaLenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+                ('duracion_ms', models.FloatField(verbose_name='Duración (ms)')),
+                ('metodo', models.CharField(max_length=10, verbose_name='Método')),
+                ('ruta', models.CharField(max_length=500, verbose_name='Ruta')),
+                ('vista', models.CharField(blank=True, max_length=200, verbose_name='Vista')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                ('parametros', models.TextField(blank=True, verbose_name='Parámetros')),
+                ('plan', models.TextField(blank=True, verbose_name='EXPLAIN')),
+            ],
+            options={
+                'verbose_name': 'Consulta lenta',
+                'verbose_name_plural': 'Consultas lentas',
+                'ordering': ['-id'],
+            },
+            bases=(miembros.models.RegistroAcotadoMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='PerfilPeticion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+                ('metodo', models.CharField(max_length=10, verbose_name='Método')),
+                ('ruta', models.CharField(max_length=500, verbose_name='Ruta')),
+                ('vista', models.CharField(blank=True, max_length=200, verbose_name='Vista')),
+                ('estado', models.PositiveSmallIntegerField(verbose_name='Código de respuesta')),
+                ('duracion_ms', models.FloatField(verbose_name='Duración (ms)')),
+                ('consultas', models.PositiveIntegerField(verbose_name='Consultas SQL')),
+                ('resultado', models.TextField(verbose_name='Perfil (cProfile)')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Perfil de petición',
+                'verbose_name_plural': 'Perfiles de peticiones',
+                'ordering': ['-id'],
+            },
+            bases=(miembros.models.RegistroAcotadoMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0007_diagnostico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicadoCandidato',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fusionado', models.CharField(blank=True, help_text='Nombre y correo del duplicado eliminado al fusionar.', max_length=300, verbose_name='Duplicado fusionado')),
+                ('puntaje', models.FloatField(db_index=True, verbose_name='Puntaje')),
+                ('motivos', models.CharField(max_length=100, verbose_name='Coincidencias')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente de revisión'), ('fusionado', 'Fusionado'), ('descartado', 'No es duplicado')], db_index=True, default='pendiente', max_length=10, verbose_name='Estado')),
+                ('fecha_deteccion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de detección')),
+                ('miembro_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='miembros.miembro', verbose_name='Miembro que se conserva')),
+                ('miembro_b', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='miembros.miembro', verbose_name='Posible duplicado')),
+            ],
+            options={
+                'verbose_name': 'Posible duplicado',
+                'verbose_name_plural': 'Posibles duplicados',
+                'ordering': ['-puntaje'],
+                'constraints': [models.UniqueConstraint(fields=('miembro_a', 'miembro_b'), name='duplicado_par_unico')],
+            },
+        ),
+    ]
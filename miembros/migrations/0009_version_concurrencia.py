@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0008_duplicados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='miembro',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Aumenta con cada modificación; se usa en la cabecera ETag/If-Match.', verbose_name='Versión'),
+        ),
+        migrations.AddField(
+            model_name='solicitudcorreccion',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Aumenta con cada modificación; se usa en la cabecera ETag/If-Match.', verbose_name='Versión'),
+        ),
+    ]
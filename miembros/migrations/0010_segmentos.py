@@ -0,0 +1,46 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0009_version_concurrencia'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioMiembro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('miembro_id', models.BigIntegerField(verbose_name='ID del miembro')),
+            ],
+            options={
+                'verbose_name': 'Cambio de miembro',
+                'verbose_name_plural': 'Cambios de miembros',
+            },
+        ),
+        migrations.CreateModel(
+            name='Segmento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('criterios', models.JSONField(default=dict, help_text='Criterios de filtrar-miembros (nombre, email, pais, activo, fecha_desde...).', verbose_name='Criterios')),
+                ('ids', models.BinaryField(default=bytes, verbose_name='Ids materializados')),
+                ('ancho', models.PositiveSmallIntegerField(default=4, editable=False, verbose_name='Bytes por id')),
+                ('total', models.PositiveIntegerField(default=0, editable=False, verbose_name='Miembros')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('fecha_actualizacion', models.DateTimeField(blank=True, null=True, verbose_name='Última actualización')),
+                ('creado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+            ],
+            options={
+                'verbose_name': 'Segmento',
+                'verbose_name_plural': 'Segmentos',
+                'ordering': ['nombre'],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.2 on 2026-10-19 00:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def guardar_conservados(apps, schema_editor):
+    """
+    Copia el nombre y correo del miembro conservado en los pares ya
+    fusionados, para que el historial sobreviva si luego se elimina.
+    """
+    DuplicadoCandidato = apps.get_model('miembros', 'DuplicadoCandidato')
+    fusionados = DuplicadoCandidato.objects.filter(
+        estado='fusionado', miembro_a__isnull=False
+    ).select_related('miembro_a')
+    for candidato in fusionados.iterator():
+        miembro = candidato.miembro_a
+        candidato.conservado = f"{miembro.nombre_completo} <{miembro.email}>"[:300]
+        candidato.save(update_fields=['conservado'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0010_segmentos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='duplicadocandidato',
+            name='conservado',
+            field=models.CharField(blank=True, help_text='Nombre y correo del miembro conservado al fusionar.', max_length=300, verbose_name='Miembro conservado'),
+        ),
+        migrations.AlterField(
+            model_name='duplicadocandidato',
+            name='miembro_a',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='miembros.miembro', verbose_name='Miembro que se conserva'),
+        ),
+        migrations.RunPython(guardar_conservados, migrations.RunPython.noop),
+    ]
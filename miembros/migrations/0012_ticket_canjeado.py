@@ -0,0 +1,24 @@
+# Generated by Django 5.2.2 on 2026-10-19 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0011_duplicado_conservado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketCanjeado',
+            fields=[
+                ('nonce', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='Nonce')),
+                ('fecha', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Fecha de canje')),
+            ],
+            options={
+                'verbose_name': 'Ticket canjeado',
+                'verbose_name_plural': 'Tickets canjeados',
+            },
+        ),
+    ]
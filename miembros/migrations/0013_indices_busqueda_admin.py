@@ -0,0 +1,50 @@
+# Generated by Django 5.2.2 on 2026-10-19 01:07
+
+import phonenumber_field.modelfields
+from django.db import migrations
+
+
+# El buscador del admin filtra con istartswith/iexact, que Django traduce a
+# LIKE. En MySQL (intercalación sin mayúsculas) LIKE 'x%' usa los índices
+# B-tree de cada columna; en SQLite solo usa un índice COLLATE NOCASE, que
+# se crea aquí aparte.
+INDICES_SQLITE = (
+    ('miembro_nombre_nocase', 'nombre_completo'),
+    ('miembro_email_nocase', 'email'),
+    ('miembro_telefono_nocase', 'telefono'),
+)
+
+
+def crear_indices(apps, schema_editor):
+    conexion = schema_editor.connection
+    if conexion.vendor != 'sqlite':
+        return
+    for nombre, columna in INDICES_SQLITE:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {conexion.ops.quote_name(nombre)} "
+            f"ON miembros_miembro ({conexion.ops.quote_name(columna)} COLLATE NOCASE)"
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    conexion = schema_editor.connection
+    if conexion.vendor != 'sqlite':
+        return
+    for nombre, _ in INDICES_SQLITE:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {conexion.ops.quote_name(nombre)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miembros', '0012_ticket_canjeado'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='miembro',
+            name='telefono',
+            field=phonenumber_field.modelfields.PhoneNumberField(db_index=True, help_text='Número válido en formato colombiano o internacional. Requiere código de país.', max_length=128, region='CO', verbose_name='Número de teléfono'),
+        ),
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
@@ -1,18 +1,80 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from phonenumber_field.modelfields import PhoneNumberField
 
+from .autocompletado import indice as autocompletado
+from .busqueda import indexar
+from .eventos import contadores, publicar_solicitudes
+from .paises import PAISES
 
-class Miembro(models.Model):
+
+# --------------------- CONCURRENCIA OPTIMISTA ---------------------
+
+class VersionObsoleta(Exception):
+    """
+    El registro cambió desde que se leyó: su versión ya no es la esperada.
+    """
+
+
+class VersionadoMixin(models.Model):
+    """
+    Agrega un número de versión que aumenta con cada escritura. La API
+    actualiza con ``actualizar()``: un único UPDATE de los campos que
+    cambiaron, condicionado a que la versión siga siendo la leída, de modo
+    que dos ediciones concurrentes no se sobrescriben en silencio.
+    """
+
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="Versión",
+        help_text="Aumenta con cada modificación; se usa en la cabecera ETag/If-Match."
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+
+    def actualizar(self, campos, version):
+        """
+        Escribe solo ``campos`` (con los valores actuales de la instancia)
+        si la fila sigue en la versión ``version``.
+
+        Raises:
+            VersionObsoleta: Si otra escritura cambió la fila antes.
+        """
+        if not campos:
+            return
+        valores = {}
+        for nombre in campos:
+            campo = self._meta.get_field(nombre)
+            valores[campo.attname] = getattr(self, campo.attname)
+        filas = type(self)._default_manager.filter(pk=self.pk, version=version).update(
+            version=F('version') + 1, **valores
+        )
+        if not filas:
+            raise VersionObsoleta("El registro fue modificado por otra persona. Vuelve a cargarlo.")
+        self.version = version + 1
+
+
+class Miembro(VersionadoMixin, models.Model):
     """
     Modelo que representa a un miembro registrado en la comunidad PMA Frequency.
     """
 
     nombre_completo = models.CharField(
         max_length=100,
+        db_index=True,
         verbose_name="Nombre completo",
         help_text="Nombre completo del miembro. Máximo 100 caracteres."
     )
@@ -24,13 +86,15 @@ class Miembro(models.Model):
     )
 
     pais = models.CharField(
-        max_length=50,
+        max_length=2,
+        choices=PAISES,
         verbose_name="País",
-        help_text="País de residencia del miembro. Máximo 50 caracteres."
+        help_text="Código ISO 3166-1 alfa-2 del país de residencia (p. ej. CO)."
     )
 
     telefono = PhoneNumberField(
         region='CO',
+        db_index=True,
         verbose_name="Número de teléfono",
         help_text="Número válido en formato colombiano o internacional. Requiere código de país."
     )
@@ -43,7 +107,7 @@ class Miembro(models.Model):
         help_text="Indica si el miembro puede ser reactivado en el futuro."
     )
 
-    fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_registro = models.DateTimeField(auto_now_add=True, db_index=True)
     fecha_desactivacion = models.DateTimeField(null=True, blank=True)
 
     desactivado_por = models.ForeignKey(
@@ -53,9 +117,14 @@ class Miembro(models.Model):
         blank=True
     )
 
-    def save(self, *args, **kwargs):
-        user = kwargs.pop('user', None)
+    def _aplicar_estado(self, user):
+        """
+        Ajusta la fecha y el autor de la desactivación según ``activo``.
 
+        Returns:
+            list: Eventos (campo, fecha) para las estadísticas diarias.
+        """
+        eventos = []
         if self.activo:
             # Validación: si no puede volver, solo el superusuario puede reactivarlo
             if self.puede_volver is False:
@@ -67,10 +136,48 @@ class Miembro(models.Model):
             # Desactivación
             if self.fecha_desactivacion is None:
                 self.fecha_desactivacion = timezone.now()
-            if user and not self.desactivado_por:
+                eventos.append(('desactivaciones', self.fecha_desactivacion))
+            if user and not self.desactivado_por_id:
                 self.desactivado_por = user
+        return eventos
 
-        super().save(*args, **kwargs)
+    def save(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        es_nuevo = self._state.adding
+        eventos = self._aplicar_estado(user)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if es_nuevo:
+                eventos.append(('registros', self.fecha_registro))
+            # Las estadísticas diarias se actualizan en la misma transacción.
+            for campo, fecha in eventos:
+                EstadisticaDiaria.sumar(fecha, self.pais, campo)
+            CambioMiembro.registrar([self.pk])
+            contadores.cambiaron()
+            campos = kwargs.get('update_fields')
+            if campos is None or {'nombre_completo', 'email'} & set(campos):
+                autocompletado.actualizar([self])
+
+    def actualizar(self, campos, version, user=None):
+        anteriores = (self.fecha_desactivacion, self.desactivado_por_id)
+        eventos = self._aplicar_estado(user)
+        campos = set(campos)
+        if self.fecha_desactivacion != anteriores[0]:
+            campos.add('fecha_desactivacion')
+        if self.desactivado_por_id != anteriores[1]:
+            campos.add('desactivado_por')
+
+        with transaction.atomic():
+            super().actualizar(campos, version)
+            for campo, fecha in eventos:
+                EstadisticaDiaria.sumar(fecha, self.pais, campo)
+            if campos:
+                CambioMiembro.registrar([self.pk])
+            if campos & {'activo', 'puede_volver'}:
+                contadores.cambiaron()
+            if campos & {'nombre_completo', 'email'}:
+                autocompletado.actualizar([self])
 
     def __str__(self):
         return self.nombre_completo
@@ -79,6 +186,10 @@ class Miembro(models.Model):
         verbose_name = "Miembro"
         verbose_name_plural = "Miembros"
         ordering = ['nombre_completo']
+        indexes = [
+            # Sirve al filtro por país y cubre el conteo de facetas sin leer la tabla.
+            models.Index(fields=['pais', 'activo', 'puede_volver'], name='miembro_pais_estado'),
+        ]
 
 
 class Sancion(models.Model):
@@ -102,6 +213,7 @@ class Sancion(models.Model):
 
     fecha = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name="Fecha de sanción",
         help_text="Fecha y hora en la que se registró la sanción."
     )
@@ -122,6 +234,21 @@ class Sancion(models.Model):
         help_text="Usuario que registró o impuso la sanción."
     )
 
+    def save(self, *args, **kwargs):
+        es_nueva = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if es_nueva:
+                EstadisticaDiaria.sumar(self.fecha, self._pais_del_miembro(), 'sanciones')
+            if 'motivo' in (kwargs.get('update_fields') or ['motivo']):
+                indexar(Sancion, [self])
+
+    def _pais_del_miembro(self):
+        # Sin el miembro ya cargado basta con su país, no la fila completa.
+        if Sancion._meta.get_field('miembro').is_cached(self):
+            return self.miembro.pais
+        return Miembro.objects.filter(pk=self.miembro_id).values_list('pais', flat=True).first()
+
     def __str__(self):
         return f"Sanción a {self.miembro.nombre_completo} el {self.fecha.strftime('%Y-%m-%d %H:%M')}"
 
@@ -137,7 +264,7 @@ class EstadoSolicitud(models.TextChoices):
     RECHAZADA = 'rechazada', 'Rechazada'
 
 
-class SolicitudCorreccion(models.Model):
+class SolicitudCorreccion(VersionadoMixin, models.Model):
     """
     Representa una solicitud de corrección enviada por un miembro.
     Puede referirse a sanciones, datos personales u otros elementos del sistema.
@@ -158,6 +285,7 @@ class SolicitudCorreccion(models.Model):
 
     fecha = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name="Fecha de solicitud",
         help_text="Fecha y hora en que se envió la solicitud."
     )
@@ -166,6 +294,7 @@ class SolicitudCorreccion(models.Model):
         max_length=10,
         choices=EstadoSolicitud.choices,
         default=EstadoSolicitud.PENDIENTE,
+        db_index=True,
         verbose_name="Estado",
         help_text="Estado actual de la solicitud."
     )
@@ -177,6 +306,21 @@ class SolicitudCorreccion(models.Model):
         help_text="Respuesta proporcionada por el administrador (opcional)."
     )
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if 'descripcion' in (kwargs.get('update_fields') or ['descripcion']):
+                indexar(SolicitudCorreccion, [self])
+            publicar_solicitudes([self])
+
+    def actualizar(self, campos, version):
+        with transaction.atomic():
+            super().actualizar(campos, version)
+            if 'descripcion' in campos:
+                indexar(SolicitudCorreccion, [self])
+            if campos:
+                publicar_solicitudes([self])
+
     def __str__(self):
         return f"Solicitud de {self.miembro.nombre_completo} ({self.estado})"
 
@@ -184,3 +328,350 @@ class SolicitudCorreccion(models.Model):
         verbose_name = "Solicitud de corrección"
         verbose_name_plural = "Solicitudes de corrección"
         ordering = ['-fecha']
+
+
+class EstadisticaDiaria(models.Model):
+    """
+    Totales precalculados por día y país de registros, desactivaciones y
+    sanciones. Se actualizan en cada escritura (Miembro.save, Sancion.save
+    y las altas masivas) y se pueden reconstruir con el comando
+    recalcular_estadisticas.
+    """
+
+    CAMPOS = ('registros', 'desactivaciones', 'sanciones')
+
+    fecha = models.DateField(verbose_name="Fecha")
+    pais = models.CharField(max_length=2, blank=True, verbose_name="País")
+    registros = models.PositiveIntegerField(default=0)
+    desactivaciones = models.PositiveIntegerField(default=0)
+    sanciones = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def sumar(cls, momento, pais, campo, cantidad=1):
+        """
+        Suma ``cantidad`` al contador ``campo`` del día (hora local) y país
+        del evento, con un UPDATE atómico sobre la fila del día.
+        """
+        fecha = timezone.localdate(momento)
+        fila, _ = cls.objects.get_or_create(fecha=fecha, pais=(pais or '').strip())
+        cls.objects.filter(pk=fila.pk).update(**{campo: F(campo) + cantidad})
+
+    def __str__(self):
+        return f"{self.fecha} {self.pais}"
+
+    class Meta:
+        verbose_name = "Estadística diaria"
+        verbose_name_plural = "Estadísticas diarias"
+        ordering = ['fecha', 'pais']
+        constraints = [
+            models.UniqueConstraint(fields=['fecha', 'pais'], name='estadistica_diaria_fecha_pais'),
+        ]
+
+
+# --------------------- DUPLICADOS ---------------------
+
+class EstadoDuplicado(models.TextChoices):
+    PENDIENTE = 'pendiente', 'Pendiente de revisión'
+    FUSIONADO = 'fusionado', 'Fusionado'
+    DESCARTADO = 'descartado', 'No es duplicado'
+
+
+class DuplicadoCandidato(models.Model):
+    """
+    Par de miembros que probablemente son la misma persona, detectado por el
+    comando detectar_duplicados (ver miembros/duplicados.py). ``miembro_a``
+    es siempre el de menor id, el que se conserva al fusionar; tras la
+    fusión ``miembro_b`` queda vacío y el par se guarda como historial,
+    con el nombre y correo de ambos por si luego se elimina el conservado.
+    """
+
+    miembro_a = models.ForeignKey(
+        Miembro,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Miembro que se conserva"
+    )
+    conservado = models.CharField(
+        max_length=300,
+        blank=True,
+        verbose_name="Miembro conservado",
+        help_text="Nombre y correo del miembro conservado al fusionar."
+    )
+    miembro_b = models.ForeignKey(
+        Miembro,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name="Posible duplicado"
+    )
+    fusionado = models.CharField(
+        max_length=300,
+        blank=True,
+        verbose_name="Duplicado fusionado",
+        help_text="Nombre y correo del duplicado eliminado al fusionar."
+    )
+    puntaje = models.FloatField(db_index=True, verbose_name="Puntaje")
+    motivos = models.CharField(max_length=100, verbose_name="Coincidencias")
+    estado = models.CharField(
+        max_length=10,
+        choices=EstadoDuplicado.choices,
+        default=EstadoDuplicado.PENDIENTE,
+        db_index=True,
+        verbose_name="Estado"
+    )
+    fecha_deteccion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de detección")
+
+    def __str__(self):
+        return f"{self.miembro_a or self.conservado} / {self.miembro_b or self.fusionado} ({self.puntaje:.2f})"
+
+    class Meta:
+        verbose_name = "Posible duplicado"
+        verbose_name_plural = "Posibles duplicados"
+        ordering = ['-puntaje']
+        constraints = [
+            models.UniqueConstraint(fields=['miembro_a', 'miembro_b'], name='duplicado_par_unico'),
+        ]
+
+
+# --------------------- SEGMENTOS ---------------------
+# Filtros de miembros guardados con el conjunto de ids que cumplen el
+# filtro ya calculado (ver miembros/segmentos.py). Las escrituras de
+# miembros anotan el id en CambioMiembro y el comando actualizar_segmentos
+# recalcula solo esos ids en cada segmento.
+
+class Segmento(models.Model):
+    """
+    Filtro de miembros guardado (los mismos criterios de filtrar-miembros)
+    con sus ids materializados: enteros sin signo ordenados, de ``ancho``
+    bytes cada uno, uno tras otro en ``ids``. Las páginas y la exportación
+    leen solo el tramo de bytes que necesitan.
+    """
+
+    nombre = models.CharField(max_length=100, unique=True, verbose_name="Nombre")
+    criterios = models.JSONField(
+        default=dict,
+        verbose_name="Criterios",
+        help_text="Criterios de filtrar-miembros (nombre, email, pais, activo, fecha_desde...)."
+    )
+    ids = models.BinaryField(default=bytes, editable=False, verbose_name="Ids materializados")
+    ancho = models.PositiveSmallIntegerField(default=4, editable=False, verbose_name="Bytes por id")
+    total = models.PositiveIntegerField(default=0, editable=False, verbose_name="Miembros")
+    creado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Creado por"
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    fecha_actualizacion = models.DateTimeField(null=True, blank=True, verbose_name="Última actualización")
+
+    def __str__(self):
+        return f"{self.nombre} ({self.total})"
+
+    class Meta:
+        verbose_name = "Segmento"
+        verbose_name_plural = "Segmentos"
+        ordering = ['nombre']
+
+
+class CambioMiembro(models.Model):
+    """
+    Miembro creado, modificado o eliminado desde la última actualización
+    incremental de los segmentos. Solo se anota si hay segmentos.
+    """
+
+    miembro_id = models.BigIntegerField(verbose_name="ID del miembro")
+
+    @classmethod
+    def registrar(cls, ids):
+        if ids and Segmento.objects.exists():
+            cls.objects.bulk_create([cls(miembro_id=pk) for pk in ids])
+
+    class Meta:
+        verbose_name = "Cambio de miembro"
+        verbose_name_plural = "Cambios de miembros"
+
+
+# --------------------- ARCHIVO HISTÓRICO ---------------------
+# Tablas frías a las que se mueven miembros bloqueados o inactivos hace
+# tiempo, sanciones vencidas y solicitudes resueltas antiguas (ver
+# miembros/archivo.py). Conservan el id original para poder restaurarlos.
+
+class MiembroArchivado(models.Model):
+    """
+    Copia archivada de un miembro retirado de la tabla principal.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID original")
+    nombre_completo = models.CharField(max_length=100, verbose_name="Nombre completo")
+    email = models.EmailField(db_index=True, verbose_name="Correo electrónico")
+    pais = models.CharField(max_length=2, choices=PAISES, verbose_name="País")
+    telefono = models.CharField(max_length=128, verbose_name="Número de teléfono")
+    activo = models.BooleanField(default=False)
+    puede_volver = models.BooleanField(default=True, verbose_name="¿Puede volver?")
+    fecha_registro = models.DateTimeField()
+    fecha_desactivacion = models.DateTimeField(null=True, blank=True)
+    desactivado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    fecha_archivado = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        verbose_name="Fecha de archivado"
+    )
+
+    def __str__(self):
+        return self.nombre_completo
+
+    class Meta:
+        verbose_name = "Miembro archivado"
+        verbose_name_plural = "Miembros archivados"
+        ordering = ['-fecha_archivado']
+
+
+class SancionArchivada(models.Model):
+    """
+    Copia archivada de una sanción vencida o de un miembro archivado.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID original")
+    miembro_id = models.BigIntegerField(db_index=True, verbose_name="ID del miembro")
+    motivo = models.TextField(verbose_name="Motivo de la sanción")
+    fecha = models.DateTimeField(verbose_name="Fecha de sanción")
+    duracion_dias = models.PositiveIntegerField(null=True, blank=True, verbose_name="Duración (en días)")
+    impuesta_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    con_miembro = models.BooleanField(
+        default=False,
+        verbose_name="Archivada con el miembro",
+        help_text="Se restaura junto con el miembro si este vuelve a la tabla principal."
+    )
+    fecha_archivado = models.DateTimeField(default=timezone.now, verbose_name="Fecha de archivado")
+
+    class Meta:
+        verbose_name = "Sanción archivada"
+        verbose_name_plural = "Sanciones archivadas"
+        ordering = ['-fecha']
+
+
+class SolicitudArchivada(models.Model):
+    """
+    Copia archivada de una solicitud resuelta o de un miembro archivado.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID original")
+    miembro_id = models.BigIntegerField(db_index=True, verbose_name="ID del miembro")
+    descripcion = models.TextField(verbose_name="Descripción del problema")
+    fecha = models.DateTimeField(verbose_name="Fecha de solicitud")
+    estado = models.CharField(max_length=10, choices=EstadoSolicitud.choices, verbose_name="Estado")
+    respuesta = models.TextField(null=True, blank=True, verbose_name="Respuesta del administrador")
+    con_miembro = models.BooleanField(
+        default=False,
+        verbose_name="Archivada con el miembro",
+        help_text="Se restaura junto con el miembro si este vuelve a la tabla principal."
+    )
+    fecha_archivado = models.DateTimeField(default=timezone.now, verbose_name="Fecha de archivado")
+
+    class Meta:
+        verbose_name = "Solicitud archivada"
+        verbose_name_plural = "Solicitudes archivadas"
+        ordering = ['-fecha']
+
+
+# --------------------- TICKETS DE EVENTOS ---------------------
+
+class TicketCanjeado(models.Model):
+    """
+    Nonce de un ticket de conexión a los eventos ya canjeado (ver
+    miembros/eventos.py). Está en la base de datos para que todos los
+    workers lo vean; se conserva solo mientras el ticket sigue vigente.
+    """
+
+    nonce = models.CharField(max_length=32, primary_key=True, verbose_name="Nonce")
+    fecha = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="Fecha de canje")
+
+    class Meta:
+        verbose_name = "Ticket canjeado"
+        verbose_name_plural = "Tickets canjeados"
+
+
+# --------------------- DIAGNÓSTICO ---------------------
+# Registros de miembros/diagnostico.py. Ambas tablas funcionan como un búfer
+# circular: al insertar se descartan las filas más antiguas por encima de
+# la capacidad configurada.
+
+class RegistroAcotadoMixin:
+    """
+    Inserta un registro y conserva solo los ``capacidad`` más recientes.
+    """
+
+    @classmethod
+    def registrar(cls, capacidad, **campos):
+        registro = cls.objects.create(**campos)
+        cls.objects.filter(pk__lte=registro.pk - capacidad).delete()
+        return registro
+
+
+class ConsultaLenta(RegistroAcotadoMixin, models.Model):
+    """
+    Consulta SQL que superó el umbral de CONSULTA_LENTA_MS durante una petición.
+    """
+
+    fecha = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
+    duracion_ms = models.FloatField(verbose_name="Duración (ms)")
+    metodo = models.CharField(max_length=10, verbose_name="Método")
+    ruta = models.CharField(max_length=500, verbose_name="Ruta")
+    vista = models.CharField(max_length=200, blank=True, verbose_name="Vista")
+    sql = models.TextField(verbose_name="SQL")
+    parametros = models.TextField(blank=True, verbose_name="Parámetros")
+    plan = models.TextField(blank=True, verbose_name="EXPLAIN")
+
+    def __str__(self):
+        return f"{self.duracion_ms:.0f} ms en {self.vista or self.ruta}"
+
+    class Meta:
+        verbose_name = "Consulta lenta"
+        verbose_name_plural = "Consultas lentas"
+        ordering = ['-id']
+
+
+class PerfilPeticion(RegistroAcotadoMixin, models.Model):
+    """
+    Resultado de perfilar una petición con cProfile a pedido de un administrador.
+    """
+
+    fecha = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    metodo = models.CharField(max_length=10, verbose_name="Método")
+    ruta = models.CharField(max_length=500, verbose_name="Ruta")
+    vista = models.CharField(max_length=200, blank=True, verbose_name="Vista")
+    estado = models.PositiveSmallIntegerField(verbose_name="Código de respuesta")
+    duracion_ms = models.FloatField(verbose_name="Duración (ms)")
+    consultas = models.PositiveIntegerField(verbose_name="Consultas SQL")
+    resultado = models.TextField(verbose_name="Perfil (cProfile)")
+
+    def __str__(self):
+        return f"{self.metodo} {self.ruta} ({self.duracion_ms:.0f} ms)"
+
+    class Meta:
+        verbose_name = "Perfil de petición"
+        verbose_name_plural = "Perfiles de peticiones"
+        ordering = ['-id']
@@ -0,0 +1,183 @@
+import sys
+from array import array
+
+from django.db import transaction
+from django.db.models.functions import Substr
+from django.utils import timezone
+
+from .models import Miembro, Segmento, CambioMiembro
+from .utils import en_lotes
+
+
+# Tipos de array por ancho en bytes. Los ids se guardan en little-endian.
+TIPOS = {4: 'I', 8: 'Q'}
+LOTE_LECTURA = 5000
+
+
+# --------------------- FILTRO DE MIEMBROS ---------------------
+# Lo usan filtrar-miembros y los segmentos guardados, para que ambos
+# interpreten los criterios exactamente igual.
+
+def filtrar_miembros(filtros, queryset=None):
+    """
+    Aplica a ``queryset`` (por defecto, todos los miembros) los criterios
+    validados por MiembroFiltroSerializer.
+    """
+    miembros = Miembro.objects.all() if queryset is None else queryset
+
+    if filtros.get('nombre'):
+        miembros = miembros.filter(nombre_completo__icontains=filtros['nombre'])
+
+    if filtros.get('email'):
+        miembros = miembros.filter(email__icontains=filtros['email'])
+
+    if filtros.get('telefono'):
+        miembros = miembros.filter(telefono__icontains=filtros['telefono'])
+
+    if 'activo' in filtros:
+        miembros = miembros.filter(activo=filtros['activo'])
+
+    if 'puede_volver' in filtros:
+        miembros = miembros.filter(puede_volver=filtros['puede_volver'])
+
+    if filtros.get('fecha_desde'):
+        miembros = miembros.filter(fecha_registro__date__gte=filtros['fecha_desde'])
+
+    if filtros.get('fecha_hasta'):
+        miembros = miembros.filter(fecha_registro__date__lte=filtros['fecha_hasta'])
+
+    if filtros.get('pais'):
+        miembros = miembros.filter(pais=filtros['pais'])
+
+    return miembros
+
+
+# --------------------- CODIFICACIÓN DE IDS ---------------------
+
+def codificar(ids, ancho=None):
+    """
+    Empaqueta ids ordenados como enteros sin signo de ``ancho`` bytes (4
+    mientras quepan, si no 8).
+
+    Returns:
+        tuple: (bytes, ancho)
+    """
+    if ancho is None:
+        ancho = 4 if not ids or ids[-1] < 2 ** 32 else 8
+    valores = array(TIPOS[ancho], ids)
+    if sys.byteorder != 'little':
+        valores.byteswap()
+    return valores.tobytes(), ancho
+
+
+def decodificar(datos, ancho):
+    valores = array(TIPOS[ancho])
+    valores.frombytes(bytes(datos))
+    if sys.byteorder != 'little':
+        valores.byteswap()
+    return valores
+
+
+class IdsDeSegmento:
+    """
+    Secuencia de solo lectura sobre los ids de un segmento. Cada corte lee
+    de la base de datos solo sus bytes (SUBSTR sobre el blob), de modo que
+    paginar no carga el conjunto completo. Sirve como object_list de un
+    paginador.
+    """
+
+    def __init__(self, segmento):
+        self.pk = segmento.pk
+        self.ancho = segmento.ancho
+        self.total = segmento.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, corte):
+        if not isinstance(corte, slice):
+            raise TypeError("IdsDeSegmento solo admite cortes.")
+        inicio, fin, _ = corte.indices(self.total)
+        if fin <= inicio:
+            return []
+        trozo = Segmento.objects.filter(pk=self.pk).annotate(
+            trozo=Substr('ids', inicio * self.ancho + 1, (fin - inicio) * self.ancho)
+        ).values_list('trozo', flat=True).first()
+        return decodificar(trozo or b'', self.ancho).tolist()
+
+    def __iter__(self):
+        for inicio in range(0, self.total, LOTE_LECTURA):
+            yield from self[inicio:inicio + LOTE_LECTURA]
+
+
+# --------------------- CÁLCULO Y ACTUALIZACIÓN ---------------------
+
+def criterios_de(segmento):
+    from .serializers import MiembroFiltroSerializer
+
+    filtro = MiembroFiltroSerializer(data=segmento.criterios)
+    filtro.is_valid(raise_exception=True)
+    return filtro.validated_data
+
+
+def calcular(segmento):
+    """
+    Recalcula desde cero los ids del segmento y lo guarda.
+    """
+    ids = list(
+        filtrar_miembros(criterios_de(segmento)).order_by('pk').values_list('pk', flat=True)
+        .iterator(chunk_size=LOTE_LECTURA)
+    )
+    segmento.ids, segmento.ancho = codificar(ids)
+    segmento.total = len(ids)
+    segmento.fecha_actualizacion = timezone.now()
+    segmento.save(update_fields=['ids', 'ancho', 'total', 'fecha_actualizacion'])
+    return segmento
+
+
+def aplicar_cambios(segmento, cambiados):
+    """
+    Vuelve a evaluar solo los miembros ``cambiados`` (creados, modificados
+    o eliminados): los quita del conjunto y agrega los que hoy cumplen el
+    filtro. Devuelve la variación del total.
+    """
+    cambiados = set(cambiados)
+    criterios = criterios_de(segmento)
+    cumplen = set()
+    for lote in en_lotes(Miembro.objects.db, sorted(cambiados)):
+        candidatos = Miembro.objects.filter(pk__in=lote)
+        cumplen.update(filtrar_miembros(criterios, candidatos).values_list('pk', flat=True))
+    actuales = decodificar(segmento.ids, segmento.ancho)
+    ids = sorted({pk for pk in actuales if pk not in cambiados} | cumplen)
+    anterior = segmento.total
+    segmento.ids, segmento.ancho = codificar(ids)
+    segmento.total = len(ids)
+    segmento.fecha_actualizacion = timezone.now()
+    segmento.save(update_fields=['ids', 'ancho', 'total', 'fecha_actualizacion'])
+    return segmento.total - anterior
+
+
+def actualizar_segmentos(completo=False):
+    """
+    Aplica a todos los segmentos los cambios de miembros anotados desde la
+    última vez y los descarta; con ``completo`` los recalcula desde cero.
+
+    Returns:
+        tuple: (segmentos actualizados, miembros cambiados procesados)
+    """
+    with transaction.atomic():
+        # Se borran exactamente las anotaciones leídas: con REPEATABLE READ
+        # (MySQL) un "pk <= máximo leído" también borraría las confirmadas
+        # por otras transacciones después de la lectura, sin aplicarlas.
+        anotaciones = list(CambioMiembro.objects.values_list('pk', 'miembro_id'))
+        cambiados = {miembro_id for _, miembro_id in anotaciones}
+        segmentos = list(Segmento.objects.select_for_update().order_by('pk'))
+        for segmento in segmentos:
+            if completo:
+                calcular(segmento)
+            elif cambiados:
+                aplicar_cambios(segmento, cambiados)
+        leidas = [pk for pk, _ in anotaciones]
+        for lote in en_lotes(CambioMiembro.objects.db, leidas):
+            CambioMiembro.objects.filter(pk__in=lote).delete()
+    return len(segmentos), len(cambiados)
@@ -1,15 +1,127 @@
+from collections import Counter
+from datetime import timedelta
+
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
-from .models import Miembro, Sancion, SolicitudCorreccion
-from .utils import crear_usuario_para_miembro, enviar_correo_bienvenida
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import (
+    Miembro,
+    Sancion,
+    SolicitudCorreccion,
+    EstadoSolicitud,
+    MiembroArchivado,
+    SancionArchivada,
+    SolicitudArchivada,
+    EstadisticaDiaria,
+    Segmento,
+)
+from .busqueda import indexar
+from .eventos import publicar_resolucion
+from .paises import normalizar_pais
+from .utils import provisionar_miembro, valores_por_id, en_lotes
+
+
+RELACIONES_INCLUIBLES = ('sanciones', 'solicitudes')
+
+# Valor por defecto de ``campos``: tomar la selección de ?fields= de la petición.
+CAMPOS_DE_LA_PETICION = object()
+
+
+def _lista_parametro(request, nombre):
+    if request is None:
+        return None
+    valor = request.query_params.get(nombre)
+    if valor is None:
+        return None
+    return [parte.strip() for parte in valor.split(',') if parte.strip()]
+
+
+def campos_solicitados(request):
+    """
+    Devuelve los campos pedidos con ?fields=a,b,c, o None si la petición
+    no restringe los campos de la respuesta.
+    """
+    return _lista_parametro(request, 'fields')
+
+
+def relaciones_incluidas(request):
+    """
+    Devuelve las relaciones pedidas con ?include=sanciones,solicitudes.
+    """
+    incluidas = _lista_parametro(request, 'include') or []
+    desconocidas = set(incluidas) - set(RELACIONES_INCLUIBLES)
+    if desconocidas:
+        raise serializers.ValidationError(
+            {'include': f"Relaciones no soportadas: {', '.join(sorted(desconocidas))}."}
+        )
+    return incluidas
+
+
+def campos_modificados(instance, validated_data):
+    """
+    Asigna a la instancia los valores validados y devuelve los nombres de
+    los campos cuyo valor cambió, que son los únicos que se escriben.
+    """
+    campos = []
+    for campo, valor in validated_data.items():
+        if getattr(instance, campo) != valor:
+            setattr(instance, campo, valor)
+            campos.append(campo)
+    return campos
+
+
+class CampoPais(serializers.CharField):
+    """
+    País como código ISO alfa-2. Acepta también el nombre en español o
+    inglés ("Colombia", "colombia", "Perú") y lo guarda normalizado.
+    """
+
+    def to_internal_value(self, data):
+        valor = super().to_internal_value(data)
+        codigo = normalizar_pais(valor)
+        if codigo is None:
+            raise serializers.ValidationError(f"País desconocido: {valor}.")
+        return codigo
+
+
+class CamposDinamicosMixin:
+    """
+    Permite elegir los campos de la respuesta con ?fields=a,b,c. Los campos
+    no pedidos se eliminan del serializer, de modo que sus métodos tampoco
+    se ejecutan. Solo aplica a serializers de lectura (sin ``data``).
+    """
+
+    def __init__(self, *args, campos=CAMPOS_DE_LA_PETICION, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'data' in kwargs:
+            return
+        if campos is CAMPOS_DE_LA_PETICION:
+            campos = campos_solicitados(self.context.get('request'))
+        if campos is None:
+            return
+
+        desconocidos = set(campos) - set(self.fields)
+        if desconocidos:
+            raise serializers.ValidationError(
+                {'fields': f"Campos desconocidos: {', '.join(sorted(desconocidos))}."}
+            )
+        for nombre in set(self.fields) - set(campos):
+            self.fields.pop(nombre)
 
 
-class MiembroSerializer(serializers.ModelSerializer):
+class MiembroSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo Miembro. Incluye la creación
     de usuario de Django, el envío de correo de bienvenida y
     devuelve también el rol del usuario (staff y superuser).
+    Con ?include=sanciones,solicitudes incrusta los registros
+    precargados por la vista (ver optimizar_miembros).
     """
+    pais = CampoPais()
     is_staff = serializers.SerializerMethodField()
     is_superuser = serializers.SerializerMethodField()
 
@@ -28,10 +140,28 @@ class MiembroSerializer(serializers.ModelSerializer):
             'desactivado_por',
             'is_staff',
             'is_superuser',
+            'version',
         ]
-        read_only_fields = ['fecha_registro', 'fecha_desactivacion', 'desactivado_por']
+        read_only_fields = ['fecha_registro', 'fecha_desactivacion', 'desactivado_por', 'version']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'data' in kwargs:
+            return
+        clases = {'sanciones': SancionSerializer, 'solicitudes': SolicitudCorreccionSerializer}
+        for relacion in relaciones_incluidas(self.context.get('request')):
+            incrustado = clases[relacion](
+                source=f'{relacion}_incluidas', many=True, read_only=True, campos=None
+            )
+            # Los registros van dentro de su miembro: repetirlo sobra.
+            incrustado.child.fields.pop('miembro')
+            incrustado.child.fields.pop('miembro_nombre')
+            self.fields[relacion] = incrustado
 
     def get_is_staff(self, obj):
+        # La vista puede anotar el rol en la misma consulta del listado.
+        if hasattr(obj, 'usuario_is_staff'):
+            return bool(obj.usuario_is_staff)
         try:
             user = User.objects.get(email=obj.email)
             return user.is_staff
@@ -39,6 +169,8 @@ class MiembroSerializer(serializers.ModelSerializer):
             return False
 
     def get_is_superuser(self, obj):
+        if hasattr(obj, 'usuario_is_superuser'):
+            return bool(obj.usuario_is_superuser)
         try:
             user = User.objects.get(email=obj.email)
             return user.is_superuser
@@ -46,26 +178,24 @@ class MiembroSerializer(serializers.ModelSerializer):
             return False
 
     def create(self, validated_data):
-        email = validated_data.get('email')
-        nombre = validated_data.get('nombre_completo')
-
-        if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError("Ya existe un usuario con este correo.")
-
-        user, password, username = crear_usuario_para_miembro(email, nombre)
-        miembro = Miembro.objects.create(**validated_data)
-        enviar_correo_bienvenida(nombre, username, email, password)
-        return miembro
+        try:
+            return provisionar_miembro(Miembro(**validated_data))
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
 
     def update(self, instance, validated_data):
+        """
+        Escribe solo los campos modificados, siempre que el miembro siga en
+        la versión ``version`` (la que indicó la vista; por defecto la leída).
+        """
         user = self.context['request'].user
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save(user=user)
+        validated_data.pop('user', None)
+        version = validated_data.pop('version', instance.version)
+        instance.actualizar(campos_modificados(instance, validated_data), version, user=user)
         return instance
 
 
-class SancionSerializer(serializers.ModelSerializer):
+class SancionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo Sancion. Asigna automáticamente
     el usuario que impone la sanción.
@@ -83,7 +213,106 @@ class SancionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class SolicitudCorreccionSerializer(serializers.ModelSerializer):
+class SancionMasivaSerializer(serializers.Serializer):
+    """
+    Serializer para crear sanciones en bloque. Acepta una lista de ids en
+    'miembros' y/o filas individuales en 'sanciones'; 'motivo' y
+    'duracion_dias' de primer nivel se usan como valores por defecto de
+    cada fila. Las filas inválidas se reportan sin detener al resto.
+    """
+    MAX_FILAS = 10000
+
+    motivo = serializers.CharField(required=False)
+    duracion_dias = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    miembros = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=MAX_FILAS
+    )
+    sanciones = serializers.ListField(
+        child=serializers.DictField(), required=False, max_length=MAX_FILAS
+    )
+
+    def validate(self, attrs):
+        filas = [{'miembro': pk} for pk in attrs.get('miembros', [])]
+        filas += attrs.get('sanciones', [])
+        if not filas:
+            raise serializers.ValidationError("Debes indicar al menos un miembro a sancionar.")
+        if len(filas) > self.MAX_FILAS:
+            raise serializers.ValidationError(
+                f"No se pueden crear más de {self.MAX_FILAS} sanciones por solicitud."
+            )
+        attrs['filas'] = filas
+        return attrs
+
+    def _validar_fila(self, fila, motivo, duracion):
+        errores = {}
+        miembro = fila.get('miembro')
+        if isinstance(miembro, bool) or not isinstance(miembro, int) or miembro < 1:
+            errores['miembro'] = "Debe ser un id de miembro válido."
+            miembro = None
+
+        motivo = fila.get('motivo', motivo)
+        if not isinstance(motivo, str) or not motivo.strip():
+            errores['motivo'] = "El motivo es obligatorio."
+
+        duracion = fila.get('duracion_dias', duracion)
+        if duracion is not None and (
+            isinstance(duracion, bool) or not isinstance(duracion, int) or duracion < 0
+        ):
+            errores['duracion_dias'] = "Debe ser un número entero positivo o nulo."
+
+        return miembro, motivo, duracion, errores
+
+    def create(self, validated_data):
+        """
+        Valida todos los miembros con una sola consulta e inserta las filas
+        válidas con bulk_create dentro de una transacción.
+
+        Returns:
+            list: Un resultado por fila, en el mismo orden de la petición.
+        """
+        user = self.context['request'].user
+        motivo = validated_data.get('motivo')
+        duracion = validated_data.get('duracion_dias')
+
+        filas = [self._validar_fila(fila, motivo, duracion) for fila in validated_data['filas']]
+        paises = valores_por_id(
+            Miembro.objects.all(), (fila[0] for fila in filas if fila[0] is not None), 'pais'
+        )
+
+        resultados = []
+        nuevas = []
+        for indice, (miembro, motivo_fila, duracion_fila, errores) in enumerate(filas):
+            if miembro is not None and miembro not in paises:
+                errores['miembro'] = "No existe un miembro con este id."
+            resultado = {'indice': indice, 'miembro': miembro, 'id': None, 'creada': False}
+            if errores:
+                resultado['errores'] = errores
+            else:
+                sancion = Sancion(
+                    miembro_id=miembro,
+                    motivo=motivo_fila,
+                    duracion_dias=duracion_fila,
+                    impuesta_por=user,
+                )
+                nuevas.append((resultado, sancion))
+                resultado['creada'] = True
+            resultados.append(resultado)
+
+        with transaction.atomic():
+            creadas = Sancion.objects.bulk_create([sancion for _, sancion in nuevas])
+            indexar(Sancion, creadas)
+            # bulk_create no pasa por Sancion.save: se suman aquí por país.
+            por_pais = Counter(paises[sancion.miembro_id] for sancion in creadas)
+            for pais, cantidad in por_pais.items():
+                EstadisticaDiaria.sumar(creadas[0].fecha, pais, 'sanciones', cantidad)
+
+        # Algunos backends (MySQL) no devuelven la clave primaria en bulk_create.
+        for (resultado, _), sancion in zip(nuevas, creadas):
+            resultado['id'] = sancion.pk
+        return resultados
+
+
+class SolicitudCorreccionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo SolicitudCorreccion. Asocia
     automáticamente la solicitud al miembro autenticado.
@@ -104,6 +333,131 @@ class SolicitudCorreccionSerializer(serializers.ModelSerializer):
         validated_data['miembro'] = miembro
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        version = validated_data.pop('version', instance.version)
+        instance.actualizar(campos_modificados(instance, validated_data), version)
+        return instance
+
+
+class ResolucionMasivaSerializer(serializers.Serializer):
+    """
+    Serializer para aprobar o rechazar solicitudes pendientes en bloque.
+    Acepta una lista de ids en 'ids' y/o filas en 'solicitudes'; 'estado'
+    y 'respuesta' de primer nivel se usan como valores por defecto.
+    """
+    MAX_FILAS = 10000
+    ESTADOS_FINALES = (EstadoSolicitud.APROBADA, EstadoSolicitud.RECHAZADA)
+
+    estado = serializers.ChoiceField(choices=ESTADOS_FINALES, required=False)
+    respuesta = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, max_length=MAX_FILAS
+    )
+    solicitudes = serializers.ListField(
+        child=serializers.DictField(), required=False, max_length=MAX_FILAS
+    )
+
+    def validate(self, attrs):
+        filas = [{'id': pk} for pk in attrs.get('ids', [])]
+        filas += attrs.get('solicitudes', [])
+        if not filas:
+            raise serializers.ValidationError("Debes indicar al menos una solicitud.")
+        if len(filas) > self.MAX_FILAS:
+            raise serializers.ValidationError(
+                f"No se pueden resolver más de {self.MAX_FILAS} solicitudes por petición."
+            )
+
+        errores = {}
+        transiciones = {}
+        for indice, fila in enumerate(filas):
+            pk = fila.get('id')
+            estado = fila.get('estado', attrs.get('estado'))
+            respuesta = fila.get('respuesta', attrs.get('respuesta'))
+            if isinstance(pk, bool) or not isinstance(pk, int) or pk < 1:
+                errores[indice] = "Debe indicar un id de solicitud válido."
+            elif estado not in self.ESTADOS_FINALES:
+                errores[indice] = "El estado debe ser 'aprobada' o 'rechazada'."
+            elif respuesta is not None and not isinstance(respuesta, str):
+                errores[indice] = "La respuesta debe ser texto."
+            elif pk in transiciones:
+                errores[indice] = "La solicitud está repetida en la petición."
+            else:
+                transiciones[pk] = (estado, respuesta)
+        if errores:
+            raise serializers.ValidationError({'solicitudes': errores})
+
+        attrs['transiciones'] = transiciones
+        return attrs
+
+    @staticmethod
+    def lectura_bloqueada(conexion):
+        """
+        True si las filas leídas en la transacción no pueden cambiar antes
+        del UPDATE: SELECT ... FOR UPDATE en MySQL, o BEGIN IMMEDIATE en
+        SQLite (SQLITE_CONCURRENTE), que toma el bloqueo de escritura al
+        empezar.
+        """
+        if conexion.vendor == 'sqlite':
+            return conexion.transaction_mode in ('IMMEDIATE', 'EXCLUSIVE')
+        return conexion.features.has_select_for_update
+
+    def create(self, validated_data):
+        """
+        Aplica las transiciones con UPDATE condicionales: solo cambian las
+        filas que siguen pendientes, de modo que dos revisores concurrentes
+        nunca se sobrescriben. Con la lectura bloqueada basta un UPDATE por
+        lote; sin bloqueo se hace uno por solicitud y su rowcount indica
+        exactamente cuáles cambió este revisor.
+
+        Returns:
+            dict: Ids transicionados y omitidos.
+        """
+        grupos = {}
+        for pk, destino in validated_data['transiciones'].items():
+            grupos.setdefault(destino, []).append(pk)
+
+        pendientes = SolicitudCorreccion.objects.filter(estado=EstadoSolicitud.PENDIENTE)
+        bloqueada = self.lectura_bloqueada(connections[pendientes.db])
+        actualizadas = []
+        with transaction.atomic():
+            for (estado, respuesta), ids in grupos.items():
+                cambios = {'estado': estado, 'respuesta': respuesta, 'version': F('version') + 1}
+                for lote in en_lotes(pendientes.db, ids):
+                    leidas = list(pendientes.select_for_update().filter(pk__in=lote).values_list('pk', flat=True))
+                    if not leidas:
+                        continue
+                    if bloqueada:
+                        pendientes.filter(pk__in=leidas).update(**cambios)
+                        transicionadas = leidas
+                    else:
+                        transicionadas = [pk for pk in leidas if pendientes.filter(pk=pk).update(**cambios)]
+                    actualizadas.extend(transicionadas)
+                    publicar_resolucion(estado, transicionadas)
+
+        transicionadas = set(actualizadas)
+        return {
+            'actualizadas': sorted(transicionadas),
+            'omitidas': sorted(set(validated_data['transiciones']) - transicionadas),
+        }
+
+# Serializers de solo lectura para el archivo histórico
+class MiembroArchivadoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MiembroArchivado
+        fields = '__all__'
+
+
+class SancionArchivadaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SancionArchivada
+        fields = '__all__'
+
+
+class SolicitudArchivadaSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SolicitudArchivada
+        fields = '__all__'
+
 #Serializer para filtros
 class MiembroFiltroSerializer(serializers.Serializer):
     nombre = serializers.CharField(required=False)
@@ -113,3 +467,77 @@ class MiembroFiltroSerializer(serializers.Serializer):
     puede_volver = serializers.BooleanField(required=False)
     fecha_desde = serializers.DateField(required=False)
     fecha_hasta = serializers.DateField(required=False)
+    pais = CampoPais(required=False)
+    facetas = serializers.BooleanField(default=False)
+    envoltura = serializers.BooleanField(default=False)
+    limite = serializers.IntegerField(required=False, min_value=1)
+    # Sin valor, solo se recorta si se pidió un ``limite``.
+    truncar = serializers.BooleanField(required=False)
+
+    def validate_limite(self, valor):
+        maximo = settings.FILTRO_MAX_FILAS
+        if maximo and valor > maximo:
+            raise serializers.ValidationError(f"No puede superar {maximo}.")
+        return valor
+
+
+class SegmentoSerializer(serializers.ModelSerializer):
+    """
+    Segmento guardado. ``criterios`` acepta los mismos campos que
+    filtrar-miembros (sin facetas, envoltura, limite ni truncar) y se
+    guarda normalizado.
+    """
+    CAMPOS_DE_RESPUESTA = ('facetas', 'envoltura', 'limite', 'truncar')
+
+    class Meta:
+        model = Segmento
+        fields = ['id', 'nombre', 'criterios', 'total', 'creado_por', 'fecha_creacion', 'fecha_actualizacion']
+        read_only_fields = ['total', 'creado_por', 'fecha_creacion', 'fecha_actualizacion']
+
+    def validate_criterios(self, valor):
+        filtro = MiembroFiltroSerializer(data=valor)
+        if not filtro.is_valid():
+            raise serializers.ValidationError(filtro.errors)
+        return {
+            campo: dato for campo, dato in filtro.data.items()
+            if campo not in self.CAMPOS_DE_RESPUESTA
+        }
+
+
+class EstadisticasSerieSerializer(serializers.Serializer):
+    """
+    Parámetros de la serie temporal de estadísticas. Por defecto devuelve
+    los últimos 30 días, por día y sin desglose por país.
+    """
+    MAX_DIAS = 3660
+
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
+    granularidad = serializers.ChoiceField(choices=['dia', 'mes'], default='dia')
+    pais = CampoPais(required=False)
+    por_pais = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        hasta = data.setdefault('hasta', timezone.localdate())
+        desde = data.setdefault('desde', hasta - timedelta(days=29))
+        if desde > hasta:
+            raise serializers.ValidationError("'desde' no puede ser posterior a 'hasta'.")
+        if (hasta - desde).days >= self.MAX_DIAS:
+            raise serializers.ValidationError(f"El rango no puede superar {self.MAX_DIAS} días.")
+        return data
+
+
+class PeticionLoteSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=50)
+    metodo = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    url = serializers.CharField(max_length=2000)
+    cuerpo = serializers.JSONField(required=False)
+
+
+class LoteSerializer(serializers.Serializer):
+    """
+    Lista de peticiones a ejecutar en /api/batch/, en el orden recibido.
+    """
+    MAX_PETICIONES = 20
+
+    peticiones = PeticionLoteSerializer(many=True, allow_empty=False, max_length=MAX_PETICIONES)
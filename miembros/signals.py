@@ -0,0 +1,53 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate
+from django.dispatch import receiver
+
+from .autocompletado import indice as autocompletado
+from .busqueda import INDICES, MOTORES_CON_INDICE, desindexar, reindexar
+from .models import CambioMiembro, Miembro, Sancion, SolicitudCorreccion
+
+
+# --------------------- ÍNDICES DE TEXTO COMPLETO ---------------------
+# post_delete llega también por los borrados en cascada (miembro ->
+# sanciones y solicitudes) y por QuerySet.delete(), que no pasan por
+# Model.delete().
+
+@receiver(post_delete, sender=Sancion)
+@receiver(post_delete, sender=SolicitudCorreccion)
+def desindexar_al_eliminar(sender, instance, **kwargs):
+    desindexar(sender, [instance.pk])
+
+
+# --------------------- MIEMBROS ELIMINADOS ---------------------
+# Un miembro eliminado por cualquier vía (delete(), QuerySet.delete(),
+# archivo, fusión de duplicados) queda anotado para actualizar_segmentos y
+# sale del índice de autocompletado al confirmarse la transacción.
+
+@receiver(post_delete, sender=Miembro)
+def anotar_miembro_eliminado(sender, instance, **kwargs):
+    CambioMiembro.registrar([instance.pk])
+    autocompletado.quitar([instance.pk])
+
+
+@receiver(post_migrate)
+def llenar_indices_vacios(sender, app_config, using, **kwargs):
+    """
+    La migración 0006 crea las tablas del índice vacías. Tras migrar, los
+    índices sin filas de una tabla que ya tiene registros se llenan con la
+    normalización actual (lo mismo que el comando reindexar_busqueda).
+    """
+    if app_config.label != 'miembros' or connections[using].vendor not in MOTORES_CON_INDICE:
+        return
+    conexion = connections[using]
+    existentes = set(conexion.introspection.table_names())
+    for modelo in (Sancion, SolicitudCorreccion):
+        nombre = INDICES[modelo._meta.label][1]
+        if nombre not in existentes:
+            # Migrado hacia atrás, antes de 0006.
+            continue
+        tabla = conexion.ops.quote_name(nombre)
+        with conexion.cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {tabla} LIMIT 1")
+            indexado = cursor.fetchone() is not None
+        if not indexado and modelo.objects.using(using).exists():
+            reindexar(modelo)
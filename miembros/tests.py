@@ -1,3 +1,1463 @@
-from django.test import TestCase
+import asyncio
+import csv
+import itertools
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from importlib import import_module
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, connection, connections
+from django.db.models import F, QuerySet
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .admin import PaginadorConteoEstimado
+from .archivo import archivar_miembros, archivar_sanciones, restaurar_miembro
+from .autocompletado import IndicePrefijos, indice
+from .busqueda import INDICES, buscar, reindexar, terminos
+from .diagnostico import ConsultasLentasMiddleware, PerfilPeticionMiddleware, planes
+from .duplicados import detectar_duplicados, fusionar, generar_candidatos, puntuar
+from .estadisticas import recalcular_estadisticas
+from .eventos import EPOCA, BusEventos, emitir_ticket, flujo
+from .limites import PlazoDeConsultas
+from .models import (
+    CambioMiembro,
+    ConsultaLenta,
+    DuplicadoCandidato,
+    EstadisticaDiaria,
+    EstadoDuplicado,
+    EstadoSolicitud,
+    Miembro,
+    MiembroArchivado,
+    PerfilPeticion,
+    Sancion,
+    SancionArchivada,
+    Segmento,
+    SolicitudArchivada,
+    SolicitudCorreccion,
+    TicketCanjeado,
+)
+from .paises import normalizar_pais
+from .segmentos import actualizar_segmentos, aplicar_cambios, codificar, decodificar
+from .serializers import ResolucionMasivaSerializer
+from .signals import llenar_indices_vacios
+from .views import LoteView, SegmentoViewSet, _staff_para_eventos
+from .utils import provisionar_miembro
+
+
+def crear_miembros(cantidad, inicio=0):
+    return Miembro.objects.bulk_create([
+        Miembro(
+            nombre_completo=f"Miembro {i}",
+            email=f"miembro{i}@pma.test",
+            pais="CO",
+            telefono="+573001234567",
+        )
+        for i in range(inicio, inicio + cantidad)
+    ])
+
+
+class AdminChangelistTests(TestCase):
+    """
+    Las páginas del admin deben ejecutar el mismo número de consultas sin
+    importar cuántas filas se listen (sin N+1 por miembro o usuario).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@pma.test', 'clave-segura')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def poblar(self, cantidad):
+        inicio = Miembro.objects.count()
+        miembros = crear_miembros(cantidad, inicio)
+        Sancion.objects.bulk_create([
+            Sancion(miembro=miembro, motivo="Spam", impuesta_por=self.admin) for miembro in miembros
+        ])
+        SolicitudCorreccion.objects.bulk_create([
+            SolicitudCorreccion(miembro=miembro, descripcion="Error en datos") for miembro in miembros
+        ])
+
+    def contar_consultas(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        return len(consultas)
+
+    def assertConsultasConstantes(self, nombre_url):
+        url = reverse(nombre_url)
+        self.poblar(2)
+        pocas = self.contar_consultas(url)
+        self.poblar(20)
+        muchas = self.contar_consultas(url)
+        self.assertEqual(pocas, muchas)
+
+    def test_changelist_miembros(self):
+        self.assertConsultasConstantes('admin:miembros_miembro_changelist')
+
+    def test_changelist_sanciones(self):
+        self.assertConsultasConstantes('admin:miembros_sancion_changelist')
+
+    def test_changelist_solicitudes(self):
+        self.assertConsultasConstantes('admin:miembros_solicitudcorreccion_changelist')
+
+    def test_formulario_sancion_no_lista_miembros(self):
+        self.poblar(5)
+        respuesta = self.client.get(reverse('admin:miembros_sancion_add'))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotContains(respuesta, "Miembro 3")
+
+    def test_busqueda_por_prefijo(self):
+        self.poblar(3)
+        respuesta = self.client.get(reverse('admin:miembros_miembro_changelist'), {'q': 'Miembro 1'})
+        self.assertContains(respuesta, "Miembro 1")
+        self.assertNotContains(respuesta, "Miembro 2")
+
+    @skipUnless(connection.vendor == 'sqlite', "Comprueba los índices COLLATE NOCASE de SQLite.")
+    def test_busqueda_usa_indices(self):
+        modelo_admin = admin.site._registry[Miembro]
+        peticion = RequestFactory().get('/')
+        peticion.user = self.admin
+        for termino in ('miem', 'MIEMBRO1@pma.test', '+57300'):
+            resultado, _ = modelo_admin.get_search_results(peticion, Miembro.objects.order_by(), termino)
+            plan = resultado.explain()
+            self.assertNotIn('SCAN miembros_miembro', plan, plan)
+
+    def test_filtro_por_pais(self):
+        self.poblar(2)
+        Miembro.objects.create(nombre_completo="Luis", email="luis@pma.test", pais="PE", telefono="+51987654321")
+        respuesta = self.client.get(reverse('admin:miembros_miembro_changelist'), {'pais__exact': 'PE'})
+        self.assertContains(respuesta, "luis@pma.test")
+        self.assertNotContains(respuesta, "miembro0@pma.test")
+
+
+@skipUnless(connection.vendor == 'sqlite', "La estimación de prueba usa sqlite_stat1.")
+class PaginadorConteoEstimadoTests(TestCase):
+
+    def setUp(self):
+        crear_miembros(3)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "UPDATE sqlite_stat1 SET stat = '500000 1' WHERE tbl = %s",
+                [Miembro._meta.db_table],
+            )
+
+    def test_usa_estimacion_sin_filtros(self):
+        paginador = PaginadorConteoEstimado(Miembro.objects.all(), 10)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginador.count, 500000)
+
+    def test_conteo_exacto_con_filtros(self):
+        paginador = PaginadorConteoEstimado(Miembro.objects.filter(activo=True), 10)
+        self.assertEqual(paginador.count, 3)
+
+    def test_conteo_exacto_bajo_el_umbral(self):
+        with mock.patch.object(PaginadorConteoEstimado, 'UMBRAL_ESTIMADO', 10 ** 9):
+            self.assertEqual(PaginadorConteoEstimado(Miembro.objects.all(), 10).count, 3)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ProvisionamientoConcurrenteTests(TransactionTestCase):
+    """
+    Lanza cientos de altas en paralelo contra la misma base de datos,
+    repitiendo correos y forzando colisiones de username, y comprueba que
+    no quedan miembros duplicados ni usuarios huérfanos.
+    """
+    HILOS = 16
+    CORREOS = 60
+    REPETICIONES = 5
+
+    REINTENTOS = 200
+
+    def alta(self, email):
+        try:
+            # SQLite rechaza las escrituras concurrentes con "database is
+            # locked"; el cliente reintenta, como haría el frontend.
+            for _ in range(self.REINTENTOS):
+                try:
+                    provisionar_miembro(Miembro(
+                        nombre_completo="Ana Prueba", email=email, pais="CO", telefono="+573001234567"
+                    ))
+                    return 'creado'
+                except ValidationError:
+                    return 'duplicado'
+                except OperationalError:
+                    time.sleep(0.005)
+            return 'bloqueado'
+        finally:
+            connections.close_all()
+
+    def test_altas_concurrentes_sin_duplicados_ni_huerfanos(self):
+        # Mismo usuario local en distintos dominios: todos compiten por el username "ana".
+        correos = [f"ana@dominio{i}.test" for i in range(self.CORREOS)]
+        tareas = correos * self.REPETICIONES
+
+        with mock.patch('miembros.utils.enviar_correo_bienvenida') as enviar:
+            with ThreadPoolExecutor(max_workers=self.HILOS) as pool:
+                resultados = Counter(pool.map(self.alta, tareas))
+
+        creados = Miembro.objects.filter(email__in=correos)
+        self.assertEqual(resultados, Counter(
+            creado=self.CORREOS, duplicado=self.CORREOS * (self.REPETICIONES - 1)
+        ))
+        self.assertEqual(creados.count(), self.CORREOS)
+        self.assertEqual(enviar.call_count, resultados['creado'])
+
+        usuarios = User.objects.filter(email__in=correos)
+        por_correo = Counter(usuarios.values_list('email', flat=True))
+        self.assertTrue(all(cantidad == 1 for cantidad in por_correo.values()))
+        self.assertEqual(set(por_correo), set(creados.values_list('email', flat=True)))
+        self.assertEqual(usuarios.values('username').distinct().count(), usuarios.count())
+
+    def test_fallo_a_mitad_no_deja_filas(self):
+        with mock.patch('miembros.utils.crear_usuario_para_miembro', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                provisionar_miembro(Miembro(
+                    nombre_completo="Ana Prueba", email="ana@fallo.test",
+                    pais="CO", telefono="+573001234567",
+                ))
+        self.assertFalse(Miembro.objects.filter(email="ana@fallo.test").exists())
+        self.assertFalse(User.objects.filter(email="ana@fallo.test").exists())
+
+
+class EventosSuscriptoresTests(SimpleTestCase):
+    """
+    Un solo worker (un event loop) debe sostener miles de conexiones SSE
+    en espera con poca memoria y repartir cada evento a todas en poco tiempo.
+    """
+    SUSCRIPTORES = 5000
+
+    async def abrir(self, canal, cantidad, **opciones):
+        flujos = [flujo(0, bus=canal, **opciones) for _ in range(cantidad)]
+        for abierto in flujos:
+            self.assertTrue((await anext(abierto)).startswith('retry:'))
+        return flujos
+
+    def test_miles_de_suscriptores_en_espera(self):
+        async def escenario():
+            canal = BusEventos(100)
+            tracemalloc.start()
+            try:
+                antes = tracemalloc.get_traced_memory()[0]
+                flujos = await self.abrir(canal, self.SUSCRIPTORES, latido=60)
+                esperas = [asyncio.ensure_future(anext(abierto)) for abierto in flujos]
+                await asyncio.sleep(0.1)
+                memoria = tracemalloc.get_traced_memory()[0] - antes
+            finally:
+                tracemalloc.stop()
+            self.assertEqual(canal.suscriptores, self.SUSCRIPTORES)
+            self.assertFalse(any(espera.done() for espera in esperas))
+
+            inicio = time.perf_counter()
+            canal.publicar('contadores', {'activos': 1})
+            recibidos = await asyncio.gather(*esperas)
+            reparto = time.perf_counter() - inicio
+
+            for abierto in flujos:
+                await abierto.aclose()
+            return memoria, reparto, recibidos, canal.suscriptores
+
+        memoria, reparto, recibidos, restantes = asyncio.run(escenario())
+        self.assertTrue(all(texto.startswith(f'id: {EPOCA}-1\nevent: contadores\n') for texto in recibidos))
+        self.assertLess(memoria / self.SUSCRIPTORES, 8 * 1024)
+        self.assertLess(reparto, 2)
+        self.assertEqual(restantes, 0)
+
+    def test_latido_a_suscriptores_en_espera(self):
+        async def escenario():
+            flujos = await self.abrir(BusEventos(10), 1000, latido=0.05)
+            latidos = await asyncio.gather(*(anext(abierto) for abierto in flujos))
+            for abierto in flujos:
+                await abierto.aclose()
+            return latidos
+
+        self.assertEqual(set(asyncio.run(escenario())), {": latido\n\n"})
+
+    def test_reconexion_con_ultimo_id(self):
+        async def escenario():
+            canal = BusEventos(3)
+            for numero in range(5):
+                canal.publicar('solicitud', {'id': numero})
+            pendientes = flujo(3, bus=canal)
+            vencido = flujo(1, bus=canal)
+            await anext(pendientes), await anext(vencido)
+            resultado = (await anext(pendientes), await anext(vencido))
+            await pendientes.aclose()
+            await vencido.aclose()
+            return resultado
+
+        pendientes, vencido = asyncio.run(escenario())
+        self.assertEqual(pendientes.count('event: solicitud'), 2)
+        self.assertIn(f'id: {EPOCA}-5\n', pendientes)
+        self.assertIn('event: reinicio', vencido)
+
+
+class SegmentosTests(TestCase):
+    """
+    Los segmentos guardan sus ids empaquetados; actualizar_segmentos aplica
+    solo los cambios anotados y deja el mismo conjunto que recalcular desde
+    cero. Sus miembros se paginan y exportan desde ese conjunto.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.miembros = crear_miembros(12)
+
+    def crear_segmento(self, criterios):
+        respuesta = self.cliente.post(
+            reverse('segmento-list'), {'nombre': "Prueba", 'criterios': criterios}, format='json'
+        )
+        self.assertEqual(respuesta.status_code, 201)
+        return Segmento.objects.get(pk=respuesta.data['id'])
+
+    def ids_de(self, segmento):
+        segmento.refresh_from_db()
+        return decodificar(segmento.ids, segmento.ancho).tolist()
+
+    def test_codificacion_de_ids(self):
+        for ids, ancho in (([], 4), ([1, 7, 2 ** 32 - 1], 4), ([3, 2 ** 32, 2 ** 40], 8)):
+            datos, usado = codificar(ids)
+            self.assertEqual(usado, ancho)
+            self.assertEqual(len(datos), ancho * len(ids))
+            self.assertEqual(decodificar(datos, usado).tolist(), ids)
+        # Little-endian, sea cual sea el procesador.
+        self.assertEqual(codificar([1])[0], b'\x01\x00\x00\x00')
+
+    def test_incremental_equivale_a_completo(self):
+        segmento = self.crear_segmento({'pais': 'CO', 'activo': True})
+        self.assertEqual(self.ids_de(segmento), [miembro.pk for miembro in self.miembros])
+
+        nuevo = Miembro.objects.create(
+            nombre_completo="Nuevo", email="nuevo@pma.test", pais="CO", telefono="+573001234567"
+        )
+        otro_pais = Miembro.objects.create(
+            nombre_completo="Otro país", email="otro@pma.test", pais="PE", telefono="+51912345678"
+        )
+        inactivo = self.miembros[0]
+        inactivo.activo = False
+        inactivo.save()
+        # El borrado por queryset también queda anotado (miembros.signals).
+        Miembro.objects.filter(pk__in=[self.miembros[1].pk, self.miembros[2].pk]).delete()
+        self.assertEqual(CambioMiembro.objects.count(), 5)
+
+        self.assertEqual(actualizar_segmentos(), (1, 5))
+        incremental = self.ids_de(segmento)
+        self.assertIn(nuevo.pk, incremental)
+        self.assertNotIn(otro_pais.pk, incremental)
+        self.assertNotIn(inactivo.pk, incremental)
+        self.assertFalse(CambioMiembro.objects.exists())
+
+        actualizar_segmentos(completo=True)
+        self.assertEqual(self.ids_de(segmento), incremental)
+        self.assertEqual(segmento.total, len(incremental))
+
+    def test_conserva_cambios_anotados_durante_la_actualizacion(self):
+        self.crear_segmento({})
+        Miembro.objects.filter(pk=self.miembros[0].pk).delete()
+
+        def anotar_otro(segmento, cambiados):
+            # Otra transacción confirma un cambio después de la lectura.
+            CambioMiembro.objects.create(miembro_id=self.miembros[1].pk)
+            return aplicar_cambios(segmento, cambiados)
+
+        with mock.patch('miembros.segmentos.aplicar_cambios', side_effect=anotar_otro):
+            self.assertEqual(actualizar_segmentos(), (1, 1))
+        self.assertEqual(
+            list(CambioMiembro.objects.values_list('miembro_id', flat=True)), [self.miembros[1].pk]
+        )
+
+    @override_settings(LISTADO_MAX_FILAS=3)
+    def test_paginacion_de_miembros(self):
+        segmento = self.crear_segmento({})
+        url = reverse('segmento-miembros', args=[segmento.pk])
+        respuesta = self.cliente.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        # Sin el tope de los listados: el total sale del segmento.
+        self.assertEqual(respuesta.data['count'], 12)
+        self.assertNotIn('truncado', respuesta.data)
+        self.assertEqual([fila['id'] for fila in respuesta.data['results']], [m.pk for m in self.miembros[:10]])
+
+        respuesta = self.cliente.get(url, {'page': 2})
+        self.assertEqual([fila['id'] for fila in respuesta.data['results']], [m.pk for m in self.miembros[10:]])
+        self.assertIsNone(respuesta.data['next'])
+
+    def test_exportar_csv(self):
+        segmento = self.crear_segmento({})
+        with mock.patch.object(SegmentoViewSet, 'LOTE_EXPORTACION', 5):
+            respuesta = self.cliente.get(reverse('segmento-exportar', args=[segmento.pk]))
+            filas = list(csv.reader(b''.join(respuesta.streaming_content).decode().splitlines()))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Content-Disposition'], f'attachment; filename="segmento-{segmento.pk}.csv"')
+        self.assertEqual(filas[0], list(SegmentoViewSet.COLUMNAS_EXPORTACION))
+        self.assertEqual([int(fila[0]) for fila in filas[1:]], [miembro.pk for miembro in self.miembros])
+        self.assertEqual(filas[1][1:4], ["Miembro 0", "miembro0@pma.test", "CO"])
+
+
+class AutocompletadoTests(TestCase):
+    """
+    El índice de prefijos devuelve las claves en orden y refleja las
+    escrituras y los borrados al confirmarse. La latencia se mide con el
+    comando medir_autocompletado.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+
+    def tearDown(self):
+        # El índice global no debe arrastrar miembros de esta prueba a las demás.
+        indice.__init__()
+
+    def test_busqueda_sobre_muchas_claves(self):
+        apellidos = ('garcía', 'gómez', 'gonzález', 'pérez', 'peña', 'ruiz')
+        prueba = IndicePrefijos()
+        prueba.construir(
+            (pk, f"Ana {apellidos[pk % 6]} {apellidos[pk // 6 % 6]}{pk}", f"ana{pk}@pma.test")
+            for pk in range(1, 2001)
+        )
+        memoria = prueba.memoria()
+        self.assertLess(memoria['total'] / memoria['entradas'], 32)
+
+        for prefijo in ('a', 'an', 'g', 'go', 'gon', 'pe', 'pen', 'ruiz9', 'ana12'):
+            self.assertEqual(len(prueba.buscar(prefijo, 10)), 10)
+        self.assertEqual(prueba.buscar('pena', 3), [4, 10, 16])
+
+    def test_escrituras_actualizan_el_indice(self):
+        indice.construir()
+        with self.captureOnCommitCallbacks(execute=True):
+            miembro = Miembro.objects.create(
+                nombre_completo="Lucía Peña", email="lucia@pma.test", pais="CO", telefono="+573001234567"
+            )
+        self.assertEqual(indice.buscar('pen', 10), [miembro.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            miembro.nombre_completo = "Lucía Ruiz"
+            miembro.save()
+        self.assertEqual(indice.buscar('pen', 10), [])
+        self.assertEqual(indice.buscar('ruiz', 10), [miembro.pk])
+
+        indice.construir()
+        self.assertEqual(indice.memoria()['entradas_delta'], 0)
+        self.assertEqual(indice.buscar('ruiz', 10), [miembro.pk])
+
+        # El borrado por queryset también lo quita (miembros.signals).
+        with self.captureOnCommitCallbacks(execute=True):
+            Miembro.objects.filter(pk=miembro.pk).delete()
+        self.assertEqual(indice.buscar('ruiz', 10), [])
+
+    def test_endpoint_con_varias_palabras(self):
+        for nombre, email in (("Ana García", "ana@pma.test"), ("Ana Gómez", "agomez@pma.test"),
+                              ("Andrés García", "andres@pma.test")):
+            Miembro.objects.create(nombre_completo=nombre, email=email, pais="CO", telefono="+573001234567")
+        indice.construir()
+        respuesta = self.cliente.get(reverse('autocompletar'), {'q': 'gar an', 'k': 5})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual([fila['nombre_completo'] for fila in respuesta.data], ["Ana García", "Andrés García"])
+        self.assertEqual(self.cliente.get(reverse('autocompletar'), {'q': 'andres@'}).data[0]['email'], "andres@pma.test")
+        self.assertEqual(self.cliente.get(reverse('autocompletar'), {'q': 'a', 'k': 0}).status_code, 400)
+
+
+class SancionesMasivasTests(TestCase):
+    """
+    sanciones/masivo/ inserta las filas válidas, informa el error de cada
+    fila inválida y suma las sanciones a las estadísticas por país.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.colombiano, self.peruano = Miembro.objects.bulk_create([
+            Miembro(nombre_completo="Ana", email="ana@pma.test", pais="CO", telefono="+573001234567"),
+            Miembro(nombre_completo="Luis", email="luis@pma.test", pais="PE", telefono="+51987654321"),
+        ])
+
+    def test_errores_por_fila(self):
+        respuesta = self.cliente.post(reverse('sancion-masivo'), {
+            'motivo': "Spam",
+            'miembros': [self.colombiano.pk, 999999],
+            'sanciones': [
+                {'miembro': self.peruano.pk, 'motivo': "Insultos", 'duracion_dias': 7},
+                {'miembro': self.peruano.pk, 'motivo': "  "},
+                {'miembro': "x", 'duracion_dias': -1},
+            ],
+        }, format='json')
+
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual((respuesta.data['creadas'], respuesta.data['rechazadas']), (2, 3))
+        resultados = respuesta.data['resultados']
+        self.assertEqual([resultado['indice'] for resultado in resultados], [0, 1, 2, 3, 4])
+        self.assertEqual([resultado['creada'] for resultado in resultados], [True, False, True, False, False])
+        self.assertEqual(set(resultados[1]['errores']), {'miembro'})
+        self.assertEqual(set(resultados[3]['errores']), {'motivo'})
+        self.assertEqual(set(resultados[4]['errores']), {'miembro', 'duracion_dias'})
+        self.assertEqual(Sancion.objects.get(pk=resultados[2]['id']).duracion_dias, 7)
+        self.assertEqual(Sancion.objects.count(), 2)
+
+    def test_sin_filas_validas_responde_400(self):
+        respuesta = self.cliente.post(
+            reverse('sancion-masivo'), {'miembros': [self.colombiano.pk]}, format='json'
+        )
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(respuesta.data['creadas'], 0)
+        self.assertFalse(Sancion.objects.exists())
+
+    def test_suma_estadisticas_por_pais(self):
+        self.cliente.post(reverse('sancion-masivo'), {
+            'motivo': "Spam",
+            'miembros': [self.colombiano.pk, self.colombiano.pk, self.peruano.pk],
+        }, format='json')
+        sanciones = dict(EstadisticaDiaria.objects.values_list('pais', 'sanciones'))
+        self.assertEqual(sanciones, {'CO': 2, 'PE': 1})
+
+
+class ResolucionMasivaTests(TestCase):
+    """
+    solicitudes/resolver/ solo transiciona las solicitudes que siguen
+    pendientes y reporta como actualizadas las que cambió su UPDATE.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        miembro = crear_miembros(1)[0]
+        self.solicitudes = SolicitudCorreccion.objects.bulk_create([
+            SolicitudCorreccion(miembro=miembro, descripcion=f"Error {i}") for i in range(3)
+        ])
+        self.ids = [solicitud.pk for solicitud in self.solicitudes]
+
+    def resolver(self, datos):
+        return self.cliente.post(reverse('solicitud-resolver'), datos, format='json')
+
+    def test_omite_las_ya_resueltas(self):
+        SolicitudCorreccion.objects.filter(pk=self.ids[0]).update(estado=EstadoSolicitud.RECHAZADA)
+        respuesta = self.resolver({'ids': self.ids, 'estado': 'aprobada', 'respuesta': "Corregido"})
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data, {'actualizadas': self.ids[1:], 'omitidas': self.ids[:1]})
+        aprobadas = SolicitudCorreccion.objects.filter(estado=EstadoSolicitud.APROBADA)
+        self.assertEqual(sorted(aprobadas.values_list('pk', flat=True)), self.ids[1:])
+        self.assertEqual(set(aprobadas.values_list('version', flat=True)), {2})
+
+    def test_revisor_concurrente_entre_lectura_y_update(self):
+        original = QuerySet.update
+        otro_revisor = []
+
+        def update_con_carrera(queryset, **valores):
+            if 'estado' in valores and not otro_revisor:
+                # Otro revisor rechaza la segunda solicitud justo antes del UPDATE.
+                otro_revisor.append(True)
+                original(
+                    SolicitudCorreccion.objects.filter(pk=self.ids[1]),
+                    estado=EstadoSolicitud.RECHAZADA, version=F('version') + 1,
+                )
+            return original(queryset, **valores)
+
+        # Sin bloqueo de lectura (SQLite en modo DEFERRED) otro revisor puede
+        # colarse entre la lectura y los UPDATE.
+        with mock.patch.object(ResolucionMasivaSerializer, 'lectura_bloqueada', return_value=False), \
+                mock.patch.object(QuerySet, 'update', update_con_carrera):
+            respuesta = self.resolver({'ids': self.ids, 'estado': 'aprobada'})
+
+        self.assertEqual(respuesta.data['actualizadas'], [self.ids[0], self.ids[2]])
+        self.assertEqual(respuesta.data['omitidas'], [self.ids[1]])
+        self.assertEqual(
+            SolicitudCorreccion.objects.get(pk=self.ids[1]).estado, EstadoSolicitud.RECHAZADA
+        )
+
+    def test_errores_de_validacion_por_fila(self):
+        respuesta = self.resolver({
+            'estado': 'aprobada',
+            'solicitudes': [{'id': self.ids[0]}, {'id': self.ids[0]}, {'id': self.ids[1], 'estado': 'pendiente'}],
+        })
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(set(respuesta.data['solicitudes']), {1, 2})
+        self.assertFalse(SolicitudCorreccion.objects.exclude(estado=EstadoSolicitud.PENDIENTE).exists())
+
+
+class ArchivoTests(TestCase):
+    """
+    Archivar y restaurar un miembro mueve también sus sanciones y
+    solicitudes, conserva ids y fechas, mantiene el índice de texto
+    completo y no altera las estadísticas reconstruidas.
+    """
+
+    def setUp(self):
+        self.bloqueado = Miembro.objects.create(
+            nombre_completo="Pedro Bloqueado", email="pedro@pma.test", pais="CO",
+            telefono="+573001234567", activo=False, puede_volver=False,
+        )
+        self.activo = Miembro.objects.create(
+            nombre_completo="Ana Activa", email="ana@pma.test", pais="PE", telefono="+51987654321",
+        )
+        self.sancion = Sancion.objects.create(miembro=self.bloqueado, motivo="Insultos reiterados")
+        self.solicitud = SolicitudCorreccion.objects.create(miembro=self.bloqueado, descripcion="Revisión de sanción")
+        Sancion.objects.create(miembro=self.activo, motivo="Spam en el grupo")
+
+    def test_archivar_y_restaurar_miembro(self):
+        fecha_registro = Miembro.objects.get(pk=self.bloqueado.pk).fecha_registro
+        self.assertEqual(archivar_miembros(), 1)
+
+        self.assertFalse(Miembro.objects.filter(pk=self.bloqueado.pk).exists())
+        self.assertTrue(Miembro.objects.filter(pk=self.activo.pk).exists())
+        self.assertEqual(MiembroArchivado.objects.get().pk, self.bloqueado.pk)
+        self.assertTrue(SancionArchivada.objects.get(pk=self.sancion.pk).con_miembro)
+        self.assertTrue(SolicitudArchivada.objects.get(pk=self.solicitud.pk).con_miembro)
+        self.assertFalse(buscar(Sancion.objects.all(), "insultos").exists())
+        self.assertFalse(buscar(SolicitudCorreccion.objects.all(), "revision").exists())
+
+        restaurado = restaurar_miembro(self.bloqueado.pk)
+
+        self.assertEqual(restaurado.pk, self.bloqueado.pk)
+        self.assertEqual(Miembro.objects.get(pk=restaurado.pk).fecha_registro, fecha_registro)
+        self.assertEqual(Sancion.objects.get(pk=self.sancion.pk).fecha, self.sancion.fecha)
+        self.assertEqual(SolicitudCorreccion.objects.get(pk=self.solicitud.pk).miembro_id, restaurado.pk)
+        self.assertFalse(MiembroArchivado.objects.exists())
+        self.assertFalse(SancionArchivada.objects.exists())
+        self.assertFalse(SolicitudArchivada.objects.exists())
+        self.assertEqual(list(buscar(Sancion.objects.all(), "insultos")), [Sancion.objects.get(pk=self.sancion.pk)])
+        self.assertTrue(buscar(SolicitudCorreccion.objects.all(), "revision").exists())
+
+    def test_estadisticas_iguales_con_miembros_archivados(self):
+        recalcular_estadisticas()
+        antes = list(EstadisticaDiaria.objects.values_list('fecha', 'pais', 'registros', 'desactivaciones', 'sanciones'))
+        archivar_miembros()
+        recalcular_estadisticas()
+        despues = list(EstadisticaDiaria.objects.values_list('fecha', 'pais', 'registros', 'desactivaciones', 'sanciones'))
+        self.assertEqual(antes, despues)
+
+    def test_restaurar_con_correo_ocupado(self):
+        archivar_miembros()
+        Miembro.objects.create(
+            nombre_completo="Otro Pedro", email="pedro@pma.test", pais="CO", telefono="+573001234567",
+        )
+        with self.assertRaises(ValidationError):
+            restaurar_miembro(self.bloqueado.pk)
+        self.assertTrue(MiembroArchivado.objects.filter(pk=self.bloqueado.pk).exists())
+        self.assertTrue(SancionArchivada.objects.filter(pk=self.sancion.pk).exists())
+
+    def test_archivar_sanciones_vencidas(self):
+        vieja = timezone.now() - timedelta(days=200)
+        vencida = Sancion.objects.create(miembro=self.activo, motivo="Retraso", duracion_dias=7)
+        vigente = Sancion.objects.create(miembro=self.activo, motivo="Retraso", duracion_dias=365)
+        Sancion.objects.filter(pk__in=[vencida.pk, vigente.pk]).update(fecha=vieja)
+
+        self.assertEqual(archivar_sanciones(dias_vencidas=90), 1)
+        self.assertFalse(SancionArchivada.objects.get(pk=vencida.pk).con_miembro)
+        self.assertTrue(Sancion.objects.filter(pk=vigente.pk).exists())
+        self.assertEqual(list(buscar(Sancion.objects.all(), "retraso")), [Sancion.objects.get(pk=vigente.pk)])
+
+
+class CamposDinamicosTests(TestCase):
+    """
+    ?fields= recorta la respuesta y las columnas leídas; ?include= incrusta
+    sanciones y solicitudes con un número fijo de consultas.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.miembros = crear_miembros(5)
+        for miembro in self.miembros:
+            Sancion.objects.bulk_create([Sancion(miembro=miembro, motivo=f"Falta {i}") for i in range(3)])
+            SolicitudCorreccion.objects.create(miembro=miembro, descripcion="Corregir nombre")
+
+    def listar(self, url=None, **parametros):
+        return self.cliente.get(url or reverse('miembro-list'), parametros)
+
+    def test_fields_recorta_la_respuesta(self):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.listar(fields='id,nombre_completo')
+        self.assertEqual(respuesta.status_code, 200)
+        for fila in respuesta.data['results']:
+            self.assertEqual(set(fila), {'id', 'nombre_completo'})
+        # Sin is_staff/is_superuser no se consulta la tabla de usuarios.
+        self.assertFalse(any('auth_user' in consulta['sql'] for consulta in consultas.captured_queries))
+
+    def test_fields_desconocido_responde_400(self):
+        respuesta = self.listar(fields='id,clave_secreta')
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('fields', respuesta.data)
+
+    def test_include_incrusta_relaciones(self):
+        respuesta = self.listar(include='sanciones,solicitudes', include_limite='2')
+        self.assertEqual(respuesta.status_code, 200)
+        fila = respuesta.data['results'][0]
+        self.assertEqual(len(fila['sanciones']), 2)
+        self.assertEqual(len(fila['solicitudes']), 1)
+        self.assertNotIn('miembro', fila['sanciones'][0])
+        self.assertNotIn('miembro_nombre', fila['solicitudes'][0])
+
+    def test_include_con_consultas_constantes(self):
+        with CaptureQueriesContext(connection) as pocas:
+            self.listar(include='sanciones,solicitudes')
+        crear_miembros(5, inicio=5)
+        with CaptureQueriesContext(connection) as muchas:
+            self.listar(include='sanciones,solicitudes')
+        self.assertEqual(len(pocas), len(muchas))
+
+    def test_include_invalido(self):
+        self.assertEqual(self.listar(include='pagos').status_code, 400)
+        self.assertEqual(self.listar(include='sanciones', include_limite='0').status_code, 400)
+
+    def test_include_sanciones_solo_staff(self):
+        miembro = self.miembros[0]
+        usuario = User.objects.create_user('socio', miembro.email, 'clave')
+        self.cliente.force_authenticate(usuario)
+        self.assertEqual(self.listar(include='sanciones').status_code, 403)
+        respuesta = self.listar(reverse('mi-perfil'), include='solicitudes', fields='id')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(set(respuesta.data), {'id', 'solicitudes'})
+
+    def test_fields_en_sanciones(self):
+        respuesta = self.listar(reverse('sancion-list'), fields='id,miembro_nombre')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(set(respuesta.data['results'][0]), {'id', 'miembro_nombre'})
+        self.assertTrue(respuesta.data['results'][0]['miembro_nombre'].startswith("Miembro "))
+
+
+class EstadisticasDiariasTests(TestCase):
+    """
+    Las escrituras suman a la fila (día, país) del evento, el comando de
+    recálculo reconstruye las mismas cifras y la serie las agrega por mes.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+
+    def totales(self):
+        return {
+            (fila.fecha, fila.pais): (fila.registros, fila.desactivaciones, fila.sanciones)
+            for fila in EstadisticaDiaria.objects.all()
+        }
+
+    def test_escrituras_suman_por_dia_y_pais(self):
+        hoy = timezone.localdate()
+        ana = Miembro.objects.create(nombre_completo="Ana", email="ana@pma.test", pais="CO", telefono="+573001234567")
+        Miembro.objects.create(nombre_completo="Luis", email="luis@pma.test", pais="PE", telefono="+51987654321")
+        ana.activo = False
+        ana.save()
+        Sancion.objects.create(miembro=ana, motivo="Spam")
+
+        self.assertEqual(self.totales(), {(hoy, 'CO'): (1, 1, 1), (hoy, 'PE'): (1, 0, 0)})
+
+    def test_sancion_nueva_sin_miembro_cargado_lee_solo_el_pais(self):
+        miembro = crear_miembros(1)[0]
+        with CaptureQueriesContext(connection) as consultas:
+            Sancion.objects.create(miembro_id=miembro.pk, motivo="Spam")
+        lecturas = [c['sql'] for c in consultas.captured_queries if 'FROM "miembros_miembro"' in c['sql']]
+        self.assertEqual(len(lecturas), 1)
+        self.assertIn('"miembros_miembro"."pais"', lecturas[0])
+        self.assertNotIn('"miembros_miembro"."email"', lecturas[0])
+
+        with CaptureQueriesContext(connection) as consultas:
+            Sancion.objects.create(miembro=miembro, motivo="Spam")
+        self.assertFalse(any('FROM "miembros_miembro"' in c['sql'] for c in consultas.captured_queries))
+        self.assertEqual(EstadisticaDiaria.objects.get(pais='CO').sanciones, 2)
+
+    def test_recalcular_reconstruye_las_mismas_cifras(self):
+        miembros = crear_miembros(3)
+        miembros[0].activo = False
+        miembros[0].save()
+        Sancion.objects.create(miembro=miembros[1], motivo="Spam")
+        ayer = timezone.now() - timedelta(days=1)
+        Sancion.objects.create(miembro=miembros[2], motivo="Insultos")
+        Sancion.objects.filter(motivo="Insultos").update(fecha=ayer)
+
+        escritas = recalcular_estadisticas()
+
+        hoy = timezone.localdate()
+        self.assertEqual(escritas, 2)
+        self.assertEqual(self.totales(), {
+            (timezone.localdate(ayer), 'CO'): (0, 0, 1),
+            (hoy, 'CO'): (3, 1, 1),
+        })
+
+    def test_recalcular_solo_el_rango_pedido(self):
+        antigua = timezone.localdate() - timedelta(days=40)
+        EstadisticaDiaria.objects.create(fecha=antigua, pais='AR', registros=7)
+        crear_miembros(1)
+        recalcular_estadisticas(desde=timezone.localdate())
+        self.assertEqual(EstadisticaDiaria.objects.get(fecha=antigua).registros, 7)
+
+    def test_serie_por_mes_y_pais(self):
+        marzo, abril = date(2024, 3, 1), date(2024, 4, 1)
+        EstadisticaDiaria.objects.bulk_create([
+            EstadisticaDiaria(fecha=marzo, pais='CO', registros=2, sanciones=1),
+            EstadisticaDiaria(fecha=marzo, pais='PE', registros=1),
+            EstadisticaDiaria(fecha=date(2024, 3, 15), pais='CO', registros=3),
+            EstadisticaDiaria(fecha=abril, pais='CO', registros=4),
+        ])
+        respuesta = self.cliente.get(reverse('estadisticas-serie'), {
+            'desde': marzo, 'hasta': abril, 'granularidad': 'mes', 'por_pais': 'true',
+        })
+        self.assertEqual(respuesta.status_code, 200)
+        serie = [(punto['periodo'], punto['pais'], punto['registros'], punto['sanciones']) for punto in respuesta.data['serie']]
+        self.assertEqual(serie, [(marzo, 'CO', 5, 1), (marzo, 'PE', 1, 0), (abril, 'CO', 4, 0)])
+
+        respuesta = self.cliente.get(reverse('estadisticas-serie'), {'desde': abril, 'hasta': marzo})
+        self.assertEqual(respuesta.status_code, 400)
+
+
+class PaisesTests(TestCase):
+    """
+    El país se normaliza a su código ISO desde nombres, alias y grafías sin
+    tildes; "ZZ" (desconocido) se acepta de vuelta en todas las entradas.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+
+    def test_normalizar_pais(self):
+        casos = {
+            'CO': 'CO', 'co': 'CO', 'Colombia': 'CO', ' COLOMBIA ': 'CO',
+            'Perú': 'PE', 'peru': 'PE', 'Peru': 'PE',
+            'EE.UU.': 'US', 'usa': 'US', 'United States': 'US',
+            'España': 'ES', 'spain': 'ES', 'Reino Unido': 'GB', 'UK': 'GB',
+            'ZZ': 'ZZ', 'zz': 'ZZ',
+        }
+        for valor, codigo in casos.items():
+            with self.subTest(valor=valor):
+                self.assertEqual(normalizar_pais(valor), codigo)
+        for valor in ('', None, 'Narnia', 'X'):
+            self.assertIsNone(normalizar_pais(valor))
+
+    def test_miembro_desconocido_se_puede_reenviar(self):
+        miembro = Miembro.objects.create(
+            nombre_completo="Sin País", email="sinpais@pma.test", pais='ZZ', telefono="+573001234567",
+        )
+        url = reverse('miembro-detail', args=[miembro.pk])
+        leido = self.cliente.get(url).data
+        leido['telefono'] = "+573009999999"
+        respuesta = self.cliente.put(url, leido, format='json')
+        self.assertEqual(respuesta.status_code, 200, respuesta.data)
+        self.assertEqual(respuesta.data['pais'], 'ZZ')
+
+        respuesta = self.cliente.patch(url, {'pais': 'Narnia'}, format='json')
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_filtro_segmento_y_facetas_por_codigo(self):
+        crear_miembros(3)
+        Miembro.objects.create(nombre_completo="Luis", email="luis@pma.test", pais="PE", telefono="+51987654321")
+        Miembro.objects.create(nombre_completo="Sin País", email="zz@pma.test", pais='ZZ', telefono="+51987654321")
+
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'pais': 'zz'}, format='json')
+        self.assertEqual([fila['email'] for fila in respuesta.data], ["zz@pma.test"])
+
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'pais': 'colombia', 'facetas': True}, format='json')
+        self.assertEqual(len(respuesta.data['resultados']), 3)
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'facetas': True}, format='json')
+        self.assertEqual(respuesta.data['facetas']['total'], 5)
+        self.assertEqual(respuesta.data['facetas']['pais'], {'CO': 3, 'PE': 1, 'ZZ': 1})
+        self.assertEqual(respuesta.data['facetas']['activo'], {True: 5})
+
+        respuesta = self.cliente.post(
+            reverse('segmento-list'), {'nombre': "Sin país", 'criterios': {'pais': 'ZZ'}}, format='json'
+        )
+        self.assertEqual(respuesta.status_code, 201, respuesta.data)
+        self.assertEqual(respuesta.data['criterios']['pais'], 'ZZ')
+        self.assertEqual(respuesta.data['total'], 1)
+
+    def test_migracion_fusiona_estadisticas_por_codigo(self):
+        migracion = import_module('miembros.migrations.0005_paises_iso')
+        hoy = timezone.localdate()
+        crear_miembros(1)
+        Miembro.objects.update(pais='Colombia')
+        EstadisticaDiaria.objects.bulk_create([
+            EstadisticaDiaria(fecha=hoy, pais='Colombia', registros=2),
+            EstadisticaDiaria(fecha=hoy, pais='co', registros=1, sanciones=1),
+            EstadisticaDiaria(fecha=hoy, pais='Atlantis', desactivaciones=1),
+            EstadisticaDiaria(fecha=hoy, pais='', registros=4),
+        ])
+
+        migracion.normalizar_paises(apps, None)
+
+        self.assertEqual(Miembro.objects.get().pais, 'CO')
+        filas = {
+            fila.pais: (fila.registros, fila.desactivaciones, fila.sanciones)
+            for fila in EstadisticaDiaria.objects.filter(fecha=hoy)
+        }
+        self.assertEqual(filas, {'CO': (3, 0, 1), 'ZZ': (4, 1, 0)})
+
+
+class BusquedaTextoTests(TestCase):
+    """
+    El índice de texto reduce las palabras a su raíz, se mantiene al día en
+    altas, ediciones, borrados (también en cascada) y altas masivas, y
+    ?q= filtra y ordena por relevancia.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.miembro = crear_miembros(1)[0]
+
+    def indexados(self, modelo):
+        tabla = connection.ops.quote_name(INDICES[modelo._meta.label][1])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {tabla} ORDER BY rowid")
+            return [fila[0] for fila in cursor.fetchall()]
+
+    def test_raices(self):
+        for palabras in (('sanciones', 'sancionado', 'sancionar', 'Sanción'), ('insultos', 'insultar'), ('luces', 'luz')):
+            with self.subTest(palabras=palabras):
+                self.assertEqual(len({tuple(terminos(palabra)) for palabra in palabras}), 1)
+        self.assertEqual(terminos("La sanción por insultar a los moderadores"), ['sancion', 'insult', 'moder'])
+        self.assertEqual(terminos("de la y"), [])
+
+    def test_indice_sigue_altas_ediciones_y_borrados(self):
+        sancion = Sancion.objects.create(miembro=self.miembro, motivo="Insultos reiterados")
+        self.assertEqual(list(buscar(Sancion.objects.all(), "insultar")), [sancion])
+
+        sancion.motivo = "Spam en el grupo"
+        sancion.save()
+        self.assertFalse(buscar(Sancion.objects.all(), "insultos").exists())
+        self.assertTrue(buscar(Sancion.objects.all(), "spam").exists())
+
+        sancion.delete()
+        self.assertEqual(self.indexados(Sancion), [])
+
+    def test_borrado_masivo_y_en_cascada(self):
+        otro = crear_miembros(1, inicio=1)[0]
+        Sancion.objects.bulk_create([Sancion(miembro=self.miembro, motivo="Spam"), Sancion(miembro=otro, motivo="Spam")])
+        reindexar(Sancion)
+        SolicitudCorreccion.objects.create(miembro=self.miembro, descripcion="Nombre mal escrito")
+
+        self.miembro.delete()
+
+        self.assertEqual(self.indexados(Sancion), list(Sancion.objects.values_list('pk', flat=True)))
+        self.assertEqual(self.indexados(SolicitudCorreccion), [])
+        Sancion.objects.all().delete()
+        self.assertEqual(self.indexados(Sancion), [])
+
+    def test_alta_masiva_indexa(self):
+        respuesta = self.cliente.post(reverse('sancion-masivo'), {
+            'motivo': "Publicidad no autorizada", 'miembros': [self.miembro.pk, self.miembro.pk],
+        }, format='json')
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(buscar(Sancion.objects.all(), "publicidades").count(), 2)
+
+    def test_parametro_q_filtra_y_ordena_por_relevancia(self):
+        Sancion.objects.create(miembro=self.miembro, motivo="Retraso en la entrega")
+        una = Sancion.objects.create(miembro=self.miembro, motivo="Insultos a un moderador")
+        varias = Sancion.objects.create(miembro=self.miembro, motivo="Insultos, insultos e insultos")
+
+        respuesta = self.cliente.get(reverse('sancion-list'), {'q': 'insultó'})
+        self.assertEqual([fila['id'] for fila in respuesta.data['results']], [varias.pk, una.pk])
+
+        respuesta = self.cliente.get(reverse('sancion-list'), {'q': 'insultos moderadores'})
+        self.assertEqual([fila['id'] for fila in respuesta.data['results']], [una.pk])
+
+        SolicitudCorreccion.objects.create(miembro=self.miembro, descripcion="Mi teléfono cambió")
+        respuesta = self.cliente.get(reverse('solicitud-list'), {'q': 'telefono'})
+        self.assertEqual(len(respuesta.data['results']), 1)
+
+    def test_post_migrate_llena_indices_vacios(self):
+        sancion = Sancion.objects.create(miembro=self.miembro, motivo="Spam")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {INDICES[Sancion._meta.label][1]}")
+        llenar_indices_vacios(sender=None, app_config=apps.get_app_config('miembros'), using='default')
+        self.assertEqual(self.indexados(Sancion), [sancion.pk])
+
+
+class LoteTests(TestCase):
+    """
+    api/batch/ ejecuta cada subpetición con el usuario del lote, en orden
+    para las escrituras, y devuelve un estado por subpetición.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.miembro = crear_miembros(1)[0]
+        self.url = f'/api/miembros/miembros/{self.miembro.pk}/'
+        # Los hilos de lectura abren otra conexión, que no ve la transacción
+        # de la prueba; las lecturas en paralelo se prueban aparte.
+        secuencial = mock.patch.object(LoteView, 'HILOS_LECTURA', 1)
+        secuencial.start()
+        self.addCleanup(secuencial.stop)
+
+    def lote(self, *peticiones):
+        respuesta = self.cliente.post(reverse('batch'), {'peticiones': list(peticiones)}, format='json')
+        self.assertEqual(respuesta.status_code, 200, respuesta.data)
+        return respuesta.data['respuestas']
+
+    def test_lecturas_ven_las_escrituras_anteriores(self):
+        antes, cambio, despues = self.lote(
+            {'id': 'antes', 'url': self.url},
+            {'id': 'cambio', 'metodo': 'PATCH', 'url': self.url, 'cuerpo': {'nombre_completo': "Ana Nueva"}},
+            {'id': 'despues', 'url': self.url + '?fields=nombre_completo'},
+        )
+        self.assertEqual(antes['cuerpo']['nombre_completo'], "Miembro 0")
+        self.assertEqual((cambio['id'], cambio['estado']), ('cambio', 200))
+        self.assertEqual(despues['cuerpo'], {'nombre_completo': "Ana Nueva"})
+
+    def test_errores_por_subpeticion(self):
+        segmento = self.cliente.post(reverse('segmento-list'), {'nombre': "Todos", 'criterios': {}}, format='json')
+        fuera, inexistente, invalida, eventos, exportar, raiz = self.lote(
+            {'url': '/api/token/'},
+            {'url': '/api/miembros/no-existe/'},
+            {'metodo': 'PATCH', 'url': self.url, 'cuerpo': {'email': "no-es-correo"}},
+            {'url': '/api/miembros/eventos/'},
+            {'url': f"/api/miembros/segmentos/{segmento.data['id']}/exportar/"},
+            {'url': '/api/miembros/'},
+        )
+        self.assertEqual(fuera['estado'], 400)
+        self.assertEqual(inexistente['estado'], 404)
+        self.assertEqual(invalida['estado'], 400)
+        self.assertIn('email', invalida['cuerpo'])
+        self.assertEqual(eventos['estado'], 400)
+        self.assertEqual(exportar['estado'], 400)
+        self.assertEqual(raiz['estado'], 200)
+        self.assertIn('miembros', raiz['cuerpo'])
+
+    def test_fallo_de_una_subpeticion_no_tumba_el_lote(self):
+        with mock.patch('miembros.views.contar_estados', side_effect=RuntimeError), self.assertLogs('miembros.views', 'ERROR'):
+            fallida, correcta = self.lote({'url': '/api/miembros/estadisticas/'}, {'url': self.url})
+        self.assertEqual(fallida['estado'], 500)
+        self.assertEqual(correcta['estado'], 200)
+
+    def test_usa_el_usuario_del_lote(self):
+        socio = User.objects.create_user('socio', self.miembro.email, 'clave')
+        self.cliente.force_authenticate(socio)
+        propio, sanciones = self.lote({'url': '/api/miembros/mi-perfil/'}, {'url': '/api/miembros/sanciones/'})
+        self.assertEqual(propio['cuerpo']['id'], self.miembro.pk)
+        self.assertEqual(sanciones['estado'], 403)
+
+
+class LoteLecturasParalelasTests(TransactionTestCase):
+    """Las lecturas consecutivas del lote corren en hilos y conservan su posición."""
+
+    def test_lecturas_en_paralelo(self):
+        admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        cliente = APIClient()
+        cliente.force_authenticate(admin)
+        miembros = crear_miembros(6)
+        peticiones = [{'id': str(m.pk), 'url': f'/api/miembros/miembros/{m.pk}/?fields=id'} for m in miembros]
+        respuesta = cliente.post(reverse('batch'), {'peticiones': peticiones}, format='json')
+        self.assertEqual(
+            [(r['id'], r['estado'], r['cuerpo']['id']) for r in respuesta.data['respuestas']],
+            [(str(m.pk), 200, m.pk) for m in miembros],
+        )
+
+
+@override_settings(CONSULTA_LENTA_MS=0)
+class DiagnosticoTests(TestCase):
+    """
+    Las consultas lentas se guardan sin valores de parámetros ni cadena de
+    consulta, con EXPLAIN muestreado, y los registros se recortan a su
+    capacidad.
+    """
+
+    def setUp(self):
+        planes.olvidar()
+        self.addCleanup(planes.olvidar)
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        crear_miembros(3)
+
+    def filtrar(self):
+        url = reverse('filtrar-miembros') + '?token=secreto-jwt'
+        return self.cliente.post(url, {'email': 'miembro1@pma.test'}, format='json')
+
+    def test_captura_sin_datos_personales(self):
+        self.assertEqual(self.filtrar().status_code, 200)
+
+        registradas = ConsultaLenta.objects.filter(sql__contains='"miembros_miembro"."email" LIKE')
+        self.assertTrue(registradas.exists())
+        for consulta in ConsultaLenta.objects.all():
+            self.assertEqual(consulta.ruta, reverse('filtrar-miembros'))
+            self.assertNotIn('miembro1@pma.test', consulta.parametros)
+            self.assertNotIn('secreto', consulta.ruta)
+        consulta = registradas.first()
+        self.assertEqual(consulta.vista, 'miembros.views.FiltrarMiembrosView')
+        self.assertIn('str', consulta.parametros)
+        self.assertTrue(consulta.plan)
+
+    def test_explain_una_vez_por_consulta(self):
+        self.filtrar()
+        self.filtrar()
+        planes_filtro = list(
+            ConsultaLenta.objects.filter(sql__contains='"miembros_miembro"."email" LIKE').order_by('pk').values_list('plan', flat=True)
+        )
+        self.assertEqual(len(planes_filtro), 2)
+        self.assertTrue(planes_filtro[0])
+        self.assertEqual(planes_filtro[1], '')
+
+        with override_settings(CONSULTAS_LENTAS_EXPLAIN_SEGUNDOS=0):
+            planes.olvidar()
+            ConsultaLenta.objects.all().delete()
+            self.filtrar()
+        self.assertFalse(ConsultaLenta.objects.exclude(plan='').exists())
+
+    def test_registro_acotado_conserva_los_mas_recientes(self):
+        for numero in range(5):
+            ConsultaLenta.registrar(3, duracion_ms=numero, metodo='GET', ruta='/', sql=f"SELECT {numero}")
+        self.assertEqual(list(ConsultaLenta.objects.values_list('duracion_ms', flat=True)), [4, 3, 2])
+
+    def test_perfil_a_pedido_guarda_la_ruta_sin_consulta(self):
+        cliente = APIClient()
+        cliente.force_login(self.admin)
+        respuesta = cliente.get(reverse('estadisticas') + '?perfil=1&token=secreto-jwt')
+        perfil = PerfilPeticion.objects.get(pk=respuesta['X-Perfil-Id'])
+        self.assertEqual(perfil.ruta, reverse('estadisticas'))
+        self.assertEqual(perfil.usuario, self.admin)
+        self.assertIn('cumulative', perfil.resultado)
+
+        cliente.force_login(User.objects.create_user('socio', 'socio@pma.test', 'clave'))
+        self.assertNotIn('X-Perfil-Id', cliente.get(reverse('estadisticas') + '?perfil=1'))
+
+    def test_middlewares_asincronos_con_asgi(self):
+        async def vista(request):
+            return HttpResponse()
+
+        for clase in (ConsultasLentasMiddleware, PerfilPeticionMiddleware):
+            self.assertTrue(iscoroutinefunction(clase(vista)))
+            self.assertFalse(iscoroutinefunction(clase(lambda request: HttpResponse())))
+
+    async def test_captura_y_perfil_por_asgi(self):
+        respuesta = await AsyncClient().post(
+            reverse('filtrar-miembros') + '?perfil=1', {'email': 'miembro1@pma.test'},
+            content_type='application/json', headers={'Authorization': f"Bearer {AccessToken.for_user(self.admin)}"},
+        )
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        self.assertTrue(await ConsultaLenta.objects.filter(sql__contains='"miembros_miembro"."email" LIKE').aexists())
+        perfil = await PerfilPeticion.objects.aget(pk=respuesta['X-Perfil-Id'])
+        self.assertGreater(perfil.consultas, 0)
+        self.assertIn('cumulative', perfil.resultado)
+
+
+class DuplicadosTests(TestCase):
+    """
+    El bloqueo solo compara miembros con alguna clave en común, el puntaje
+    combina teléfono, correo y nombre, y la fusión mueve los registros del
+    duplicado al conservado dejando el par como historial.
+    """
+
+    def test_bloqueo_y_puntaje(self):
+        filas = [
+            (1, "José Pérez", "+57 300 123 4567", "jperez@gmail.com", "CO"),
+            (2, "Perez Jose", "573001234567", "jose.perez@hotmail.com", "CO"),
+            (3, "Ana de la Cruz", "+51 987 654 321", "ana@pma.test", "PE"),
+            (4, "Ana Cruz", "+51 900 000 000", "acruz@pma.test", "PE"),
+            (5, "Luis Gómez", "+56 911 111 111", "jperez@yahoo.com", "CL"),
+        ]
+        candidatos, cifras = generar_candidatos(filas, umbral=0.3)
+        pares = {(a, b): motivos for a, b, _, motivos in candidatos}
+
+        self.assertEqual(pares[(1, 2)], 'telefono,nombre')
+        self.assertEqual(pares[(3, 4)], 'nombre')
+        # Mismo usuario de correo, pero nada más en común.
+        self.assertEqual(pares[(1, 5)], 'correo')
+        self.assertEqual(cifras['pares_comparados'], 3)
+        self.assertEqual(cifras['miembros'], 5)
+        candidatos, _ = generar_candidatos(filas)
+        self.assertEqual([(a, b) for a, b, _, _ in candidatos], [(1, 2)])
+
+        puntaje, motivos = puntuar(('jose perez', '573001234567', 'jperez'), ('jose perez', '573001234567', 'jperez'))
+        self.assertAlmostEqual(puntaje, 1.0)
+        self.assertEqual(motivos, ['telefono', 'correo', 'nombre'])
+
+    def test_bloques_grandes_se_omiten(self):
+        filas = [(pk, f"Persona {pk}", "+573001234567", f"p{pk}@pma.test", "CO") for pk in range(1, 6)]
+        candidatos, cifras = generar_candidatos(filas, max_bloque=4)
+        self.assertEqual(candidatos, [])
+        self.assertEqual(cifras['bloques_omitidos'], 1)
+
+    def crear_par(self):
+        conservado = Miembro.objects.create(
+            nombre_completo="José Pérez", email="jperez@pma.test", pais="CO", telefono="+573001234567",
+        )
+        duplicado = Miembro.objects.create(
+            nombre_completo="Jose Perez", email="jose.perez@pma.test", pais="CO", telefono="+573001234567",
+        )
+        return conservado, duplicado
+
+    def test_detectar_conserva_los_pares_revisados(self):
+        conservado, duplicado = self.crear_par()
+        self.assertEqual(detectar_duplicados()['candidatos'], 1)
+        DuplicadoCandidato.objects.update(estado=EstadoDuplicado.DESCARTADO)
+
+        detectar_duplicados()
+
+        self.assertEqual(
+            list(DuplicadoCandidato.objects.values_list('miembro_a', 'miembro_b', 'estado')),
+            [(conservado.pk, duplicado.pk, EstadoDuplicado.DESCARTADO)],
+        )
+
+    def test_fusionar(self):
+        conservado, duplicado = self.crear_par()
+        tercero = Miembro.objects.create(
+            nombre_completo="Josefa Pérez", email="josefa@pma.test", pais="CO", telefono="+573001234567",
+        )
+        usuario = User.objects.create_user('jose', duplicado.email, 'clave')
+        sancion = Sancion.objects.create(miembro=duplicado, motivo="Spam")
+        solicitud = SolicitudCorreccion.objects.create(miembro=duplicado, descripcion="Revisar")
+        detectar_duplicados(umbral=0.4)
+        candidato = DuplicadoCandidato.objects.get(miembro_a=conservado, miembro_b=duplicado)
+        self.assertTrue(DuplicadoCandidato.objects.filter(miembro_a=duplicado, miembro_b=tercero).exists())
+
+        fusionar(candidato)
+
+        self.assertFalse(Miembro.objects.filter(pk=duplicado.pk).exists())
+        self.assertEqual(Sancion.objects.get(pk=sancion.pk).miembro_id, conservado.pk)
+        solicitud_movida = SolicitudCorreccion.objects.get(pk=solicitud.pk)
+        self.assertEqual((solicitud_movida.miembro_id, solicitud_movida.version), (conservado.pk, solicitud.version + 1))
+        usuario.refresh_from_db()
+        self.assertFalse(usuario.is_active)
+        # Los pendientes del duplicado, en cualquier lado del par, se descartan.
+        self.assertEqual(list(DuplicadoCandidato.objects.values_list('pk', flat=True)).count(candidato.pk), 1)
+        self.assertFalse(DuplicadoCandidato.objects.filter(miembro_a__isnull=True).exists())
+
+        candidato.refresh_from_db()
+        self.assertEqual(candidato.estado, EstadoDuplicado.FUSIONADO)
+        self.assertEqual(candidato.conservado, "José Pérez <jperez@pma.test>")
+        self.assertEqual(candidato.fusionado, "Jose Perez <jose.perez@pma.test>")
+        with self.assertRaises(ValidationError):
+            fusionar(candidato)
+
+    def test_historial_sobrevive_al_conservado(self):
+        conservado, duplicado = self.crear_par()
+        detectar_duplicados()
+        candidato = DuplicadoCandidato.objects.get()
+        fusionar(candidato)
+
+        conservado.delete()
+
+        candidato.refresh_from_db()
+        self.assertIsNone(candidato.miembro_a)
+        self.assertIn("jperez@pma.test", str(candidato))
+
+
+class ConcurrenciaOptimistaTests(TestCase):
+    """
+    PUT/PATCH exigen la versión vigente (If-Match, o ``version`` en el
+    cuerpo) y responden 412 si otra escritura se adelantó.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        self.miembro = crear_miembros(1)[0]
+        self.url = reverse('miembro-detail', args=[self.miembro.pk])
+
+    def editar(self, datos, **cabeceras):
+        return self.cliente.patch(self.url, datos, format='json', headers=cabeceras)
+
+    def nombre(self):
+        return Miembro.objects.get(pk=self.miembro.pk).nombre_completo
+
+    def test_etag_e_if_match(self):
+        self.assertEqual(self.cliente.get(self.url)['ETag'], '"1"')
+
+        respuesta = self.editar({'nombre_completo': "Ana"}, **{'If-Match': '"1"'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['ETag'], '"2"')
+
+        respuesta = self.editar({'nombre_completo': "Luis"}, **{'If-Match': '"1"'})
+        self.assertEqual(respuesta.status_code, 412)
+        self.assertEqual(self.nombre(), "Ana")
+
+        for cabecera in ('W/"2"', '"7", "2"', '*'):
+            with self.subTest(cabecera=cabecera):
+                respuesta = self.editar({'telefono': f"+5730012345{len(cabecera):02d}"}, **{'If-Match': cabecera})
+                self.assertEqual(respuesta.status_code, 200)
+                Miembro.objects.filter(pk=self.miembro.pk).update(version=2)
+
+    def test_version_en_el_cuerpo(self):
+        self.assertEqual(self.editar({'nombre_completo': "Ana", 'version': 1}).status_code, 200)
+        self.assertEqual(self.editar({'nombre_completo': "Luis", 'version': 1}).status_code, 412)
+        self.assertEqual(self.editar({'nombre_completo': "Luis", 'version': "dos"}).status_code, 400)
+        self.assertEqual(self.nombre(), "Ana")
+        # La cabecera tiene prioridad sobre el cuerpo.
+        respuesta = self.editar({'nombre_completo': "Luis", 'version': 1}, **{'If-Match': '"2"'})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.data['version'], 3)
+
+    def test_escritura_concurrente_entre_lectura_y_update(self):
+        original = Miembro.actualizar
+
+        def actualizar_con_carrera(instancia, campos, version, user=None):
+            # Otra petición guarda el miembro justo antes de este UPDATE.
+            Miembro.objects.filter(pk=instancia.pk).update(nombre_completo="Otro", version=F('version') + 1)
+            return original(instancia, campos, version, user=user)
+
+        with mock.patch.object(Miembro, 'actualizar', actualizar_con_carrera):
+            respuesta = self.editar({'nombre_completo': "Ana"})
+
+        self.assertEqual(respuesta.status_code, 412)
+        self.assertEqual(self.nombre(), "Otro")
+
+    def test_solicitudes_versionadas(self):
+        solicitud = SolicitudCorreccion.objects.create(miembro=self.miembro, descripcion="Revisar")
+        url = reverse('solicitud-detail', args=[solicitud.pk])
+        self.assertEqual(self.cliente.get(url)['ETag'], '"1"')
+        respuesta = self.cliente.patch(url, {'descripcion': "Otra"}, format='json', headers={'If-Match': '"5"'})
+        self.assertEqual(respuesta.status_code, 412)
+
+
+class TicketEventosTests(TestCase):
+    """
+    Los eventos en vivo se abren con un ticket firmado de un solo uso en
+    lugar de poner el JWT en la URL.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.fabrica = RequestFactory()
+
+    def staff(self, **parametros):
+        peticion = self.fabrica.get(reverse('eventos'), parametros)
+        peticion.user = AnonymousUser()
+        return _staff_para_eventos(peticion)
+
+    def test_endpoint_solo_para_staff(self):
+        cliente = APIClient()
+        cliente.force_authenticate(self.admin)
+        respuesta = cliente.post(reverse('eventos-ticket'))
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(self.staff(ticket=respuesta.data['ticket']), self.admin)
+
+        cliente.force_authenticate(User.objects.create_user('socio', 'socio@pma.test', 'clave'))
+        self.assertEqual(cliente.post(reverse('eventos-ticket')).status_code, 403)
+
+    def test_un_solo_uso(self):
+        ticket = emitir_ticket(self.admin)
+        self.assertEqual(self.staff(ticket=ticket), self.admin)
+        # El canje queda en la base de datos, no en el caché del proceso:
+        # otro worker tampoco puede repetirlo.
+        cache.clear()
+        self.assertIsNone(self.staff(ticket=ticket))
+        self.assertEqual(TicketCanjeado.objects.count(), 1)
+
+    def test_purga_los_canjes_vencidos(self):
+        self.staff(ticket=emitir_ticket(self.admin))
+        TicketCanjeado.objects.update(fecha=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.staff(ticket=emitir_ticket(self.admin)), self.admin)
+        self.assertEqual(TicketCanjeado.objects.count(), 1)
+
+    def test_ticket_vencido_alterado_o_de_no_staff(self):
+        with override_settings(EVENTOS_TICKET_SEGUNDOS=-1):
+            self.assertIsNone(self.staff(ticket=emitir_ticket(self.admin)))
+        self.assertIsNone(self.staff(ticket=emitir_ticket(self.admin) + 'x'))
+        socio = User.objects.create_user('socio', 'socio@pma.test', 'clave')
+        self.assertIsNone(self.staff(ticket=emitir_ticket(socio)))
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertIsNone(self.staff(ticket=emitir_ticket(self.admin)))
+
+    def test_jwt_en_la_url_ya_no_se_acepta(self):
+        token = str(AccessToken.for_user(self.admin))
+        self.assertIsNone(self.staff(token=token))
+        peticion = self.fabrica.get(reverse('eventos'), HTTP_AUTHORIZATION=f'Bearer {token}')
+        peticion.user = AnonymousUser()
+        self.assertEqual(_staff_para_eventos(peticion), self.admin)
+
+
+class LimitesDeConsultaTests(TestCase):
+    """
+    Los listados acotados y filtrar-miembros responden 503 al vencer el
+    plazo de sus consultas; filtrar-miembros responde 422 por encima de
+    FILTRO_MAX_FILAS salvo que se pida recortar.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@pma.test', 'clave', is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.admin)
+        crear_miembros(5)
+
+    def reloj_que_avanza(self):
+        # Cada lectura del reloj avanza 10 ms y el progress handler se
+        # comprueba en cada instrucción: el plazo de 1 ms vence en la
+        # primera consulta, por pequeña que sea la tabla.
+        reloj = mock.patch('miembros.limites.time')
+        reloj.start().monotonic.side_effect = itertools.count(0, 0.01).__next__
+        self.addCleanup(reloj.stop)
+        instrucciones = mock.patch.object(PlazoDeConsultas, 'INSTRUCCIONES', 1)
+        instrucciones.start()
+        self.addCleanup(instrucciones.stop)
+
+    @override_settings(CONSULTAS_PLAZO_MS=1)
+    def test_plazo_vencido_responde_503(self):
+        self.reloj_que_avanza()
+        respuesta = self.cliente.get(reverse('miembro-list'))
+        self.assertEqual(respuesta.status_code, 503)
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'nombre': "Miembro"}, format='json')
+        self.assertEqual(respuesta.status_code, 503)
+        # La conexión sigue usable tras la interrupción.
+        self.assertEqual(Miembro.objects.count(), 5)
+
+    @override_settings(CONSULTAS_PLAZO_MS=0)
+    def test_plazo_desactivado(self):
+        self.reloj_que_avanza()
+        self.assertEqual(self.cliente.get(reverse('miembro-list')).status_code, 200)
+
+    @override_settings(FILTRO_MAX_FILAS=3)
+    def test_filtro_recorta_o_responde_422(self):
+        # Sin pedir recorte, superar el tope es un error, no un recorte silencioso.
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {}, format='json')
+        self.assertEqual(respuesta.status_code, 422)
+
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'truncar': True}, format='json')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.data), 3)
+        self.assertEqual((respuesta['X-Truncado'], respuesta['X-Limite']), ('true', '3'))
+
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'limite': 2}, format='json')
+        self.assertEqual(len(respuesta.data), 2)
+        self.assertEqual(respuesta['X-Limite'], '2')
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'limite': 2, 'truncar': False}, format='json')
+        self.assertEqual(respuesta.status_code, 422)
+
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'nombre': "Miembro 1"}, format='json')
+        self.assertEqual([fila['nombre_completo'] for fila in respuesta.data], ["Miembro 1"])
+        self.assertNotIn('X-Truncado', respuesta)
+
+        respuesta = self.cliente.post(
+            reverse('filtrar-miembros'), {'truncar': True, 'envoltura': True}, format='json'
+        )
+        self.assertEqual((len(respuesta.data['resultados']), respuesta.data['truncado']), (3, True))
+        respuesta = self.cliente.post(reverse('filtrar-miembros'), {'limite': 4}, format='json')
+        self.assertEqual(respuesta.status_code, 400)
+
+    @override_settings(LISTADO_MAX_FILAS=3)
+    def test_paginacion_acotada_solo_en_los_listados(self):
+        respuesta = self.cliente.get(reverse('miembro-list'))
+        self.assertEqual((respuesta.data['count'], respuesta.data['truncado']), (3, True))
+        self.assertEqual(
+            api_settings.DEFAULT_PAGINATION_CLASS, PageNumberPagination,
+        )
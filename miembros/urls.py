@@ -9,7 +9,15 @@ from .views import (
     ResetPasswordConfirmView,
     VerMiPerfilView,
     FiltrarMiembrosView,
+    AutocompletarView,
     EstadisticasView,
+    EstadisticasSerieView,
+    EventosView,
+    TicketEventosView,
+    MiembroArchivadoViewSet,
+    SancionArchivadaViewSet,
+    SolicitudArchivadaViewSet,
+    SegmentoViewSet,
 )
 
 # Rutas con ViewSets
@@ -17,6 +25,10 @@ router = DefaultRouter()
 router.register(r'miembros', MiembroViewSet, basename='miembro')
 router.register(r'sanciones', SancionViewSet, basename='sancion')
 router.register(r'solicitudes', SolicitudCorreccionViewSet, basename='solicitud')
+router.register(r'archivo/miembros', MiembroArchivadoViewSet, basename='miembro-archivado')
+router.register(r'archivo/sanciones', SancionArchivadaViewSet, basename='sancion-archivada')
+router.register(r'archivo/solicitudes', SolicitudArchivadaViewSet, basename='solicitud-archivada')
+router.register(r'segmentos', SegmentoViewSet, basename='segmento')
 
 # Rutas personalizadas
 urlpatterns = [
@@ -27,5 +39,9 @@ urlpatterns = [
     path('recuperar-password/', EnviarCorreoResetPasswordView.as_view(), name='recuperar-password'),
     path('reset-password/<uidb64>/<token>/', ResetPasswordConfirmView.as_view(), name='reset-password'), 
     path('filtrar-miembros/', FiltrarMiembrosView.as_view(), name='filtrar-miembros'),
+    path('autocompletar/', AutocompletarView.as_view(), name='autocompletar'),
     path('estadisticas/', EstadisticasView.as_view(), name='estadisticas'),
+    path('estadisticas/serie/', EstadisticasSerieView.as_view(), name='estadisticas-serie'),
+    path('eventos/', EventosView.as_view(), name='eventos'),
+    path('eventos/ticket/', TicketEventosView.as_view(), name='eventos-ticket'),
 ]
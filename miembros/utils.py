@@ -1,7 +1,15 @@
+from functools import partial
+
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.utils.crypto import get_random_string
 from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+
+# Reintentos si otro proceso toma el mismo username entre la consulta y el INSERT.
+INTENTOS_USERNAME = 5
 
 
 def generar_username_unico(email):
@@ -18,7 +26,46 @@ def generar_username_unico(email):
     return username
 
 
-def crear_usuario_para_miembro(email, nombre_completo, password=None):
+def en_lotes(alias, ids):
+    """
+    Divide una lista de ids en lotes que respetan el límite de parámetros
+    por consulta del backend (SQLite). En MySQL devuelve un solo lote.
+
+    Args:
+        alias (str): Alias de la base de datos.
+        ids (list): Ids a dividir.
+
+    Yields:
+        list: Lotes consecutivos de ids.
+    """
+    lote = connections[alias].features.max_query_params or len(ids) or 1
+    for inicio in range(0, len(ids), lote):
+        yield ids[inicio:inicio + lote]
+
+
+def valores_por_id(queryset, ids, campo):
+    """
+    Devuelve un diccionario {id: valor de ``campo``} con los ids de la lista
+    que existen en el queryset.
+
+    Resuelve todos los ids con una sola consulta; solo divide en lotes
+    si el backend limita el número de parámetros por consulta (SQLite).
+
+    Args:
+        queryset (QuerySet): Conjunto sobre el que se valida.
+        ids (Iterable[int]): Ids a comprobar.
+        campo (str): Campo a leer de cada fila.
+
+    Returns:
+        dict: Valor del campo por id encontrado.
+    """
+    encontrados = {}
+    for lote in en_lotes(queryset.db, list(set(ids))):
+        encontrados.update(queryset.filter(pk__in=lote).values_list('pk', campo))
+    return encontrados
+
+
+def crear_usuario_para_miembro(email, nombre_completo, password=None, password_cifrada=None):
     """
     Crea un usuario de Django para un nuevo miembro.
 
@@ -26,25 +73,85 @@ def crear_usuario_para_miembro(email, nombre_completo, password=None):
         email (str): Correo electrónico del miembro.
         nombre_completo (str): Nombre completo del miembro.
         password (str, optional): Contraseña. Si no se proporciona, se genera una aleatoria.
+        password_cifrada (str, optional): Hash ya calculado de ``password``.
 
     Returns:
         tuple: (usuario creado, contraseña, username)
     """
-    username = generar_username_unico(email)
     password = password or get_random_string(length=10)
+    password_cifrada = password_cifrada or make_password(password)
     partes_nombre = nombre_completo.strip().split()
     first_name = partes_nombre[0] if partes_nombre else ''
     last_name = ' '.join(partes_nombre[1:]) if len(partes_nombre) > 1 else ''
 
-    user = User.objects.create_user(
-        username=username,
-        email=email,
-        password=password,
-        first_name=first_name,
-        last_name=last_name,
-        is_staff=False
-    )
-    return user, password, username
+    # La restricción única de username decide: si otro proceso lo tomó
+    # primero, se revierte solo este INSERT y se reintenta con un sufijo
+    # aleatorio (la consulta previa puede no ver aún la fila del otro proceso).
+    for intento in range(INTENTOS_USERNAME):
+        username = generar_username_unico(email)
+        if intento:
+            username = f"{username}{get_random_string(4, '0123456789')}"
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    username=User.normalize_username(username),
+                    email=User.objects.normalize_email(email),
+                    password=password_cifrada,
+                    first_name=first_name,
+                    last_name=last_name,
+                    is_staff=False
+                )
+            return user, password, username
+        except IntegrityError:
+            if intento == INTENTOS_USERNAME - 1:
+                raise
+
+
+def provisionar_miembro(miembro):
+    """
+    Guarda un miembro nuevo y crea su usuario de Django en una sola
+    transacción. El correo único del miembro es el que evita duplicados:
+    dos altas simultáneas con el mismo correo se serializan en ese índice
+    y la segunda falla sin dejar usuarios huérfanos. El correo de
+    bienvenida se envía solo cuando la transacción se confirma.
+
+    Args:
+        miembro (Miembro): Instancia sin guardar.
+
+    Raises:
+        ValidationError: Si ya existe un miembro o un usuario con ese correo.
+
+    Returns:
+        Miembro: El miembro guardado.
+    """
+    if not miembro.email:
+        raise ValidationError("Debes proporcionar un correo electrónico válido.")
+
+    # El hash de la contraseña es lento a propósito: se calcula antes de
+    # abrir la transacción para no retener los bloqueos mientras tanto.
+    password = get_random_string(length=10)
+    password_cifrada = make_password(password)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                miembro.save()
+        except IntegrityError:
+            miembro.pk = None
+            raise ValidationError("Ya existe un miembro con este correo.")
+
+        # Mientras esta transacción siga abierta, cualquier alta concurrente
+        # con el mismo correo queda bloqueada en el índice único del miembro.
+        if User.objects.filter(email=miembro.email).exists():
+            raise ValidationError("Ya existe un usuario con este correo.")
+        user, password, username = crear_usuario_para_miembro(
+            miembro.email, miembro.nombre_completo, password, password_cifrada
+        )
+        transaction.on_commit(
+            partial(enviar_correo_bienvenida, miembro.nombre_completo, username, miembro.email, password),
+            robust=True,
+        )
+    return miembro
 
 
 def enviar_correo_bienvenida(nombre, username, email, password):
@@ -1,9 +1,17 @@
+import csv
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied, NotFound
+from rest_framework.exceptions import APIException, PermissionDenied, NotFound, ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.generics import RetrieveAPIView
+from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
@@ -12,17 +20,56 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.conf import settings
-from decouple import config
-from .models import Miembro, Sancion, SolicitudCorreccion
+from django.core.handlers.asgi import ASGIRequest
+from django.core.handlers.wsgi import WSGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import TruncMonth
+from .models import (
+    Miembro,
+    Sancion,
+    SolicitudCorreccion,
+    MiembroArchivado,
+    SancionArchivada,
+    SolicitudArchivada,
+    EstadisticaDiaria,
+    Segmento,
+    VersionObsoleta,
+)
+from .archivo import restaurar_miembro
+from .autocompletado import sugerir
+from .estadisticas import contar_estados
+from .eventos import bus, canjear_ticket, contadores, emitir_ticket, flujo, formatear, leer_ultimo_id
+from .limites import DemasiadosResultados, PaginacionAcotada, plazo_de_consultas
+from .segmentos import IdsDeSegmento, calcular, filtrar_miembros
+from .busqueda import buscar
 from .serializers import (
     MiembroSerializer,
     SancionSerializer,
     SolicitudCorreccionSerializer,
+    SancionMasivaSerializer,
+    ResolucionMasivaSerializer,
+    MiembroArchivadoSerializer,
+    SancionArchivadaSerializer,
+    SolicitudArchivadaSerializer,
 MiembroFiltroSerializer,
+    EstadisticasSerieSerializer,
+    LoteSerializer,
+    SegmentoSerializer,
+    campos_solicitados,
+    relaciones_incluidas,
 )
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+logger = logging.getLogger(__name__)
 
 
 # --------------------- PERMISOS PERSONALIZADOS ---------------------
@@ -60,17 +107,172 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
+# --------------------- OPTIMIZACIÓN DE CONSULTAS ---------------------
+
+LIMITE_INCLUIDOS = 20
+LIMITE_INCLUIDOS_MAXIMO = 100
+
+
+def columnas_solicitadas(modelo, campos, relaciones=None):
+    """
+    Traduce los campos pedidos con ?fields= a las columnas del modelo que
+    hay que leer. ``relaciones`` mapea campos de solo lectura que atraviesan
+    una FK (p. ej. 'miembro_nombre') a su ruta en el ORM.
+    """
+    concretos = {campo.name for campo in modelo._meta.concrete_fields}
+    columnas = [campo for campo in campos if campo in concretos]
+    for campo, ruta in (relaciones or {}).items():
+        if campo in campos:
+            columnas += [ruta.split('__')[0], ruta]
+    return columnas or [modelo._meta.pk.name]
+
+
+def optimizar_miembros(queryset, request):
+    """
+    Ajusta un queryset de miembros a lo que pide la petición: lee solo las
+    columnas de ?fields=, obtiene el rol del usuario en la misma consulta
+    (en vez de dos consultas por miembro) y precarga ?include= con un
+    máximo de registros por miembro.
+    """
+    campos = campos_solicitados(request)
+    if campos is None:
+        campos = MiembroSerializer.Meta.fields
+    else:
+        queryset = queryset.only(*columnas_solicitadas(Miembro, campos))
+
+    usuarios = User.objects.filter(email=OuterRef('email'))
+    if 'is_staff' in campos:
+        queryset = queryset.annotate(usuario_is_staff=Subquery(usuarios.values('is_staff')[:1]))
+    if 'is_superuser' in campos:
+        queryset = queryset.annotate(usuario_is_superuser=Subquery(usuarios.values('is_superuser')[:1]))
+
+    incluidas = relaciones_incluidas(request)
+    if not incluidas:
+        return queryset
+    if 'sanciones' in incluidas and not request.user.is_staff:
+        raise PermissionDenied("Solo los administradores pueden consultar sanciones.")
+
+    limite = request.query_params.get('include_limite', str(LIMITE_INCLUIDOS))
+    if not limite.isdigit() or not 1 <= int(limite) <= LIMITE_INCLUIDOS_MAXIMO:
+        raise ValidationError(
+            {'include_limite': f"Debe ser un entero entre 1 y {LIMITE_INCLUIDOS_MAXIMO}."}
+        )
+    modelos = {'sanciones': Sancion, 'solicitudes': SolicitudCorreccion}
+    for relacion in incluidas:
+        recientes = modelos[relacion].objects.order_by('-fecha', '-pk')[:int(limite)]
+        queryset = queryset.prefetch_related(
+            Prefetch(relacion, queryset=recientes, to_attr=f'{relacion}_incluidas')
+        )
+    return queryset
+
+
+def optimizar_con_miembro(queryset, request):
+    """
+    Para sanciones y solicitudes: une el miembro (usado por 'miembro_nombre')
+    y, si hay ?fields=, lee solo las columnas pedidas.
+    """
+    campos = campos_solicitados(request)
+    if campos is None:
+        return queryset.select_related('miembro')
+    relaciones = {'miembro_nombre': 'miembro__nombre_completo'}
+    if 'miembro_nombre' in campos:
+        queryset = queryset.select_related('miembro')
+    return queryset.only(*columnas_solicitadas(queryset.model, campos, relaciones))
+
+
+def filtrar_por_texto(queryset, request):
+    """
+    Con ?q= restringe el queryset a los registros que contienen todas las
+    palabras buscadas (por raíz, sin tildes) y los ordena por relevancia.
+    """
+    texto = request.query_params.get('q', '').strip()
+    if not texto:
+        return queryset
+    return buscar(queryset, texto)
+
+
+# --------------------- LÍMITES DE LOS LISTADOS ---------------------
+
+class ListadoAcotadoMixin:
+    """
+    Ejecuta el listado con el plazo de CONSULTAS_PLAZO_MS para sus
+    consultas (503 al vencer) y lo pagina con PaginacionAcotada, que cuenta
+    como mucho LISTADO_MAX_FILAS filas.
+    """
+    pagination_class = PaginacionAcotada
+
+    def list(self, request, *args, **kwargs):
+        with plazo_de_consultas():
+            return super().list(request, *args, **kwargs)
+
+
+# --------------------- CONCURRENCIA OPTIMISTA ---------------------
+
+class PrecondicionFallida(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "El registro fue modificado por otra persona. Vuelve a cargarlo."
+    default_code = 'precondition_failed'
+
+
+class ConcurrenciaOptimistaMixin:
+    """
+    Para modelos versionados: el detalle y la modificación devuelven la
+    versión en la cabecera ETag, y PUT/PATCH aceptan If-Match con ese valor
+    o, sin la cabecera, el campo ``version`` en el cuerpo. Si la versión no
+    coincide (o cambia antes del UPDATE) responde 412. Sin ninguna de las
+    dos se exige la versión leída al cargar el registro.
+    """
+
+    def version_esperada(self, instance):
+        cabecera = self.request.headers.get('If-Match', '').strip()
+        if cabecera == '*':
+            return instance.version
+        if cabecera:
+            etiquetas = {etiqueta.strip().removeprefix('W/').strip('"') for etiqueta in cabecera.split(',')}
+        elif isinstance(self.request.data, dict) and self.request.data.get('version') is not None:
+            version = str(self.request.data['version'])
+            if not version.isdigit():
+                raise ValidationError({'version': "Debe ser un número entero."})
+            etiquetas = {version}
+        else:
+            return instance.version
+        if str(instance.version) not in etiquetas:
+            raise PrecondicionFallida()
+        return instance.version
+
+    def guardar_versionado(self, serializer, **kwargs):
+        try:
+            serializer.save(version=self.version_esperada(serializer.instance), **kwargs)
+        except VersionObsoleta as error:
+            raise PrecondicionFallida(str(error))
+
+    def _con_etag(self, respuesta):
+        if 'version' in respuesta.data:
+            respuesta['ETag'] = f'"{respuesta.data["version"]}"'
+        return respuesta
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._con_etag(super().retrieve(request, *args, **kwargs))
+
+    def update(self, request, *args, **kwargs):
+        return self._con_etag(super().update(request, *args, **kwargs))
+
+
 # --------------------- VIEWS PRINCIPALES ---------------------
 
-class MiembroViewSet(viewsets.ModelViewSet):
+class MiembroViewSet(ListadoAcotadoMixin, ConcurrenciaOptimistaMixin, viewsets.ModelViewSet):
     serializer_class = MiembroSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.is_staff:
-            return Miembro.objects.all()
-        return Miembro.objects.filter(email=user.email)
+            queryset = Miembro.objects.all()
+        else:
+            queryset = Miembro.objects.filter(email=user.email)
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = optimizar_miembros(queryset, self.request)
+        return queryset
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -80,11 +282,11 @@ class MiembroViewSet(viewsets.ModelViewSet):
 
     def perform_update(self, serializer):
         user = self.request.user
-        instance = self.get_object()
+        instance = serializer.instance
         if instance.activo is False and serializer.validated_data.get("activo", True):
             if not instance.puede_volver and not user.is_superuser:
                 raise PermissionDenied("Este miembro no puede ser reactivado. Contacte con soporte.")
-        serializer.save(user=user)
+        self.guardar_versionado(serializer, user=user)
 
     def perform_destroy(self, instance):
         raise PermissionDenied("No está permitido eliminar miembros. Solo pueden ser desactivados.")
@@ -100,40 +302,156 @@ class VerMiPerfilView(RetrieveAPIView):
 
     def get_object(self):
         user = self.request.user
-        miembro = Miembro.objects.filter(email=user.email).first()
+        miembro = optimizar_miembros(Miembro.objects.filter(email=user.email), self.request).first()
         if not miembro:
             raise NotFound("No se encontró tu perfil como miembro.")
         return miembro
 
 
-class SancionViewSet(viewsets.ModelViewSet):
+class SancionViewSet(ListadoAcotadoMixin, viewsets.ModelViewSet):
     queryset = Sancion.objects.all()
     serializer_class = SancionSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = optimizar_con_miembro(queryset, self.request)
+            queryset = filtrar_por_texto(queryset, self.request)
+        return queryset
+
+    @action(detail=False, methods=['post'], url_path='masivo', serializer_class=SancionMasivaSerializer)
+    def masivo(self, request):
+        """
+        Crea sanciones para varios miembros en una sola petición.
+        Devuelve un resultado por fila; las filas inválidas no se insertan.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        resultados = serializer.save()
+
+        creadas = sum(1 for resultado in resultados if resultado['creada'])
+        return Response({
+            'creadas': creadas,
+            'rechazadas': len(resultados) - creadas,
+            'resultados': resultados,
+        }, status=status.HTTP_201_CREATED if creadas else status.HTTP_400_BAD_REQUEST)
+
 
-class SolicitudCorreccionViewSet(viewsets.ModelViewSet):
+class SolicitudCorreccionViewSet(ListadoAcotadoMixin, ConcurrenciaOptimistaMixin, viewsets.ModelViewSet):
     serializer_class = SolicitudCorreccionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.is_staff:
-            return SolicitudCorreccion.objects.all()
-        return SolicitudCorreccion.objects.filter(miembro__email=user.email)
+            queryset = SolicitudCorreccion.objects.all()
+        else:
+            queryset = SolicitudCorreccion.objects.filter(miembro__email=user.email)
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = optimizar_con_miembro(queryset, self.request)
+            queryset = filtrar_por_texto(queryset, self.request)
+        return queryset
 
     def perform_update(self, serializer):
         user = self.request.user
         if not user.is_staff:
             raise PermissionDenied("Solo los administradores pueden actualizar solicitudes.")
-        serializer.save()
+        self.guardar_versionado(serializer)
+
+    @action(detail=False, methods=['post'], url_path='resolver', serializer_class=ResolucionMasivaSerializer)
+    def resolver(self, request):
+        """
+        Aprueba o rechaza varias solicitudes pendientes en una sola petición.
+        Solo se transicionan las que siguen pendientes al momento del UPDATE.
+        """
+        if not request.user.is_staff:
+            raise PermissionDenied("Solo los administradores pueden resolver solicitudes.")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save())
+
+
+# --------------------- ARCHIVO HISTÓRICO ---------------------
+
+class FiltroPorMiembroMixin:
+    """
+    Permite consultar el historial archivado de un miembro con ?miembro=<id>.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        miembro = self.request.query_params.get('miembro')
+        if miembro:
+            if not miembro.isdigit():
+                raise ValidationError({'miembro': "Debe ser un id numérico."})
+            queryset = queryset.filter(miembro_id=miembro)
+        return queryset
+
+
+class MiembroArchivadoViewSet(ListadoAcotadoMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Consulta de miembros archivados y restauración a la tabla principal.
+    Solo disponible para administradores.
+    """
+    queryset = MiembroArchivado.objects.all()
+    serializer_class = MiembroArchivadoSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    @action(detail=True, methods=['post'])
+    def restaurar(self, request, pk=None):
+        try:
+            miembro = restaurar_miembro(pk)
+        except MiembroArchivado.DoesNotExist:
+            raise NotFound("No se encontró un miembro archivado con este id.")
+        except DjangoValidationError as e:
+            return Response({'error': e.messages}, status=status.HTTP_409_CONFLICT)
+        return Response(MiembroSerializer(miembro).data, status=status.HTTP_201_CREATED)
+
+
+class SancionArchivadaViewSet(ListadoAcotadoMixin, FiltroPorMiembroMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = SancionArchivada.objects.all()
+    serializer_class = SancionArchivadaSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+
+class SolicitudArchivadaViewSet(ListadoAcotadoMixin, FiltroPorMiembroMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = SolicitudArchivada.objects.all()
+    serializer_class = SolicitudArchivadaSerializer
+    permission_classes = [permissions.IsAdminUser]
 
 
 # --------------------- NUEVA VISTA: FILTRADO DE MIEMBROS ---------------------
 
+FACETAS_MIEMBROS = ('pais', 'activo', 'puede_volver')
+
+
+def contar_facetas(queryset):
+    """
+    Cuenta los miembros del queryset por país, por activo y por
+    puede_volver con una sola consulta agrupada por las tres columnas
+    (cubierta por el índice miembro_pais_estado); cada faceta se obtiene
+    sumando los grupos en Python.
+    """
+    facetas = {campo: {} for campo in FACETAS_MIEMBROS}
+    total = 0
+    grupos = queryset.order_by().values_list(*FACETAS_MIEMBROS).annotate(total=Count('pk'))
+    for *valores, cantidad in grupos:
+        total += cantidad
+        for campo, valor in zip(FACETAS_MIEMBROS, valores):
+            facetas[campo][valor] = facetas[campo].get(valor, 0) + cantidad
+    return {"total": total, **facetas}
+
+
 class FiltrarMiembrosView(APIView):
     """
     Vista para filtrar miembros usando parámetros enviados por POST.
+    Devuelve la lista de miembros. Si hay más de FILTRO_MAX_FILAS responde
+    422, salvo que se pida recortar (``limite`` o ``truncar: true``); un
+    resultado recortado llega con las cabeceras X-Truncado y X-Limite.
+    Con ``facetas: true`` o ``envoltura: true`` la respuesta es
+    ``{"resultados", "truncado"}``, y con facetas añade los conteos por
+    país, activo y puede_volver del mismo conjunto filtrado.
     Solo disponible para administradores.
     """
 
@@ -144,31 +462,320 @@ class FiltrarMiembrosView(APIView):
         serializer.is_valid(raise_exception=True)
         filtros = serializer.validated_data
 
-        miembros = Miembro.objects.all()
+        miembros = filtrar_miembros(filtros)
+
+        with plazo_de_consultas():
+            limite = filtros.get('limite') or settings.FILTRO_MAX_FILAS
+            filas = optimizar_miembros(miembros, request)
+            if limite:
+                # Una fila de más basta para saber si el resultado se recorta.
+                filas = list(filas[:limite + 1])
+            truncado = bool(limite) and len(filas) > limite
+            if truncado and not filtros.get('truncar', 'limite' in filtros):
+                raise DemasiadosResultados(
+                    f"El filtro devuelve más de {limite} miembros. Usa criterios más "
+                    f"específicos, un 'limite' o 'truncar': true."
+                )
+            if truncado:
+                filas = filas[:limite]
+            resultado = MiembroSerializer(filas, many=True, context={'request': request}).data
+            facetas = contar_facetas(miembros) if filtros['facetas'] else None
+
+        cabeceras = {'X-Truncado': 'true', 'X-Limite': str(limite)} if truncado else None
+        if facetas is None and not filtros['envoltura']:
+            return Response(resultado, headers=cabeceras)
+        cuerpo = {"resultados": resultado, "truncado": truncado}
+        if facetas is not None:
+            cuerpo["facetas"] = facetas
+        return Response(cuerpo, headers=cabeceras)
+
+
+class AutocompletarView(APIView):
+    """
+    Sugerencias de miembros mientras se escribe: ``?q=`` con el comienzo de
+    palabras del nombre (o del correo, si contiene "@") y ``?k=`` con la
+    cantidad (10 por defecto, como mucho AUTOCOMPLETADO_MAX_RESULTADOS).
+    Se resuelve con el índice en memoria de miembros/autocompletado.py.
+    Solo disponible para administradores.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        maximo = settings.AUTOCOMPLETADO_MAX_RESULTADOS
+        try:
+            cantidad = int(request.query_params.get('k', min(10, maximo)))
+        except ValueError:
+            raise ValidationError({'k': "Debe ser un número entero."})
+        if not 1 <= cantidad <= maximo:
+            raise ValidationError({'k': f"Debe estar entre 1 y {maximo}."})
+        return Response(sugerir(request.query_params.get('q', ''), cantidad))
+
+
+# --------------------- SEGMENTOS ---------------------
+
+class _Eco:
+    """Búfer mínimo para csv.writer: devuelve la línea en vez de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+class SegmentoViewSet(ListadoAcotadoMixin, viewsets.ModelViewSet):
+    """
+    Segmentos de miembros guardados. Al crearlos (o cambiar sus criterios)
+    se calcula su conjunto de ids; luego se mantiene con el comando
+    actualizar_segmentos. Los miembros de un segmento se paginan, cuentan y
+    exportan desde ese conjunto, sin volver a ejecutar el filtro.
+    """
+    serializer_class = SegmentoSerializer
+    permission_classes = [permissions.IsAdminUser]
+    queryset = Segmento.objects.defer('ids')
+
+    COLUMNAS_EXPORTACION = (
+        'id', 'nombre_completo', 'email', 'pais', 'telefono', 'activo', 'puede_volver', 'fecha_registro',
+    )
+    LOTE_EXPORTACION = 2000
+
+    def perform_create(self, serializer):
+        calcular(serializer.save(creado_por=self.request.user))
+
+    def perform_update(self, serializer):
+        segmento = serializer.save()
+        if 'criterios' in serializer.validated_data:
+            calcular(segmento)
+
+    @action(detail=True, methods=['get'])
+    def miembros(self, request, pk=None):
+        """
+        Página de los miembros del segmento, en orden de id. El total ya
+        está guardado en el segmento, así que se pagina sin acotar el conteo.
+        """
+        segmento = self.get_object()
+        paginador = PageNumberPagination()
+        with plazo_de_consultas():
+            ids = paginador.paginate_queryset(IdsDeSegmento(segmento), request, view=self)
+            encontrados = {
+                miembro.pk: miembro
+                for miembro in optimizar_miembros(Miembro.objects.filter(pk__in=ids), request)
+            }
+            datos = MiembroSerializer(
+                [encontrados[pk] for pk in ids if pk in encontrados], many=True, context={'request': request}
+            ).data
+        return paginador.get_paginated_response(datos)
+
+    @action(detail=True, methods=['get'])
+    def conteo(self, request, pk=None):
+        segmento = self.get_object()
+        return Response({
+            'total': segmento.total,
+            'fecha_actualizacion': segmento.fecha_actualizacion,
+        })
+
+    @action(detail=True, methods=['get'])
+    def exportar(self, request, pk=None):
+        """
+        CSV con los miembros del segmento, generado por lotes mientras se envía.
+        """
+        segmento = self.get_object()
+        ids = IdsDeSegmento(segmento)
+
+        def filas():
+            escritor = csv.writer(_Eco())
+            yield escritor.writerow(self.COLUMNAS_EXPORTACION)
+            for inicio in range(0, len(ids), self.LOTE_EXPORTACION):
+                lote = ids[inicio:inicio + self.LOTE_EXPORTACION]
+                miembros = Miembro.objects.filter(pk__in=lote).order_by('pk')
+                for fila in miembros.values_list(*self.COLUMNAS_EXPORTACION):
+                    yield escritor.writerow(fila)
+
+        respuesta = StreamingHttpResponse(filas(), content_type='text/csv; charset=utf-8')
+        respuesta['Content-Disposition'] = f'attachment; filename="segmento-{segmento.pk}.csv"'
+        return respuesta
+
 
-        if filtros.get('nombre'):
-            miembros = miembros.filter(nombre_completo__icontains=filtros['nombre'])
+# --------------------- PETICIONES EN LOTE ---------------------
 
-        if filtros.get('email'):
-            miembros = miembros.filter(email__icontains=filtros['email'])
+class LoteView(APIView):
+    """
+    Ejecuta varias peticiones a /api/miembros/ en una sola ida y vuelta.
+
+    El JWT se valida una vez, para la petición del lote, y cada
+    subpetición se atiende en el mismo proceso con ese usuario, llamando
+    directamente a la vista resuelta (sin middleware). Las lecturas
+    consecutivas (GET) se ejecutan en paralelo; cada escritura se ejecuta
+    sola y en orden, de modo que las lecturas posteriores ven su efecto.
+    Devuelve una respuesta por subpetición con su propio código de estado;
+    las rutas asíncronas o que responden en streaming (eventos, exportar)
+    reciben un 400 en su posición.
+    """
+    permission_classes = [permissions.IsAuthenticated]
 
-        if filtros.get('telefono'):
-            miembros = miembros.filter(telefono__icontains=filtros['telefono'])
+    PREFIJO = '/api/miembros/'
+    HILOS_LECTURA = 4
 
-        if 'activo' in filtros:
-            miembros = miembros.filter(activo=filtros['activo'])
+    def post(self, request):
+        serializer = LoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        peticiones = serializer.validated_data['peticiones']
+
+        respuestas = [None] * len(peticiones)
+        grupo = []
+        for indice, peticion in enumerate(peticiones):
+            if peticion['metodo'] == 'GET':
+                grupo.append(indice)
+                continue
+            self._leer(request, peticiones, grupo, respuestas)
+            grupo = []
+            respuestas[indice] = self._ejecutar(request, peticion)
+        self._leer(request, peticiones, grupo, respuestas)
+
+        respuestas = [
+            {'id': peticion['id'], **respuesta} if 'id' in peticion else respuesta
+            for peticion, respuesta in zip(peticiones, respuestas)
+        ]
+        return Response({'respuestas': respuestas})
+
+    def _leer(self, request, peticiones, indices, respuestas):
+        if len(indices) < 2 or self.HILOS_LECTURA < 2:
+            for indice in indices:
+                respuestas[indice] = self._ejecutar(request, peticiones[indice])
+            return
+
+        def en_hilo(peticion):
+            try:
+                return self._ejecutar(request, peticion)
+            finally:
+                # Cada hilo abre su propia conexión; se cierra al terminar.
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=min(len(indices), self.HILOS_LECTURA)) as pool:
+            for indice, respuesta in zip(indices, pool.map(en_hilo, [peticiones[i] for i in indices])):
+                respuestas[indice] = respuesta
+
+    def _ejecutar(self, request, peticion):
+        ruta, _, consulta = peticion['url'].partition('?')
+        if not ruta.startswith(self.PREFIJO):
+            return {'estado': status.HTTP_400_BAD_REQUEST, 'cuerpo': {'detail': f"Solo se admiten rutas bajo {self.PREFIJO}."}}
+        try:
+            coincidencia = resolve(ruta)
+        except Resolver404:
+            return {'estado': status.HTTP_404_NOT_FOUND, 'cuerpo': {'detail': "No encontrado."}}
+        if iscoroutinefunction(coincidencia.func):
+            # Las vistas asíncronas (p. ej. eventos en vivo) no caben en una respuesta del lote.
+            return {'estado': status.HTTP_400_BAD_REQUEST, 'cuerpo': {'detail': "Esta ruta no se admite en un lote."}}
+
+        cuerpo = b''
+        if 'cuerpo' in peticion:
+            cuerpo = json.dumps(peticion['cuerpo']).encode()
+        entorno = {clave: valor for clave, valor in request.META.items() if not clave.startswith('wsgi.')}
+        entorno.update({
+            'REQUEST_METHOD': peticion['metodo'],
+            'PATH_INFO': ruta,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': consulta,
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(cuerpo)),
+            'wsgi.input': io.BytesIO(cuerpo),
+        })
+        subpeticion = WSGIRequest(entorno)
+        # Lo que el manejador de Django asigna antes de llamar a la vista
+        # (la raíz de la API lo usa para construir sus enlaces).
+        subpeticion.resolver_match = coincidencia
+        # Se reutiliza la autenticación del lote en vez de validar el JWT otra vez.
+        subpeticion._force_auth_user = request.user
+        subpeticion._force_auth_token = request.auth
 
-        if 'puede_volver' in filtros:
-            miembros = miembros.filter(puede_volver=filtros['puede_volver'])
+        try:
+            respuesta = coincidencia.func(subpeticion, *coincidencia.args, **coincidencia.kwargs)
+            if respuesta.streaming:
+                # Sin consumir el contenido: close() emitiría request_finished,
+                # que cerraría la conexión a la base de datos del lote.
+                return {'estado': status.HTTP_400_BAD_REQUEST, 'cuerpo': {'detail': "Esta ruta no se admite en un lote."}}
+            if hasattr(respuesta, 'data'):
+                datos = respuesta.data
+            elif respuesta.get('Content-Type', '').startswith('application/json'):
+                datos = json.loads(respuesta.content or b'null')
+            else:
+                datos = respuesta.content.decode(errors='replace')
+        except Exception:
+            # Un fallo en una subpetición no debe tumbar las demás.
+            logger.exception("Error en subpetición del lote: %s %s", peticion['metodo'], peticion['url'])
+            return {'estado': status.HTTP_500_INTERNAL_SERVER_ERROR, 'cuerpo': {'detail': "Error interno."}}
+        return {'estado': respuesta.status_code, 'cuerpo': datos}
+
+
+# --------------------- EVENTOS EN VIVO ---------------------
+
+def _staff_para_eventos(request):
+    """
+    Usuario staff de la petición, autenticado por sesión, por JWT en
+    Authorization o por un ticket de TicketEventosView en ?ticket=
+    (EventSource no envía cabeceras).
+    """
+    if request.user.is_authenticated:
+        return request.user if request.user.is_staff else None
+    ticket = request.GET.get('ticket')
+    if ticket:
+        pk = canjear_ticket(ticket)
+        usuario = User.objects.filter(pk=pk, is_active=True).first() if pk else None
+    else:
+        try:
+            resultado = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        usuario = resultado[0] if resultado else None
+    return usuario if usuario and usuario.is_staff else None
 
-        if filtros.get('fecha_desde'):
-            miembros = miembros.filter(fecha_registro__date__gte=filtros['fecha_desde'])
 
-        if filtros.get('fecha_hasta'):
-            miembros = miembros.filter(fecha_registro__date__lte=filtros['fecha_hasta'])
+class TicketEventosView(APIView):
+    """
+    Emite un ticket de un solo uso, válido EVENTOS_TICKET_SEGUNDOS, para
+    abrir eventos/?ticket=... con EventSource sin poner el JWT en la URL.
+    """
+    permission_classes = [permissions.IsAdminUser]
 
-        resultado = MiembroSerializer(miembros, many=True)
-        return Response(resultado.data)
+    def post(self, request):
+        return Response(
+            {'ticket': emitir_ticket(request.user), 'vigencia_segundos': settings.EVENTOS_TICKET_SEGUNDOS},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class EventosView(View):
+    """
+    Server-Sent Events para los tableros de administración: envía los
+    contadores de estado (evento "contadores") cuando cambian y las
+    solicitudes de corrección creadas o modificadas ("solicitud" y
+    "solicitudes_resueltas"), en lugar de consultar /estadisticas/ y
+    /solicitudes/ cada pocos segundos. Solo para staff y solo bajo ASGI:
+    cada conexión abierta es una corrutina en espera, no un hilo.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {'detail': "Los eventos en vivo requieren un servidor ASGI (core.asgi)."}, status=501
+            )
+        if await sync_to_async(_staff_para_eventos)(request) is None:
+            return JsonResponse({'detail': "Solo los administradores pueden recibir eventos."}, status=403)
+
+        cabecera = request.headers.get('Last-Event-ID') or request.GET.get('ultimo_id')
+        ultimo = leer_ultimo_id(cabecera)
+        iniciales = []
+        if ultimo is None:
+            ultimo = bus.ultimo
+            if cabecera:
+                # Id de otro proceso o de antes de un reinicio: el cliente debe recargar.
+                iniciales.append(formatear(ultimo, 'reinicio', {}))
+            iniciales.append(formatear(ultimo, 'contadores', await sync_to_async(contadores.actuales)()))
+
+        respuesta = StreamingHttpResponse(
+            flujo(min(ultimo, bus.ultimo), iniciales), content_type='text/event-stream'
+        )
+        respuesta['Cache-Control'] = 'no-cache'
+        respuesta['X-Accel-Buffering'] = 'no'
+        return respuesta
 
 
 # --------------------- CAMBIO DE CONTRASEÑA ---------------------
@@ -213,8 +820,7 @@ class EnviarCorreoResetPasswordView(APIView):
 
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         token = default_token_generator.make_token(user)
-        frontend_url = config('FRONTEND_URL', default='http://localhost:5173')
-        reset_link = f"{frontend_url}/reset-password/{uid}/{token}"
+        reset_link = f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}"
 
         send_mail(
             subject="Restablece tu contraseña - PMA Frequency",
@@ -257,13 +863,48 @@ class EstadisticasView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        activos = Miembro.objects.filter(activo=True).count()
-        inactivos = Miembro.objects.filter(activo=False, puede_volver=True).count()
-        bloqueados = Miembro.objects.filter(activo=False, puede_volver=False).count()
+        return Response(contar_estados())
+
+
+class EstadisticasSerieView(APIView):
+    """
+    Serie temporal de registros, desactivaciones y sanciones por día o por
+    mes, opcionalmente desglosada o filtrada por país. Se lee de la tabla de
+    estadísticas diarias precalculadas, sin recorrer miembros ni sanciones.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        serializer = EstadisticasSerieSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        parametros = serializer.validated_data
+
+        filas = EstadisticaDiaria.objects.filter(
+            fecha__range=(parametros['desde'], parametros['hasta'])
+        )
+        if parametros.get('pais'):
+            filas = filas.filter(pais=parametros['pais'])
+
+        periodo = TruncMonth('fecha') if parametros['granularidad'] == 'mes' else F('fecha')
+        grupos = ['periodo', 'pais'] if parametros['por_pais'] else ['periodo']
+        filas = (
+            filas.annotate(periodo=periodo)
+            .values(*grupos)
+            .annotate(**{f'total_{campo}': Sum(campo) for campo in EstadisticaDiaria.CAMPOS})
+            .order_by(*grupos)
+        )
+
+        serie = []
+        for fila in filas:
+            punto = {'periodo': fila['periodo']}
+            if parametros['por_pais']:
+                punto['pais'] = fila['pais']
+            punto.update({campo: fila[f'total_{campo}'] for campo in EstadisticaDiaria.CAMPOS})
+            serie.append(punto)
 
         return Response({
-            "activos": activos,
-            "inactivos": inactivos,
-            "bloqueados": bloqueados
+            "desde": parametros['desde'],
+            "hasta": parametros['hasta'],
+            "granularidad": parametros['granularidad'],
+            "serie": serie,
         })
-    
\ No newline at end of file